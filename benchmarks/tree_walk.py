@@ -0,0 +1,86 @@
+"""
+Benchmark: `locus tree` walk, serial vs prefetching thread pool.
+
+Builds a synthetic deep tree in a temporary directory and times
+LocusMap.iter_nodes() with jobs=1 (one directory after another, as the plain
+recursive walk does) and with a pool listing directories ahead of the walk.
+Every directory listing can be given an artificial latency to mimic network or
+FUSE filesystems, where the prefetching pays off most.
+
+    python benchmarks/tree_walk.py --fanout 4 --levels 6 --latency-ms 2 --jobs 16
+"""
+from __future__ import annotations
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from locus_cli.core.map import LocusMap
+
+
+def build_tree(root: Path, fanout: int, levels: int, files: int) -> int:
+    """Create fanout**levels leaf directories with `files` files in each directory."""
+    count = 0
+    frontier = [root]
+    for _ in range(levels):
+        next_frontier = []
+        for parent in frontier:
+            for i in range(files):
+                (parent / f"file{i}.txt").write_bytes(b"x" * (i + 1))
+            for i in range(fanout):
+                child = parent / f"dir{i}"
+                child.mkdir()
+                next_frontier.append(child)
+                count += 1
+        frontier = next_frontier
+    return count
+
+
+def run(root: Path, depth: int, jobs: int, latency: float) -> tuple[float, list]:
+    locus_map = LocusMap(root, max_depth=depth, jobs=jobs)
+    if latency:
+        real_list = locus_map._list
+
+        def slow_list(path: str):
+            time.sleep(latency)
+            return real_list(path)
+
+        locus_map._list = slow_list
+    start = time.perf_counter()
+    nodes = list(locus_map.iter_nodes())
+    return time.perf_counter() - start, nodes
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fanout", type=int, default=4, help="Sub-directories per directory.")
+    parser.add_argument("--levels", type=int, default=6, help="Depth of the synthetic tree.")
+    parser.add_argument("--files", type=int, default=5, help="Files per directory.")
+    parser.add_argument("--latency-ms", type=float, default=1.0, help="Added latency per directory listing.")
+    parser.add_argument("--jobs", type=int, default=16, help="Pool size of the prefetching walk.")
+    parser.add_argument("--repeat", type=int, default=3, help="Best of N runs.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        dirs = build_tree(root, args.fanout, args.levels, args.files)
+        latency = args.latency_ms / 1000
+        print(f"{dirs} directories, {args.levels} levels, {args.latency_ms} ms per listing")
+
+        results = {}
+        for jobs in (1, args.jobs):
+            best = float("inf")
+            for _ in range(args.repeat):
+                elapsed, nodes = run(root, args.levels + 1, jobs, latency)
+                best = min(best, elapsed)
+            results[jobs] = (best, nodes)
+            print(f"jobs={jobs:<3} {best * 1000:9.1f} ms  ({len(nodes)} lines)")
+
+        serial, parallel = results[1], results[args.jobs]
+        assert serial[1] == parallel[1], "prefetching changed the output"
+        print(f"speedup: {serial[0] / parallel[0]:.1f}x, identical output")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,287 @@
+"""
+Scanning a tar or zip archive without extracting it (`locus info drop.tar.gz`).
+
+Only member headers (names, sizes, dates) are read to list the archive: a tar
+file, compressed or not, is decompressed as one forward stream and never
+seeked, a zip file is listed from its central directory. Headers are turned
+into the same per-directory listings the filesystem walker produces, so scan()
+and LocusMap aggregate them unchanged. Nothing is written to disk, and memory
+follows the number of directories of the archive, never its member count or
+size.
+
+Archive members come in whatever order the archiver wrote them: usually one
+directory after the other, but a directory may show up again after the
+stream left it. Its later members then come in an extra listing of the same
+path, which consumers add to the first one.
+
+Member contents are read only when asked for: the few root-level files the
+extractor quotes (ArchiveReader) and, with --loc, the source files to count
+lines of (read_members), which are streamed, never loaded whole.
+"""
+from __future__ import annotations
+
+import os
+import stat
+import tarfile
+import time
+import zipfile
+from collections.abc import Callable, Iterator
+from pathlib import Path
+from typing import IO
+
+from .extractor import _README_NAMES
+from .ignore import IgnoreMatcher
+from .scanner import _DirListing, _ENTRY_POINT_NAMES, _PROJECT_TYPE_MARKERS
+
+ARCHIVE_SUFFIXES = (".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz", ".tbz2", ".tar.xz", ".txz", ".zip")
+
+# Most bytes kept of a root-level file for the extractor (it quotes 3000
+# characters of the README and 60 lines of the others).
+_READ_MAX = 256 * 1024
+# Entries kept per top-level directory for the extractor's tree summary,
+# which shows the first 8 of each.
+_SUMMARY_ENTRIES = 16
+
+# (path parts, is_dir, is_file, size, mtime), and a function opening the member's contents
+_Member = tuple[list[str], bool, bool, int, float]
+_Open = Callable[[], IO[bytes] | None]
+
+
+def is_archive(path: Path) -> bool:
+    """Whether `path` is an archive file locus can scan, going by its name."""
+    return path.name.lower().endswith(ARCHIVE_SUFFIXES) and path.is_file()
+
+
+def _parts(name: str) -> list[str] | None:
+    """Path components of a member name, None for names pointing outside the archive."""
+    parts = [part for part in name.replace("\\", "/").split("/") if part and part != "."]
+    return None if ".." in parts else parts
+
+
+def _members(archive: Path) -> Iterator[tuple[_Member, _Open]]:
+    """
+    Stream the members of `archive`. The open function of a member, and the
+    file object it returns, are only valid until the next one is requested. Raises ValueError for unreadable
+    or corrupt archives.
+    """
+    try:
+        if archive.name.lower().endswith(".zip"):
+            yield from _zip_members(archive)
+        else:
+            yield from _tar_members(archive)
+    except (tarfile.TarError, zipfile.BadZipFile, OSError, EOFError) as exc:
+        raise ValueError(f"cannot read archive {archive}: {exc}") from None
+
+
+def _tar_members(archive: Path) -> Iterator[tuple[_Member, _Open]]:
+    # "r|*": one forward pass, any compression; data of skipped members is read past, not kept.
+    with tarfile.open(archive, "r|*") as tar:
+        while (info := tar.next()) is not None:
+            # Even in stream mode TarFile remembers every member: forget them as we go.
+            tar.members = []
+            parts = _parts(info.name)
+            if parts is None:
+                continue
+            member = (parts, info.isdir(), info.isreg(), info.size, float(info.mtime))
+            yield member, lambda info=info: tar.extractfile(info)
+
+
+def _zip_members(archive: Path) -> Iterator[tuple[_Member, _Open]]:
+    with zipfile.ZipFile(archive) as zf:
+        for info in zf.infolist():
+            parts = _parts(info.filename)
+            if parts is None:
+                continue
+            is_dir = info.is_dir()
+            is_link = stat.S_ISLNK(info.external_attr >> 16)
+            mtime = time.mktime((*info.date_time, 0, 0, -1))
+            member = (parts, is_dir, not is_dir and not is_link, info.file_size, mtime)
+            yield member, lambda info=info: zf.open(info)
+
+
+def _read(open_member: _Open, n: int) -> bytes:
+    f = open_member()
+    if f is None:
+        return b""
+    with f:
+        return f.read(n)
+
+
+def iter_archive_listings(
+    archive: Path,
+    matcher: IgnoreMatcher,
+    max_depth: int | None = None,
+) -> Iterator[_DirListing]:
+    """
+    Yield filtered listings of the directories of `archive`, as if it had been
+    extracted to a directory at its own path: the root listing has the
+    archive's path. A directory's listing is yielded once the stream leaves
+    it, children before their parent and the root last; a directory met again
+    later gets another listing with its remaining entries. Default ignores and
+    --ignore patterns apply; .gitignore files in the archive do not. Only
+    regular files are counted, hidden ones are skipped and hidden directories
+    are listed but not entered, like on disk.
+
+    max_depth: only directories at depth < max_depth are yielded (root = depth 0),
+               deeper ones still appear by name in their parent's listing.
+    """
+    root_path = str(archive)
+    # Open directories down to the current member: (name, rel path, listing or None
+    # when not yielded, whether this is the directory's first listing)
+    stack: list[tuple[str, str, _DirListing | None, bool]] = [("", "", _DirListing(root_path), True)]
+    # Every directory met so far, and whether it is entered (False: ignored or hidden)
+    entered: dict[str, bool] = {"": True}
+
+    def _close(entry: tuple[str, str, _DirListing | None, bool]) -> Iterator[_DirListing]:
+        _, _, listing, first = entry
+        if listing is not None and (first or listing.dirs or listing.files):
+            yield listing
+
+    for (parts, is_dir, is_file, size, mtime), _ in _members(archive):
+        if not is_dir and not is_file:
+            continue
+        dir_parts = parts if is_dir else parts[:-1]
+        common = 0
+        while common + 1 < len(stack) and common < len(dir_parts) and stack[common + 1][0] == dir_parts[common]:
+            common += 1
+        while len(stack) > common + 1:
+            yield from _close(stack.pop())
+
+        for name in dir_parts[common:]:
+            _, parent_rel, parent_listing, _ = stack[-1]
+            rel = f"{parent_rel}/{name}" if parent_rel else name
+            state = entered.get(rel)
+            if state is None:
+                if matcher.is_ignored(parent_rel, name, True):
+                    entered[rel] = False
+                    break
+                if parent_listing is not None:
+                    parent_listing.dirs.append(name)
+                state = entered[rel] = not name.startswith(".")
+                first = True
+            else:
+                first = False
+            if not state:
+                break
+            keep = max_depth is None or len(stack) < max_depth
+            listing = _DirListing(os.path.join(root_path, *rel.split("/"))) if keep else None
+            stack.append((name, rel, listing, first))
+        else:
+            if is_file:
+                name = parts[-1]
+                _, parent_rel, parent_listing, _ = stack[-1]
+                if (
+                    parent_listing is not None
+                    and not name.startswith(".")
+                    and not matcher.is_ignored(parent_rel, name, False)
+                ):
+                    parent_listing.files.append((name, size, mtime))
+
+    while len(stack) > 1:
+        yield from _close(stack.pop())
+    root_listing = stack[0][2]
+    assert root_listing is not None
+    yield root_listing
+
+
+def merge_listings(listings: Iterator[_DirListing]) -> dict[str, _DirListing]:
+    """Listings by path, the extra listings of a directory added to its first one."""
+    merged: dict[str, _DirListing] = {}
+    for listing in listings:
+        seen = merged.get(listing.path)
+        if seen is None:
+            merged[listing.path] = listing
+        else:
+            seen.dirs += listing.dirs
+            seen.files += listing.files
+    return merged
+
+
+def read_members(archive: Path, wanted: set[str]) -> Iterator[tuple[str, IO[bytes]]]:
+    """
+    Stream (rel path, open file) of the regular files of `archive` whose
+    "/"-separated path is in `wanted`. A file is only readable until the next
+    one is requested; reading it forward never loads the whole member.
+    """
+    for (parts, _, is_file, _, _), open_member in _members(archive):
+        if is_file:
+            rel = "/".join(parts)
+            if rel in wanted:
+                f = open_member()
+                if f is not None:
+                    with f:
+                        yield rel, f
+
+
+class ArchiveReader:
+    """
+    Reads what extract_context() needs from an archive, in one pass over its
+    members on first use: the root listing, the first entries of each top-level
+    directory, and the start of the root-level files it may quote (README,
+    manifests, entry points). Same interface as extractor's filesystem reader,
+    for those paths only. prefix: a "/"-separated directory of the archive to
+    read as the root instead (a sub-project).
+    """
+
+    _WANTED = frozenset((*_README_NAMES, *_PROJECT_TYPE_MARKERS, *_ENTRY_POINT_NAMES))
+
+    def __init__(self, archive: Path, prefix: str = "") -> None:
+        self.archive = archive
+        self._prefix = prefix.split("/") if prefix else []
+        self._root: dict[str, bool] | None = None          # name -> is_dir
+        self._top: dict[str, list[tuple[bool, str, str]]] = {}  # dir -> sorted (not is_dir, lower name, name)
+        self._contents: dict[str, bytes] = {}
+
+    def _load(self) -> dict[str, bool]:
+        if self._root is not None:
+            return self._root
+        root: dict[str, bool] = {}
+        skip = len(self._prefix)
+        for (parts, is_dir, is_file, _, _), open_member in _members(self.archive):
+            if parts[:skip] != self._prefix:
+                continue
+            parts = parts[skip:]
+            if not parts:
+                continue
+            if len(parts) > 1 or is_dir:
+                root[parts[0]] = True
+            elif is_file:
+                root.setdefault(parts[0], False)
+                if parts[0] in self._WANTED:
+                    self._contents[parts[0]] = _read(open_member, _READ_MAX)
+            if len(parts) > 1 and not parts[1].startswith("."):
+                # The tree summary skips hidden entries and shows the first few in this order.
+                self._keep_first(parts[0], (not (len(parts) > 2 or is_dir), parts[1].lower(), parts[1]))
+        self._root = root
+        return root
+
+    def _keep_first(self, directory: str, entry: tuple[bool, str, str]) -> None:
+        entries = self._top.setdefault(directory, [])
+        if entry in entries or (len(entries) >= _SUMMARY_ENTRIES and entry > entries[-1]):
+            return
+        entries.append(entry)
+        entries.sort()
+        del entries[_SUMMARY_ENTRIES:]
+
+    def is_file(self, rel: str) -> bool:
+        return self._load().get(rel) is False
+
+    def read_bytes(self, rel: str) -> bytes | None:
+        self._load()
+        return self._contents.get(rel)
+
+    def read_text(self, rel: str) -> str | None:
+        data = self.read_bytes(rel)
+        return None if data is None else data.decode("utf-8", errors="replace")
+
+    def read_lines(self, rel: str, max_lines: int) -> list[str] | None:
+        text = self.read_text(rel)
+        return None if text is None else text.splitlines(keepends=True)[:max_lines]
+
+    def list_dir(self, rel: str) -> list[tuple[str, bool]] | None:
+        root = self._load()
+        if rel == "":
+            return list(root.items())
+        if root.get(rel) is not True:
+            return None
+        return [(name, not is_file) for is_file, _, name in self._top.get(rel, [])]
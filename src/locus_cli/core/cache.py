@@ -0,0 +1,265 @@
+"""
+Persistent scan index — per-root directory listings cached under ~/.locus/index/.
+
+Each cached directory is stored with its mtime. On the next run a directory whose
+mtime did not change is served from the index with a single stat() instead of a
+scandir() plus one stat() per file. Adding, removing or renaming an entry bumps the
+directory mtime; editing a file in place does not, so sizes of files modified since
+the last run can be stale until their directory changes (use --no-cache for exact
+numbers).
+
+On-disk format (one file per root, zlib-compressed, columnar):
+
+    header   "LCSI" | u16 version | u8 little-endian flag | u32 dir count
+    body     u32 string-blob length | string blob ("\\0"-joined, utf-8)
+             mtimes   int64[dirs]
+             n_dirs   uint32[dirs]
+             n_files  uint32[dirs]
+             flags    uint8[dirs]     (bit 0: directory has a .gitignore,
+                                       bit 1: listed without file sizes,
+                                       bit 2: listed from the git index)
+             sizes    int64[files]
+             fmtimes  float64[files]  (file mtimes, epoch seconds)
+
+The string blob holds, for each directory in order, its path relative to the root
+followed by its sub-directory names and its file names.
+"""
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from .scanner import _DirListing, _list_dir
+
+_MAGIC = b"LCSI"
+_VERSION = 4
+_HEADER = struct.Struct("<4sHBI")
+_BLOB_LEN = struct.Struct("<I")
+
+# Directories modified this close to the moment they were listed may still change
+# within the same mtime tick ("racy git" problem). They are stored with an mtime that
+# never matches, so the next run lists them again.
+_RACY_NS = 2_000_000_000
+_NEVER = -1
+
+# rel path -> (mtime_ns, sub-directory names, (name, size, mtime) files, has .gitignore,
+# file sizes known, source). `locus tree` lists without sizes; such entries only serve
+# callers that do not need sizes either. Sizes are only served to callers listing
+# from the same source ("fs" or "git-index") as the entry was.
+_Entry = tuple[int, list[str], list[tuple[str, int, float]], bool, bool, str]
+
+
+def index_dir(locus_dir: Path) -> Path:
+    """Directory holding the per-root index files."""
+    return locus_dir / "index"
+
+
+def clear_indexes(locus_dir: Path) -> int:
+    """Delete every index file under locus_dir. Returns how many were removed."""
+    removed = 0
+    directory = index_dir(locus_dir)
+    if not directory.is_dir():
+        return 0
+    for f in directory.glob("*.idx"):
+        f.unlink(missing_ok=True)
+        removed += 1
+    return removed
+
+
+class ScanIndex:
+    """
+    Cached directory listings for one root, keyed by path relative to that root.
+
+    list_dir() is a drop-in replacement for scanner._list_dir() and is safe to call
+    from the parallel walker's worker threads. Listings it returns are shared with
+    the index and must not be mutated. Directories that changed are listed with
+    `lister` (plain scandir by default, or e.g. a GitIndexLister, with `source`
+    set to "git-index"), or with `names_lister` when the caller does not need
+    file sizes.
+    """
+
+    def __init__(self, root: Path, file: Path) -> None:
+        self.root = str(root)
+        self.file = file
+        self._prefix = self.root if self.root.endswith(os.sep) else self.root + os.sep
+        self._entries: dict[str, _Entry] = {}
+        self._dirty = False
+        self.lister: Callable[[str], _DirListing | None] = _list_dir
+        self.names_lister: Callable[[str], _DirListing | None] = partial(_list_dir, sizes=False)
+        self.source = "fs"
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def open(cls, root: Path, locus_dir: Path) -> ScanIndex:
+        """Load the index for `root` from locus_dir, or start an empty one."""
+        key = hashlib.sha1(str(Path(root).resolve()).encode("utf-8", "surrogateescape")).hexdigest()[:16]
+        index = cls(root, index_dir(locus_dir) / f"{key}.idx")
+        try:
+            index._entries = _decode(index.file.read_bytes())
+        except (OSError, ValueError, struct.error, zlib.error):
+            # Missing, truncated or from another version: the index is disposable.
+            index._entries = {}
+        return index
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _rel(self, path: str) -> str:
+        return "" if path == self.root else path[len(self._prefix):]
+
+    def list_dir(self, path: str, sizes: bool = True) -> _DirListing | None:
+        """
+        Return the listing of `path`, from the index when its mtime is unchanged.
+        With sizes=False file sizes may be -1, and an entry cached without sizes
+        is only served to such callers. Sized entries listed from another
+        source than `source` are listed again.
+        """
+        rel = self._rel(path)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except PermissionError:
+            return None
+
+        cached = self._entries.get(rel)
+        if cached is not None and cached[0] == mtime and (not sizes or (cached[4] and cached[5] == self.source)):
+            self.hits += 1
+            return _DirListing(path, cached[1], cached[2], cached[3])
+
+        self.misses += 1
+        listing = (self.lister if sizes else self.names_lister)(path)
+        if listing is None:
+            self._entries.pop(rel, None)
+        else:
+            if time.time_ns() - mtime < _RACY_NS:
+                mtime = _NEVER
+            sized = sizes or all(size >= 0 for _, size, _ in listing.files)
+            source = self.source if sizes else "fs"
+            self._entries[rel] = (mtime, listing.dirs, listing.files, listing.has_gitignore, sized, source)
+        self._dirty = True
+        return listing
+
+    def peek(self, path: str, sizes: bool = True) -> _DirListing | None:
+        """
+        The listing of `path` as last cached, without checking it is still current
+        (None when it was never listed, or listed without the sizes asked for).
+        Does not touch the filesystem.
+        """
+        cached = self._entries.get(self._rel(path))
+        if cached is None or (sizes and not cached[4]):
+            return None
+        return _DirListing(path, cached[1], cached[2], cached[3])
+
+    def save(self) -> None:
+        """
+        Write the index back to disk if anything changed. Entries no longer reachable
+        from the root (deleted directories) are dropped. The write is atomic.
+        """
+        if not self._dirty:
+            return
+        reachable: dict[str, _Entry] = {}
+        stack = [""]
+        while stack:
+            rel = stack.pop()
+            entry = self._entries.get(rel)
+            if entry is None:
+                continue
+            reachable[rel] = entry
+            stack.extend(os.path.join(rel, d) if rel else d for d in entry[1])
+        self._entries = reachable
+
+        tmp = self.file.with_suffix(".tmp")
+        try:
+            self.file.parent.mkdir(parents=True, exist_ok=True)
+            tmp.write_bytes(_encode(self._entries))
+            os.replace(tmp, self.file)
+        except OSError:
+            # A read-only home directory must never break a scan.
+            with contextlib.suppress(OSError):
+                tmp.unlink(missing_ok=True)
+            return
+        self._dirty = False
+
+
+def _encode(entries: dict[str, _Entry]) -> bytes:
+    strings: list[str] = []
+    mtimes = array("q")
+    n_dirs = array("I")
+    n_files = array("I")
+    flags = array("B")
+    sizes = array("q")
+    fmtimes = array("d")
+    for rel, (mtime, dirs, files, has_gitignore, sized, source) in entries.items():
+        strings.append(rel)
+        strings.extend(dirs)
+        strings.extend(name for name, _, _ in files)
+        mtimes.append(mtime)
+        n_dirs.append(len(dirs))
+        n_files.append(len(files))
+        flags.append((1 if has_gitignore else 0) | (0 if sized else 2) | (4 if source == "git-index" else 0))
+        sizes.extend(size for _, size, _ in files)
+        fmtimes.extend(mtime for _, _, mtime in files)
+
+    blob = "\0".join(strings).encode("utf-8", "surrogateescape")
+    body = b"".join((
+        _BLOB_LEN.pack(len(blob)), blob,
+        mtimes.tobytes(), n_dirs.tobytes(), n_files.tobytes(), flags.tobytes(), sizes.tobytes(),
+        fmtimes.tobytes(),
+    ))
+    header = _HEADER.pack(_MAGIC, _VERSION, sys.byteorder == "little", len(entries))
+    return header + zlib.compress(body, 1)
+
+
+def _decode(data: bytes) -> dict[str, _Entry]:
+    magic, version, little, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or version != _VERSION or bool(little) != (sys.byteorder == "little"):
+        raise ValueError("incompatible scan index")
+    if count == 0:
+        return {}
+    body = zlib.decompress(data[_HEADER.size:])
+
+    (blob_len,) = _BLOB_LEN.unpack_from(body)
+    offset = _BLOB_LEN.size
+    strings = body[offset:offset + blob_len].decode("utf-8", "surrogateescape").split("\0")
+    offset += blob_len
+
+    def column(typecode: str, n: int) -> array:
+        nonlocal offset
+        col = array(typecode)
+        end = offset + n * col.itemsize
+        col.frombytes(body[offset:end])
+        offset = end
+        return col
+
+    mtimes = column("q", count)
+    n_dirs = column("I", count)
+    n_files = column("I", count)
+    flags = column("B", count)
+    sizes = column("q", sum(n_files))
+    fmtimes = column("d", len(sizes))
+    if len(strings) != count + sum(n_dirs) + len(sizes) or len(fmtimes) != len(sizes):
+        raise ValueError("corrupt scan index")
+
+    entries: dict[str, _Entry] = {}
+    s = f = 0
+    for i in range(count):
+        rel = strings[s]
+        s += 1
+        dirs = strings[s:s + n_dirs[i]]
+        s += n_dirs[i]
+        names = strings[s:s + n_files[i]]
+        s += n_files[i]
+        files = list(zip(names, sizes[f:f + n_files[i]], fmtimes[f:f + n_files[i]]))
+        f += n_files[i]
+        source = "git-index" if flags[i] & 4 else "fs"
+        entries[rel] = (mtimes[i], dirs, files, bool(flags[i] & 1), not flags[i] & 2, source)
+    return entries
@@ -0,0 +1,157 @@
+"""
+Duplicate files for `locus info --duplicates`.
+
+Reading every byte of a large tree to find copies would cost as much as
+copying it, so candidates are narrowed down in stages, each far cheaper than
+the next:
+
+    1. size    the sizes scan() already collected (result.files): only sizes
+               shared by two files or more can hold copies. Empty files are
+               left out. Nothing is read.
+    2. sample  a hash of the first and last _SAMPLE bytes of each candidate:
+               two small reads reject nearly all same-size files that differ.
+               Files up to 2 * _SAMPLE bytes are read whole here and are done.
+    3. full    the survivors of a same-sample group are hashed in full, large
+               files through an mmap rather than read() into Python memory.
+
+Hashing runs on a thread pool: hashlib releases the GIL on large buffers and
+the rest is waiting on I/O, so threads overlap without pickling anything. Hard
+links are the same file, not copies: paths sharing an inode count once.
+"""
+from __future__ import annotations
+
+import hashlib
+import mmap
+import os
+from collections import Counter
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .scanner import InfoResult
+
+_SAMPLE = 4096
+# Below this, read() beats setting up a mapping.
+_MMAP_MIN = 1024 * 1024
+
+
+@dataclass
+class DuplicateGroup:
+    """Files with identical contents."""
+    size: int                # bytes of each copy
+    paths: list[str]         # relative to the root, sorted
+
+    @property
+    def wasted(self) -> int:
+        """Bytes the extra copies take."""
+        return self.size * (len(self.paths) - 1)
+
+
+@dataclass
+class DuplicateReport:
+    groups: list[DuplicateGroup] = field(default_factory=list)  # most wasted bytes first
+    wasted_bytes: int = 0
+    # Files left after each stage, and bytes read by the hashing stages
+    same_size: int = 0
+    same_sample: int = 0
+    bytes_read: int = 0
+
+
+def find_duplicates(result: InfoResult, jobs: int = 0) -> DuplicateReport:
+    """
+    Group the files of `result` (a scan with keep_files=True) by contents.
+    jobs: hashing threads, 0 picks a pool size automatically, 1 hashes serially.
+    """
+    table = result.files
+    if table is None:
+        raise ValueError("find_duplicates() needs scan(..., keep_files=True)")
+    report = DuplicateReport()
+    shared = {size for size, count in Counter(table.size).items() if count > 1 and size > 0}
+    by_size: dict[int, list[str]] = {}
+    for i, size in enumerate(table.size):
+        if size in shared:
+            by_size.setdefault(size, []).append(table.path(i))
+    report.same_size = sum(len(paths) for paths in by_size.values())
+
+    root = str(result.root)
+    pool = ThreadPoolExecutor(max_workers=jobs or None, thread_name_prefix="locus-dup") if jobs != 1 else None
+    try:
+        run = pool.map if pool is not None else map
+        # Stage 2: head + tail samples.
+        candidates = [(size, rel) for size, paths in by_size.items() for rel in paths]
+        sampled = _group(candidates, run(lambda c: _sample(os.path.join(root, c[1]), c[0]), candidates))
+        finished: list[list[tuple[int, str]]] = []
+        to_hash: list[tuple[int, str]] = []
+        for members in sampled:
+            if members[0][0] <= 2 * _SAMPLE:
+                finished.append(members)  # the sample was the whole file
+            else:
+                to_hash.extend(members)
+        report.same_sample = len(to_hash) + sum(len(members) for members in finished)
+        report.bytes_read = sum(min(size, 2 * _SAMPLE) for size, _ in candidates)
+        # Stage 3: full hashes of what is left.
+        finished += _group(to_hash, run(lambda c: _full_hash(os.path.join(root, c[1])), to_hash))
+        report.bytes_read += sum(size for size, _ in to_hash)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    report.groups = sorted(
+        (DuplicateGroup(members[0][0], sorted(rel for _, rel in members)) for members in finished),
+        key=lambda g: (-g.wasted, g.paths[0]),
+    )
+    report.wasted_bytes = sum(group.wasted for group in report.groups)
+    return report
+
+
+def _group(
+    candidates: list[tuple[int, str]], keys: Iterable[tuple[bytes, tuple[int, int]] | None],
+) -> list[list[tuple[int, str]]]:
+    """Candidates with the same size and hash, two or more per group, one path per inode."""
+    groups: dict[tuple[int, bytes], list[tuple[int, str]]] = {}
+    inodes: set[tuple[int, int]] = set()
+    for candidate, key in zip(candidates, keys):
+        if key is None:  # unreadable or changed since the scan
+            continue
+        digest, inode = key
+        if inode in inodes:
+            continue
+        inodes.add(inode)
+        groups.setdefault((candidate[0], digest), []).append(candidate)
+    return [members for members in groups.values() if len(members) > 1]
+
+
+def _sample(path: str, size: int) -> tuple[bytes, tuple[int, int]] | None:
+    """Hash of the first and last _SAMPLE bytes (the whole file when it is small), and the inode."""
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if st.st_size != size:
+                return None
+            h = hashlib.blake2b(digest_size=16)
+            if size <= 2 * _SAMPLE:
+                h.update(f.read())
+            else:
+                h.update(f.read(_SAMPLE))
+                f.seek(size - _SAMPLE)
+                h.update(f.read(_SAMPLE))
+    except OSError:
+        return None
+    return h.digest(), (st.st_dev, st.st_ino)
+
+
+def _full_hash(path: str) -> tuple[bytes, tuple[int, int]] | None:
+    try:
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            h = hashlib.blake2b(digest_size=32)
+            if st.st_size < _MMAP_MIN:
+                h.update(f.read())
+            else:
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    h.update(mm)
+    except (OSError, ValueError):
+        return None
+    return h.digest(), (st.st_dev, st.st_ino)
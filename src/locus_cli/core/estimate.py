@@ -0,0 +1,238 @@
+"""
+Estimated `locus info` for trees too large to walk in time (`locus info --budget 2s`).
+
+The walk starts exactly like scan(), depth first. If it completes within the
+budget, the result is exact. Otherwise it stops halfway through the budget and
+what is left is a frontier of unexplored subtrees, which is sampled:
+
+    each probe picks one frontier subtree at random, then descends from it along
+    a random path to a leaf (Knuth's estimator). A folder met on the way stands
+    for all the folders it was picked among, so its files are counted with a
+    weight equal to the product of the branching factors above it. N times the
+    weighted sum of the path, N being the size of the frontier, is an unbiased
+    estimate of the whole frontier.
+
+Totals are the exact part plus the mean of the probes, with 95% confidence
+intervals from their spread; per-language file counts and bytes are estimated
+the same way. Probes are driven by a seeded random generator and the budget is
+counted in directory listings, so a report is reproducible from its seed and
+listing budget: a time budget is converted into listings once the listing rate
+is known, and the report says which listing budget it ended up with.
+"""
+from __future__ import annotations
+
+import math
+import os
+import random
+import re
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from .scanner import (
+    _DirListing, InfoResult, IgnoreMatcher, LanguageStat, Snapshot,
+    _apply_ignore, _build_matcher, _make_lister, file_extension, scan,
+)
+
+if TYPE_CHECKING:
+    from .cache import ScanIndex
+
+_Z95 = 1.96
+# Fewest probes taken once sampling starts, budget or not: fewer give no usable interval.
+_MIN_PROBES = 30
+
+
+@dataclass(frozen=True)
+class Budget:
+    """How long `info --budget` may walk: seconds, or directory listings (reproducible)."""
+    seconds: float | None = None
+    listings: int | None = None
+
+    @classmethod
+    def parse(cls, text: str) -> Budget:
+        """ "2s", "1.5s", "500ms" or a number of listings ("20000"). """
+        m = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*(ms|s)?\s*", text)
+        if m is None:
+            raise ValueError(f"invalid budget {text!r}, expected e.g. 2s, 500ms or a number of listings")
+        value, unit = float(m.group(1)), m.group(2)
+        if unit is None:
+            if not value.is_integer() or value < 1:
+                raise ValueError(f"a listing budget must be a whole number >= 1, got {text!r}")
+            return cls(listings=int(value))
+        seconds = value / 1000 if unit == "ms" else value
+        if seconds <= 0:
+            raise ValueError(f"a time budget must be positive, got {text!r}")
+        return cls(seconds=seconds)
+
+
+@dataclass
+class Estimate:
+    """How an estimated InfoResult was obtained, and how far off it may be (95% intervals)."""
+    seed: int
+    listings: int               # listing budget used: `--budget <listings> --seed <seed>` reproduces it
+    exact_dirs: int             # directories walked exhaustively
+    frontier: int               # unexplored subtrees left when sampling started
+    probes: int                 # random descents into them
+    files: tuple[float, float]
+    dirs: tuple[float, float]
+    bytes: tuple[float, float]
+    # extension -> interval of its file count, for result.languages
+    languages: dict[str, tuple[float, float]] = field(default_factory=dict)
+
+
+@dataclass
+class _Probe:
+    """Weighted totals of one random descent."""
+    files: float = 0.0
+    dirs: float = 0.0
+    bytes: float = 0.0
+    languages: dict[str, list[float]] = field(default_factory=dict)  # ext -> [files, bytes]
+
+
+def estimate(
+    root: Path,
+    budget: Budget,
+    ignore: list[str] | None = None,
+    seed: int = 0,
+    index: ScanIndex | None = None,
+    source: str = "fs",
+) -> InfoResult:
+    """
+    scan() within `budget`. The result is exact, with result.estimate None, when
+    the walk completes in time; otherwise totals and languages are estimates
+    described by result.estimate, largest_files are the largest files of the
+    walked part and directory rollups are left out (they would only be lower bounds).
+    """
+    if budget.seconds is None and budget.listings is None:
+        raise ValueError("a budget needs seconds or listings")
+    if not root.exists() or not root.is_dir():
+        raise ValueError(f"{root} is not a valid directory")
+    root_path = str(root)
+    list_dir = _make_lister(root_path, source, index)
+    start = time.monotonic()
+    limit = budget.listings
+
+    # ── exact phase: a plain DFS walk, for half the budget ──────────
+    listings: dict[str, _DirListing] = {}
+    stack: list[tuple[str, str, IgnoreMatcher]] = [(root_path, "", _build_matcher(ignore))]
+    while stack:
+        if limit is None:
+            assert budget.seconds is not None
+            elapsed = time.monotonic() - start
+            if listings and elapsed >= budget.seconds / 4:
+                # The listing rate is known: the time budget becomes a listing budget.
+                limit = max(2 * len(listings), int(len(listings) / elapsed * budget.seconds))
+        if limit is not None and len(listings) >= limit // 2:
+            break
+        path, rel, matcher = stack.pop()
+        raw = list_dir(path)
+        if raw is None:
+            continue
+        listing, matcher = _apply_ignore(raw, rel, matcher)
+        listing.has_gitignore = False  # already applied, see Snapshot
+        listings[path] = listing
+        stack.extend(
+            (os.path.join(path, d), f"{rel}/{d}" if rel else d, matcher)
+            for d in listing.dirs if not d.startswith(".")
+        )
+    if index is not None:
+        index.save()
+
+    walked = scan(root, snapshot=Snapshot(root_path, listings), keep_files=bool(stack))
+    if not stack:
+        return walked
+    assert limit is not None and walked.files is not None
+
+    # ── sampling phase: random descents into the unexplored subtrees ──
+    rng = random.Random(seed)
+    cache: dict[str, tuple[_DirListing, IgnoreMatcher] | None] = {}
+    visits = len(listings)
+    probes: list[_Probe] = []
+    while visits < limit or len(probes) < _MIN_PROBES:
+        path, rel, matcher = stack[rng.randrange(len(stack))]
+        probe = _Probe()
+        weight = 1.0
+        while True:
+            visits += 1
+            if path not in cache:
+                raw = list_dir(path)
+                cache[path] = None if raw is None else _apply_ignore(raw, rel, matcher)
+            entry = cache[path]
+            if entry is None:
+                break
+            listing, matcher = entry
+            children = [d for d in listing.dirs if not d.startswith(".")]
+            probe.files += weight * len(listing.files)
+            probe.dirs += weight * len(children)
+            for name, size, _ in listing.files:
+                probe.bytes += weight * size
+                ext = file_extension(name)
+                if ext:
+                    totals = probe.languages.setdefault(ext, [0.0, 0.0])
+                    totals[0] += weight
+                    totals[1] += weight * size
+            if not children:
+                break
+            weight *= len(children)
+            name = rng.choice(children)
+            path, rel = os.path.join(path, name), f"{rel}/{name}" if rel else name
+        probes.append(probe)
+    if index is not None:
+        index.save()
+    return _extrapolate(walked, probes, len(stack), seed, limit, len(listings))
+
+
+def _interval(exact: float, samples: list[float], scale: int) -> tuple[float, float, float]:
+    """(estimate, low, high): exact part plus scale * mean of the samples, 95% interval."""
+    n = len(samples)
+    mean = sum(samples) / n
+    spread = math.sqrt(sum((s - mean) ** 2 for s in samples) / (n - 1)) / math.sqrt(n) if n > 1 else mean
+    value = exact + scale * mean
+    return value, max(exact, value - _Z95 * scale * spread), value + _Z95 * scale * spread
+
+
+def _extrapolate(
+    walked: InfoResult, probes: list[_Probe], frontier: int, seed: int, listings: int, exact_dirs: int,
+) -> InfoResult:
+    files, files_low, files_high = _interval(walked.total_files, [p.files for p in probes], frontier)
+    dirs, dirs_low, dirs_high = _interval(walked.total_dirs, [p.dirs for p in probes], frontier)
+    size, size_low, size_high = _interval(walked.total_bytes, [p.bytes for p in probes], frontier)
+
+    assert walked.files is not None
+    exact_languages = {ls.extension: ls for ls in walked.files.languages()}
+    extensions = set(exact_languages).union(*(p.languages for p in probes))
+    languages: list[LanguageStat] = []
+    intervals: dict[str, tuple[float, float]] = {}
+    for ext in extensions:
+        exact = exact_languages.get(ext, LanguageStat(ext))
+        count, low, high = _interval(
+            exact.file_count, [p.languages.get(ext, (0.0, 0.0))[0] for p in probes], frontier,
+        )
+        ext_bytes, _, _ = _interval(exact.total_bytes, [p.languages.get(ext, (0.0, 0.0))[1] for p in probes], frontier)
+        languages.append(LanguageStat(ext, file_count=round(count), total_bytes=round(ext_bytes)))
+        intervals[ext] = (low, high)
+    languages.sort(key=lambda ls: (-ls.file_count, ls.extension))
+    languages = languages[:5]
+
+    result = InfoResult(
+        root=walked.root,
+        total_files=round(files),
+        total_dirs=round(dirs),
+        total_bytes=round(size),
+        languages=languages,
+        heuristics=walked.heuristics,
+        largest_files=walked.largest_files,
+    )
+    result.estimate = Estimate(
+        seed=seed,
+        listings=listings,
+        exact_dirs=exact_dirs,
+        frontier=frontier,
+        probes=len(probes),
+        files=(files_low, files_high),
+        dirs=(dirs_low, dirs_high),
+        bytes=(size_low, size_high),
+        languages={ls.extension: intervals[ls.extension] for ls in languages},
+    )
+    return result
@@ -1,8 +1,10 @@
 from __future__ import annotations
+import os
 from dataclasses import dataclass, field
 from pathlib import Path
+from typing import Protocol
 
-from .scanner import InfoResult, _EXTENSION_TO_LANGUAGE
+from .scanner import InfoResult, SubProject, _EXTENSION_TO_LANGUAGE
 
 # Maximum characters to read from the README before truncating.
 _README_MAX_CHARS = 3000
@@ -29,123 +31,208 @@ class ProjectContext:
     snippets: list[tuple[str, str]] = field(default_factory=list)
 
 
-def _read_truncated(path: Path, max_chars: int) -> str:
+class ProjectReader(Protocol):
+    """
+    Where extract_context() reads project files from. Paths are "/"-separated and
+    relative to the project root ("" is the root itself).
+    """
+    def is_file(self, rel: str) -> bool: ...
+    def read_text(self, rel: str) -> str | None: ...
+    def read_lines(self, rel: str, max_lines: int) -> list[str] | None: ...
+    def list_dir(self, rel: str) -> list[tuple[str, bool]] | None: ...  # (name, is_dir)
+
+
+class _FsReader:
+    """Reads project files from the working directory."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+
+    def is_file(self, rel: str) -> bool:
+        return (self.root / rel).is_file()
+
+    def read_text(self, rel: str) -> str | None:
+        try:
+            return (self.root / rel).read_text(encoding="utf-8", errors="replace")
+        except OSError:
+            return None
+
+    def read_lines(self, rel: str, max_lines: int) -> list[str] | None:
+        try:
+            lines = []
+            with (self.root / rel).open(encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if len(lines) >= max_lines:
+                        break
+                    lines.append(line)
+            return lines
+        except OSError:
+            return None
+
+    def list_dir(self, rel: str) -> list[tuple[str, bool]] | None:
+        try:
+            return [(e.name, e.is_dir()) for e in (self.root / rel).iterdir()]
+        except OSError:
+            return None
+
+
+class _SubReader:
+    """Reads the sub-directory `prefix` ("/"-separated) of another reader."""
+
+    def __init__(self, reader: ProjectReader, prefix: str) -> None:
+        self.reader = reader
+        self.prefix = prefix
+
+    def _path(self, rel: str) -> str:
+        return f"{self.prefix}/{rel}" if rel else self.prefix
+
+    def is_file(self, rel: str) -> bool:
+        return self.reader.is_file(self._path(rel))
+
+    def read_text(self, rel: str) -> str | None:
+        return self.reader.read_text(self._path(rel))
+
+    def read_lines(self, rel: str, max_lines: int) -> list[str] | None:
+        return self.reader.read_lines(self._path(rel), max_lines)
+
+    def list_dir(self, rel: str) -> list[tuple[str, bool]] | None:
+        return self.reader.list_dir(self._path(rel))
+
+
+def _read_truncated(reader: ProjectReader, rel: str, max_chars: int) -> str:
     """Read a file and return its content, truncated to max_chars."""
-    try:
-        text = path.read_text(encoding="utf-8", errors="replace")
-        if len(text) > max_chars:
-            return text[:max_chars] + "\n... (truncated)"
-        return text
-    except OSError:
+    text = reader.read_text(rel)
+    if text is None:
         return ""
+    if len(text) > max_chars:
+        return text[:max_chars] + "\n... (truncated)"
+    return text
 
 
-def _read_lines(path: Path, max_lines: int) -> str:
+def _read_lines(reader: ProjectReader, rel: str, max_lines: int) -> str:
     """Read up to max_lines from a file, return as a single string."""
-    try:
-        lines = []
-        with path.open(encoding="utf-8", errors="replace") as f:
-            for i, line in enumerate(f):
-                if i >= max_lines:
-                    lines.append(f"... (truncated at line {max_lines})\n")
-                    break
-                lines.append(line)
-        return "".join(lines)
-    except OSError:
+    lines = reader.read_lines(rel, max_lines + 1)
+    if lines is None:
         return ""
+    if len(lines) > max_lines:
+        lines = lines[:max_lines] + [f"... (truncated at line {max_lines})\n"]
+    return "".join(lines)
 
 
-def _build_tree_summary(root: Path, result: InfoResult) -> str:
+def _sorted_entries(reader: ProjectReader, rel: str) -> list[tuple[str, bool]] | None:
+    entries = reader.list_dir(rel)
+    if entries is None:
+        return None
+    return sorted(entries, key=lambda e: (not e[1], e[0].lower()))
+
+
+def _build_tree_summary(root: Path, result: InfoResult, reader: ProjectReader | None = None) -> str:
     """
     Build a simple top-2-level directory listing as plain text.
     Does not re-walk the filesystem — derives structure from the root only.
     """
+    reader = reader or _FsReader(root)
     lines: list[str] = [f"{root.name}/"]
-    try:
-        entries = sorted(root.iterdir(), key=lambda e: (not e.is_dir(), e.name.lower()))
-    except OSError:
+    entries = _sorted_entries(reader, "")
+    if entries is None:
         return lines[0]
 
-    for entry in entries:
-        if entry.name.startswith(".") or entry.name in ("__pycache__", "node_modules", ".venv", "venv"):
+    for name, is_dir in entries:
+        if name.startswith(".") or name in ("__pycache__", "node_modules", ".venv", "venv"):
             continue
-        if entry.is_dir():
-            lines.append(f"  {entry.name}/")
-            try:
-                sub = sorted(entry.iterdir(), key=lambda e: (not e.is_dir(), e.name.lower()))
-                count = 0
-                for sub_entry in sub:
-                    if sub_entry.name.startswith("."):
-                        continue
-                    lines.append(f"    {sub_entry.name}{'/' if sub_entry.is_dir() else ''}")
-                    count += 1
-                    if count >= 8:
-                        lines.append("    ...")
-                        break
-            except OSError:
-                pass
+        if is_dir:
+            lines.append(f"  {name}/")
+            sub = _sorted_entries(reader, name)
+            count = 0
+            for sub_name, sub_is_dir in sub or []:
+                if sub_name.startswith("."):
+                    continue
+                lines.append(f"    {sub_name}{'/' if sub_is_dir else ''}")
+                count += 1
+                if count >= 8:
+                    lines.append("    ...")
+                    break
         else:
-            lines.append(f"  {entry.name}")
+            lines.append(f"  {name}")
 
     return "\n".join(lines)
 
 
-def extract_context(root: Path, result: InfoResult) -> ProjectContext:
+def extract_context(
+    root: Path,
+    result: InfoResult,
+    reader: ProjectReader | None = None,
+    subproject: SubProject | None = None,
+) -> ProjectContext:
     """
     Build a ProjectContext from a root path and the InfoResult from scan().
 
     Args:
-        root:   the directory that was scanned.
+        root:   the directory that was scanned, or the archive (see archive.py).
         result: the InfoResult returned by scan(root).
+        reader: where to read files from. Defaults to the working directory, or
+                to the archive's members; pass a gitrev.GitRevReader to
+                describe a revision instead.
+        subproject: describe one of result.subprojects instead of the whole
+                    root: its own heuristics, languages, files and tree.
     Returns:
         a ProjectContext ready to be passed to the prompt builder.
     """
+    prefix = subproject.path.replace(os.sep, "/") if subproject is not None else ""
+    if reader is None:
+        from .archive import ArchiveReader, is_archive
+        if is_archive(root):
+            reader = ArchiveReader(root, prefix)
+        else:
+            reader = _FsReader(root / prefix)
+    elif prefix:
+        reader = _SubReader(reader, prefix)
+    heuristics = result.heuristics if subproject is None else subproject.heuristics
+
     # ── project type ────────────────────────────────────────────────
-    project_type = result.heuristics.project_type or "Unknown"
+    project_type = heuristics.project_type or "Unknown"
 
     # ── primary language ────────────────────────────────────────────
-    if result.languages:
-        primary_language = _EXTENSION_TO_LANGUAGE.get(
-            result.languages[0].extension, result.languages[0].extension
-        )
+    if subproject is not None:
+        stat = result.directories.get(subproject.path)
+        counts = stat.languages if stat is not None else {}
+        top = max(counts, key=lambda ext: counts[ext]) if counts else None
     else:
-        primary_language = "Unknown"
+        top = result.languages[0].extension if result.languages else None
+    primary_language = _EXTENSION_TO_LANGUAGE.get(top, top) if top else "Unknown"
 
     # ── README ──────────────────────────────────────────────────────
     readme: str | None = None
     for name in _README_NAMES:
-        candidate = root / name
-        if candidate.is_file():
-            readme = _read_truncated(candidate, _README_MAX_CHARS)
+        if reader.is_file(name):
+            readme = _read_truncated(reader, name, _README_MAX_CHARS)
             break
 
     # ── tree summary ────────────────────────────────────────────────
-    tree_summary = _build_tree_summary(root, result)
+    tree_summary = _build_tree_summary(root / prefix if prefix else root, result, reader)
 
     # ── key file snippets ───────────────────────────────────────────
     snippets: list[tuple[str, str]] = []
 
     # Entry point files (root-level only, already detected by scanner)
-    for ep in result.heuristics.entry_points[:3]:
-        path = root / ep
-        if path.is_file():
-            content = _read_lines(path, _SNIPPET_MAX_LINES)
+    for ep in heuristics.entry_points[:3]:
+        if reader.is_file(ep):
+            content = _read_lines(reader, ep, _SNIPPET_MAX_LINES)
             if content.strip():
                 snippets.append((ep, content))
 
     # Dependency manifest (gives the LLM package name + deps context)
-    dep = result.heuristics.dependency_file
+    dep = heuristics.dependency_file
     if dep:
-        dep_path = root / dep
-        if dep_path.is_file():
-            content = _read_lines(dep_path, _MANIFEST_MAX_LINES)
+        if reader.is_file(dep):
+            content = _read_lines(reader, dep, _MANIFEST_MAX_LINES)
             if content.strip():
                 snippets.append((dep, content))
 
     return ProjectContext(
         project_type=project_type,
         primary_language=primary_language,
-        dependency_file=result.heuristics.dependency_file,
+        dependency_file=heuristics.dependency_file,
         readme=readme,
         tree_summary=tree_summary,
         snippets=snippets,
@@ -0,0 +1,164 @@
+"""
+Columnar in-memory table of scanned files — `InfoResult.files`, see scan(keep_files=True).
+
+A list with one object per file costs hundreds of bytes per entry. Here every
+file is one row spread over typed arrays instead:
+
+    dir_id    uint32   index into `dirs`, the interned directory paths
+    name_end  uint32   end offset of the file name in the utf-8 name blob
+    size      int64    bytes
+    ext_id    uint32   index into `exts`, the interned extensions ("" = none)
+    mtime     uint32   whole seconds since the epoch, 0 if unknown
+
+Depth is stored once per directory, not per file. That is 24 bytes per file plus
+its name, so well under 40 bytes for typical trees; the name blob is limited to
+4 GiB. Aggregations (per-language totals, largest-N, size percentiles) run over
+whole columns: with NumPy installed they use zero-copy views of the arrays,
+otherwise plain loops over the same arrays.
+"""
+from __future__ import annotations
+
+import heapq
+import math
+import os
+from array import array
+from collections.abc import Sequence
+from typing import Any
+
+from .scanner import FileEntry, LanguageStat
+
+_MAX_MTIME = 0xFFFFFFFF
+
+
+def _numpy() -> Any:
+    """The numpy module, or None when it is not installed (it is optional)."""
+    try:
+        import numpy  # type: ignore[import]
+    except ImportError:
+        return None
+    return numpy
+
+
+class FileTable:
+    """Append-only columnar store of file records. Row order is scan order."""
+
+    def __init__(self) -> None:
+        self.dirs: list[str] = []       # directory paths relative to the root ("" = root)
+        self.exts: list[str] = [""]
+        self._dir_depth = array("H")
+        self._dir_index: dict[str, int] = {}
+        self._ext_index: dict[str, int] = {"": 0}
+        self._names = bytearray()
+        self._name_end = array("I")
+        self.dir_id = array("I")
+        self.size = array("q")
+        self.ext_id = array("I")
+        self.mtime = array("I")
+        self._last_prefix: str | None = None
+        self._last_dir = 0
+
+    def __len__(self) -> int:
+        return len(self.size)
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the per-file columns and the name blob."""
+        columns = (self._name_end, self.dir_id, self.size, self.ext_id, self.mtime)
+        return len(self._names) + sum(len(c) * c.itemsize for c in columns)
+
+    def add(self, entry: FileEntry) -> None:
+        """Append one file streamed by scanner.iter_entries()."""
+        name = entry.name
+        prefix = entry.path[:len(entry.path) - len(name)]  # "src/pkg/" or ""
+        # Files of one directory arrive together, so one comparison usually suffices.
+        if prefix != self._last_prefix:
+            self._last_prefix = prefix
+            dir_id = self._dir_index.get(prefix)
+            if dir_id is None:
+                dir_id = self._dir_index[prefix] = len(self.dirs)
+                self.dirs.append(prefix[:-1])
+                self._dir_depth.append(entry.depth)
+            self._last_dir = dir_id
+        ext_id = self._ext_index.get(entry.ext)
+        if ext_id is None:
+            ext_id = self._ext_index[entry.ext] = len(self.exts)
+            self.exts.append(entry.ext)
+        encoded = name.encode("utf-8", "surrogateescape")
+        mtime = min(int(entry.mtime), _MAX_MTIME) if entry.mtime > 0 else 0
+
+        # Every value is ready: the columns grow together or, if one overflows
+        # (the name blob past 4 GiB), before any of them has grown.
+        self._name_end.append(len(self._names) + len(encoded))
+        self._names += encoded
+        self.dir_id.append(self._last_dir)
+        self.size.append(entry.size)
+        self.ext_id.append(ext_id)
+        self.mtime.append(mtime)
+
+    # ── row access ──────────────────────────────────────────────────
+
+    def name(self, i: int) -> str:
+        start = self._name_end[i - 1] if i else 0
+        return self._names[start:self._name_end[i]].decode("utf-8", "surrogateescape")
+
+    def path(self, i: int) -> str:
+        """Path of row i relative to the root, as in FileEntry.path."""
+        directory = self.dirs[self.dir_id[i]]
+        return directory + os.sep + self.name(i) if directory else self.name(i)
+
+    def depth(self, i: int) -> int:
+        return self._dir_depth[self.dir_id[i]]
+
+    # ── aggregations ────────────────────────────────────────────────
+
+    def languages(self) -> list[LanguageStat]:
+        """File count and bytes per extension, in order of first appearance."""
+        n_exts = len(self.exts)
+        np = _numpy()
+        if np is not None and len(self):
+            ext_ids = np.frombuffer(self.ext_id, dtype=np.uint32)
+            counts = np.bincount(ext_ids, minlength=n_exts).tolist()
+            totals = np.bincount(
+                ext_ids, weights=np.frombuffer(self.size, dtype=np.int64), minlength=n_exts,
+            ).astype(np.int64).tolist()
+        else:
+            counts = [0] * n_exts
+            totals = [0] * n_exts
+            for ext_id, size in zip(self.ext_id, self.size):
+                counts[ext_id] += 1
+                totals[ext_id] += size
+        return [
+            LanguageStat(extension=ext, file_count=counts[i], total_bytes=totals[i])
+            for i, ext in enumerate(self.exts)
+            if i and counts[i]
+        ]
+
+    def largest(self, n: int = 5) -> list[tuple[str, int]]:
+        """The n largest files as (path, size), largest first; ties by path, descending."""
+        if n <= 0 or not len(self):
+            return []
+        n = min(n, len(self))
+        np = _numpy()
+        if np is not None:
+            sizes = np.frombuffer(self.size, dtype=np.int64)
+            threshold = int(np.partition(sizes, len(sizes) - n)[len(sizes) - n])
+            candidates = np.flatnonzero(sizes >= threshold).tolist()
+        else:
+            threshold = heapq.nlargest(n, self.size)[-1]
+            candidates = [i for i, size in enumerate(self.size) if size >= threshold]
+        # Only files tied with the n-th largest need their path built to break ties.
+        rows = sorted(((self.size[i], self.path(i)) for i in candidates), reverse=True)[:n]
+        return [(path, size) for size, path in rows]
+
+    def size_percentiles(self, percentiles: Sequence[float] = (50, 90, 99)) -> list[int]:
+        """File sizes at the given percentiles (nearest-rank method)."""
+        count = len(self)
+        if not count:
+            return [0 for _ in percentiles]
+        ranks = [min(max(math.ceil(p / 100 * count) - 1, 0), count - 1) for p in percentiles]
+        np = _numpy()
+        if np is not None:
+            sizes = np.frombuffer(self.size, dtype=np.int64)
+            return [int(v) for v in np.partition(sizes, ranks)[ranks]]
+        ordered = sorted(self.size)
+        return [ordered[r] for r in ranks]
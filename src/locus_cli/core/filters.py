@@ -0,0 +1,55 @@
+"""
+File filters for `locus tree --include/--lang/--min-size`.
+
+A filter decides which files are shown; LocusMap then prunes every folder with no
+matching file below it. Name-based checks (globs, languages) need nothing but the
+directory listing, so they run first: only files that pass them are ever
+stat()-ed, and only when a minimum size is asked for.
+"""
+from __future__ import annotations
+
+from collections.abc import Iterable
+
+from .ignore import GlobSet
+from .scanner import _EXTENSION_TO_LANGUAGE, file_extension
+
+
+class FileFilter:
+    """
+    include:   gitignore-style globs; a file matches one of them (`*.py`,
+               `*_test.go`, `src/**/*.sql`; `!pattern` excludes again)
+    languages: language names from the `locus info` table, case-insensitive
+    min_size:  smallest file size shown, in bytes
+    Every criterion given must hold; an empty filter matches everything.
+    """
+
+    def __init__(self, include: Iterable[str] = (), languages: Iterable[str] = (), min_size: int = 0) -> None:
+        self.include = tuple(include)
+        self.languages = tuple(languages)
+        self.min_size = min_size
+        if min_size < 0:
+            raise ValueError(f"min_size must be >= 0, got {min_size}")
+        self._globs = GlobSet(self.include) if self.include else None
+        self._extensions: frozenset[str] | None = None
+        if self.languages:
+            by_name: dict[str, set[str]] = {}
+            for ext, language in _EXTENSION_TO_LANGUAGE.items():
+                by_name.setdefault(language.lower(), set()).add(ext)
+            unknown = [name for name in self.languages if name.lower() not in by_name]
+            if unknown:
+                raise ValueError(
+                    f"unknown language {unknown[0]!r}, expected one of "
+                    f"{', '.join(sorted(set(_EXTENSION_TO_LANGUAGE.values())))}"
+                )
+            self._extensions = frozenset().union(*(by_name[name.lower()] for name in self.languages))
+
+    def __bool__(self) -> bool:
+        return bool(self.include or self.languages or self.min_size)
+
+    def match_name(self, rel_dir: str, name: str) -> bool:
+        """The checks that need no stat(): language and globs. rel_dir is "/"-separated."""
+        if self._extensions is not None and file_extension(name) not in self._extensions:
+            return False
+        if self._globs is not None:
+            return self._globs.match(f"{rel_dir}/{name}" if rel_dir else name)
+        return True
@@ -0,0 +1,201 @@
+"""
+Git index fast path — tracked files and their sizes straight from `.git/index`.
+
+Git already records, for every tracked file, its path, size and mtime as of the
+last `git add`/checkout. A directory is still read with scandir() so untracked
+files are seen, and, as `git status` does, an index entry is only trusted while
+the file's size and mtime still match it: files edited since the last `git add`
+are reported as they are on disk, never with their staged size.
+
+Index versions 2, 3 and 4 (path prefix compression) are supported. Split indexes
+(`link` extension) only hold a delta against a shared index, so they are reported
+as unreadable and the caller falls back to the filesystem.
+"""
+from __future__ import annotations
+
+import os
+import struct
+from collections.abc import Iterator
+from pathlib import Path
+
+from .scanner import _DirListing, _list_dir
+
+_HEADER = struct.Struct(">4sII")
+# ctime s/ns, mtime s/ns, dev, ino, mode, uid, gid, size — then a 20-byte id and u16 flags
+_ENTRY = struct.Struct(">10I20sH")
+_EXT_HEADER = struct.Struct(">4sI")
+_CHECKSUM_LEN = 20
+
+_FLAG_EXTENDED = 0x4000
+_NAME_MASK = 0x0FFF
+_REGULAR_FILE = 0o100000
+_TYPE_MASK = 0o170000
+
+
+def find_git_dir(root: Path) -> Path | None:
+    """Return the git directory of a repository rooted at `root`, or None."""
+    dot_git = root / ".git"
+    if dot_git.is_dir():
+        return dot_git
+    if dot_git.is_file():
+        # Worktrees and submodules: ".git" is a file containing "gitdir: <path>"
+        try:
+            first = dot_git.read_text(errors="replace").splitlines()[0]
+        except (OSError, IndexError):
+            return None
+        if first.startswith("gitdir:"):
+            git_dir = (root / first[len("gitdir:"):].strip()).resolve()
+            return git_dir if git_dir.is_dir() else None
+    return None
+
+
+def _varint(data: bytes, offset: int) -> tuple[int, int]:
+    """Decode git's offset varint (used by index v4 path compression)."""
+    c = data[offset]
+    offset += 1
+    value = c & 0x7F
+    while c & 0x80:
+        c = data[offset]
+        offset += 1
+        value = ((value + 1) << 7) | (c & 0x7F)
+    return value, offset
+
+
+def parse_index(data: bytes) -> Iterator[tuple[str, int, int]]:
+    """
+    Yield (path, mode, size) for every stage-0 entry of a git index file.
+    Paths are "/"-separated and relative to the work tree root.
+    Raises ValueError for anything that is not a readable v2-v4 index.
+    """
+    for path, mode, size, _ in _parse_entries(data):
+        yield path, mode, size
+
+
+def _parse_entries(data: bytes) -> Iterator[tuple[str, int, int, int]]:
+    """parse_index() plus each entry's mtime (epoch nanoseconds)."""
+    signature, version, count = _HEADER.unpack_from(data)
+    if signature != b"DIRC" or version not in (2, 3, 4):
+        raise ValueError("not a git index (v2-v4)")
+
+    offset = _HEADER.size
+    previous = b""
+    for _ in range(count):
+        fields = _ENTRY.unpack_from(data, offset)
+        mode, size, flags = fields[6], fields[9], fields[11]
+        mtime_ns = fields[2] * 1_000_000_000 + fields[3]
+        start = offset
+        offset += _ENTRY.size
+        if version >= 3 and flags & _FLAG_EXTENDED:
+            offset += 2
+
+        if version == 4:
+            strip, offset = _varint(data, offset)
+            end = data.index(b"\0", offset)
+            path = previous[:len(previous) - strip] + data[offset:end]
+            offset = end + 1
+        else:
+            name_len = flags & _NAME_MASK
+            end = offset + name_len if name_len < _NAME_MASK else data.index(b"\0", offset)
+            path = data[offset:end]
+            # Entries are NUL-padded to a multiple of 8 bytes (at least one NUL).
+            offset = start + ((offset - start + len(path) + 8) & ~7)
+        previous = path
+
+        if (flags >> 12) & 0x3:
+            continue  # merge-conflict stages 1-3 duplicate the path
+        yield path.decode("utf-8", "surrogateescape"), mode, size, mtime_ns
+
+    # Extensions follow the entries; a split index keeps most entries elsewhere.
+    while offset + _EXT_HEADER.size <= len(data) - _CHECKSUM_LEN:
+        signature, length = _EXT_HEADER.unpack_from(data, offset)
+        if signature == b"link":
+            raise ValueError("split git index is not supported")
+        offset += _EXT_HEADER.size + length
+
+
+def read_tracked(git_dir: Path) -> dict[str, dict[str, int]]:
+    """
+    Read `<git_dir>/index` and group tracked regular files by directory:
+    {"src/pkg": {"module.py": 1234, ...}, "": {...root files...}}.
+    """
+    return {
+        directory: {name: size for name, (size, _) in files.items()}
+        for directory, files in _read_tracked_stats(git_dir).items()
+    }
+
+
+def _read_tracked_stats(git_dir: Path) -> dict[str, dict[str, tuple[int, int]]]:
+    """read_tracked() with (size, mtime in ns) per file."""
+    tracked: dict[str, dict[str, tuple[int, int]]] = {}
+    for path, mode, size, mtime in _parse_entries((git_dir / "index").read_bytes()):
+        if mode & _TYPE_MASK != _REGULAR_FILE:
+            continue  # symlinks, submodules, sparse directory entries
+        directory, _, name = path.rpartition("/")
+        files = tracked.get(directory)
+        if files is None:
+            files = tracked[directory] = {}
+        files[name] = (size, mtime)
+    return tracked
+
+
+class GitIndexLister:
+    """
+    Drop-in replacement for scanner._list_dir() backed by the git index. Tracked
+    file sizes and mtimes come from the index while they match the file's stat
+    data; directories git does not know about, untracked files inside known ones
+    and files changed since they were staged fall back to the filesystem.
+    """
+
+    def __init__(self, root: str, tracked: dict[str, dict[str, tuple[int, int]]]) -> None:
+        self.root = root
+        self.tracked = tracked
+        self._prefix = root if root.endswith(os.sep) else root + os.sep
+
+    @classmethod
+    def open(cls, root: Path | str) -> GitIndexLister | None:
+        """Return a lister for `root`, or None when it is not a git work tree with a readable index."""
+        git_dir = find_git_dir(Path(root))
+        if git_dir is None:
+            return None
+        try:
+            tracked = _read_tracked_stats(git_dir)
+        except (OSError, ValueError, IndexError, struct.error):
+            return None
+        return cls(str(root), tracked)
+
+    def list_dir(self, path: str) -> _DirListing | None:
+        rel = "" if path == self.root else path[len(self._prefix):].replace(os.sep, "/")
+        known = self.tracked.get(rel)
+        if known is None:
+            return _list_dir(path)
+
+        try:
+            entries = list(os.scandir(path))
+        except PermissionError:
+            return None
+
+        listing = _DirListing(path)
+        for entry in entries:
+            name = entry.name
+            try:
+                is_dir  = entry.is_dir(follow_symlinks=False)
+                is_file = entry.is_file(follow_symlinks=False)
+            except OSError:
+                continue
+            if is_dir:
+                listing.dirs.append(name)
+            elif name == ".gitignore":
+                listing.has_gitignore = True
+            elif is_file and not name.startswith("."):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    listing.files.append((name, 0, -1.0))
+                    continue
+                # Like `git status`: an entry whose cached size or mtime no longer
+                # matches the file is stale (edited since `git add`), the disk wins.
+                cached = known.get(name)
+                if cached is None or cached != (st.st_size, st.st_mtime_ns):
+                    cached = (st.st_size, st.st_mtime_ns)
+                listing.files.append((name, cached[0], cached[1] / 1e9))
+        return listing
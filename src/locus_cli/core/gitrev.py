@@ -0,0 +1,224 @@
+"""
+Scanning a git revision without checking it out (`--rev <commit-ish>`).
+
+`git ls-tree -r -t -l` lists every tree and blob of a revision with blob sizes, in
+git's sorted order: a tree entry comes right before its (contiguous) contents, so
+the output is a pre-order DFS. It is parsed incrementally from the pipe and turned
+into the same per-directory listings the filesystem walker produces; a directory's
+listing is complete — and yielded — as soon as the stream leaves its subtree, so
+memory stays proportional to the open directories, not to the revision size.
+
+File contents needed by the extractor (README, manifest, entry points) and the
+small top-level directory summary are served by one `git cat-file --batch` process.
+"""
+from __future__ import annotations
+
+import os
+import subprocess
+from collections.abc import Iterator
+from pathlib import Path
+
+from .ignore import IgnoreMatcher
+from .scanner import _DirListing
+
+_CHUNK = 64 * 1024
+_BLOB_MODES = (b"100644", b"100755")
+
+
+def _tree_ish(rev: str) -> str:
+    # "<rev>:./" names the tree of the current directory, so running git from a
+    # sub-directory of the work tree scans just that sub-directory. ls-tree needs
+    # --full-tree with it, or it would also filter that tree by the cwd prefix.
+    return f"{rev}:./"
+
+
+def _commit_time(root: Path, rev: str) -> float:
+    """Committer timestamp of `rev`, reported as the mtime of every file; -1 if unknown."""
+    try:
+        out = subprocess.run(
+            ["git", "show", "-s", "--format=%ct", f"{rev}^{{commit}}", "--"],
+            cwd=root, capture_output=True, text=True,
+        )
+    except FileNotFoundError:
+        return -1.0
+    return float(out.stdout.strip()) if out.returncode == 0 and out.stdout.strip().isdigit() else -1.0
+
+
+def _ls_tree_records(root: Path, rev: str) -> Iterator[tuple[bytes, bytes, int, str]]:
+    """Stream (mode, type, size, path) records of `git ls-tree -r -t -l -z`."""
+    try:
+        proc = subprocess.Popen(
+            ["git", "ls-tree", "--full-tree", "-r", "-t", "-l", "-z", _tree_ish(rev)],
+            cwd=root,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+        )
+    except FileNotFoundError:
+        raise ValueError("--rev needs git, which was not found on PATH") from None
+    assert proc.stdout is not None and proc.stderr is not None
+    pending = b""
+    try:
+        while True:
+            chunk = proc.stdout.read(_CHUNK)
+            if not chunk:
+                break
+            records = (pending + chunk).split(b"\0")
+            pending = records.pop()
+            for record in records:
+                meta, _, path = record.partition(b"\t")
+                mode, kind, _, size = meta.split()
+                yield mode, kind, int(size) if size != b"-" else 0, path.decode("utf-8", "surrogateescape")
+    except BaseException:
+        proc.kill()  # consumer stopped early (or failed): don't leave git running
+        raise
+    finally:
+        proc.stdout.close()
+        stderr = proc.stderr.read().decode(errors="replace").strip()
+        proc.stderr.close()
+        returncode = proc.wait()
+    if returncode != 0:
+        raise ValueError(f"git ls-tree {rev!r} failed: {stderr or 'unknown error'}")
+
+
+def iter_rev_listings(
+    root: Path,
+    rev: str,
+    matcher: IgnoreMatcher,
+    max_depth: int | None = None,
+) -> Iterator[_DirListing]:
+    """
+    Yield one filtered listing per directory of `rev` (under `root`), in post-order:
+    children before their parent, the root last. Listing paths are the paths the
+    directories would have in the work tree. Default ignores and --ignore patterns
+    apply; .gitignore files do not, since tracked files are never ignored by git.
+    Files carry the commit time as their mtime.
+
+    max_depth: only directories at depth < max_depth are yielded (root = depth 0),
+               deeper ones still appear by name in their parent's listing.
+    """
+    root_path = str(root)
+    mtime = _commit_time(root, rev)
+    # Stack of open directories: (rel path, depth, listing or None when not yielded)
+    stack: list[tuple[str, int, _DirListing | None]] = [("", 0, _DirListing(root_path))]
+    skip_prefix: str | None = None
+
+    def _close_until(parent: str) -> Iterator[_DirListing]:
+        while stack[-1][0] != parent:
+            _, _, listing = stack.pop()
+            if listing is not None:
+                yield listing
+
+    for mode, kind, size, path in _ls_tree_records(root, rev):
+        if skip_prefix is not None and path.startswith(skip_prefix):
+            continue
+        skip_prefix = None
+
+        parent, _, name = path.rpartition("/")
+        yield from _close_until(parent)
+        _, depth, parent_listing = stack[-1]
+        is_tree = kind == b"tree"
+
+        if matcher.is_ignored(parent, name, is_tree or kind == b"commit"):
+            if is_tree:
+                skip_prefix = path + "/"
+            continue
+
+        if is_tree or kind == b"commit":  # submodules show up as plain directories
+            if parent_listing is not None:
+                parent_listing.dirs.append(name)
+            if is_tree:
+                if name.startswith("."):
+                    skip_prefix = path + "/"  # hidden dirs are listed but never entered
+                else:
+                    child_depth = depth + 1
+                    keep = max_depth is None or child_depth < max_depth
+                    listing = _DirListing(os.path.join(root_path, *path.split("/"))) if keep else None
+                    stack.append((path, child_depth, listing))
+        elif mode in _BLOB_MODES and not name.startswith(".") and parent_listing is not None:
+            parent_listing.files.append((name, size, mtime))
+
+    yield from _close_until("")
+    _, _, root_listing = stack.pop()
+    assert root_listing is not None
+    yield root_listing
+
+
+def _parse_tree(data: bytes, oid_len: int) -> list[tuple[str, bool]]:
+    """Decode a raw tree object into (name, is_dir) pairs."""
+    entries: list[tuple[str, bool]] = []
+    i = 0
+    while i < len(data):
+        space = data.index(b" ", i)
+        nul = data.index(b"\0", space)
+        mode = data[i:space]
+        entries.append((data[space + 1:nul].decode("utf-8", "surrogateescape"), mode == b"40000"))
+        i = nul + 1 + oid_len
+    return entries
+
+
+class GitRevReader:
+    """
+    Reads files and directory listings of a revision through one long-lived
+    `git cat-file --batch` process. Same interface as extractor's filesystem reader.
+    Use as a context manager, or call close().
+    """
+
+    def __init__(self, root: Path, rev: str) -> None:
+        self.root = root
+        self.rev = rev
+        self._proc = subprocess.Popen(
+            ["git", "cat-file", "--batch"],
+            cwd=root,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+    def __enter__(self) -> GitRevReader:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._proc.poll() is None:
+            assert self._proc.stdin is not None
+            self._proc.stdin.close()
+            self._proc.wait()
+
+    def _object(self, rel: str) -> tuple[bytes, bytes, int] | None:
+        """Return (type, content, object id length in bytes) or None if missing."""
+        assert self._proc.stdin is not None and self._proc.stdout is not None
+        self._proc.stdin.write(f"{self.rev}:./{rel}\n".encode("utf-8", "surrogateescape"))
+        self._proc.stdin.flush()
+        header = self._proc.stdout.readline().rstrip(b"\n")
+        if header.endswith((b" missing", b" ambiguous")):
+            return None
+        oid, kind, size = header.split()
+        content = self._proc.stdout.read(int(size))
+        self._proc.stdout.read(1)  # trailing newline
+        return kind, content, len(oid) // 2
+
+    def is_file(self, rel: str) -> bool:
+        obj = self._object(rel)
+        return obj is not None and obj[0] == b"blob"
+
+    def read_bytes(self, rel: str) -> bytes | None:
+        obj = self._object(rel)
+        if obj is None or obj[0] != b"blob":
+            return None
+        return obj[1]
+
+    def read_text(self, rel: str) -> str | None:
+        data = self.read_bytes(rel)
+        return None if data is None else data.decode("utf-8", errors="replace")
+
+    def read_lines(self, rel: str, max_lines: int) -> list[str] | None:
+        text = self.read_text(rel)
+        return None if text is None else text.splitlines(keepends=True)[:max_lines]
+
+    def list_dir(self, rel: str) -> list[tuple[str, bool]] | None:
+        obj = self._object(rel)
+        if obj is None or obj[0] != b"tree":
+            return None
+        return _parse_tree(obj[1], obj[2])
@@ -0,0 +1,219 @@
+"""
+Gitignore matching shared by the scanner (`locus info`) and LocusMap (`locus tree`).
+
+Supports the gitignore grammar: globs (`*`, `?`, `[...]`), `**`, patterns anchored
+with a leading or inner `/`, negation with `!`, directory-only patterns ending in
+`/`, escapes, and one rule set per `.gitignore` file stacked by directory (deeper
+files take precedence, and within a file the last matching line wins).
+
+Every rule set is compiled once into a single combined regex, so checking a path
+costs one set lookup plus one regex match per .gitignore on the way to the root.
+Matching is meant to be applied while walking: an ignored directory is never
+listed, which is what lets large generated trees be skipped entirely.
+"""
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable
+from pathlib import Path
+
+# Folders skipped by every command (`tree`, `info`, `overview`) at any depth.
+DEFAULT_IGNORE: frozenset[str] = frozenset({
+    "__pycache__", "node_modules", "venv", "myEnv",
+    ".git", ".idea", ".vscode", "dist", "build",
+    "target", "bin", "obj", "vendor",       # Rust/Java, C#, PHP/Go
+    ".venv", "env", ".env",                 # more common Python venv names
+    "out", "output", "cache", ".cache",     # generic build output dirs
+    "coverage", ".nyc_output",              # test coverage artifacts
+    ".tox", ".nox",                         # Python test runners
+})
+
+# Characters that make an --ignore value a pattern rather than a plain name.
+_GLOB_CHARS = frozenset("*?[/!\\")
+
+
+def read_gitignore(path: Path | str) -> list[str]:
+    """Return the lines of a .gitignore file, or [] when it cannot be read."""
+    try:
+        return Path(path).read_text(errors="replace").splitlines()
+    except OSError:
+        return []
+
+
+def _translate(pattern: str) -> str:
+    """Translate one gitignore glob (without anchoring/negation markers) to a regex."""
+    out: list[str] = []
+    i, n = 0, len(pattern)
+    while i < n:
+        c = pattern[i]
+        if c == "*":
+            if pattern.startswith("**", i):
+                j = i + 2
+                whole_segment = (i == 0 or pattern[i - 1] == "/") and (j == n or pattern[j] == "/")
+                if whole_segment:
+                    if j == n:
+                        out.append(".*")            # "foo/**": everything inside foo
+                    else:
+                        out.append("(?:.*/)?")      # "**/foo", "a/**/b": zero or more dirs
+                        j += 1
+                    i = j
+                    continue
+                i = j                               # "a**b" is just a "*"
+            else:
+                i += 1
+            out.append("[^/]*")
+            continue
+        if c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            start = i + 1
+            if start < n and pattern[start] in "!^":
+                start += 1
+            if start < n and pattern[start] == "]":
+                start += 1                          # "[]a]": a leading "]" is literal
+            end = pattern.find("]", start)
+            if end == -1:
+                out.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith("!"):
+                    body = "^" + body[1:]
+                out.append("[" + body.replace("\\", "\\\\").replace("[", "\\[") + "]")
+                i = end + 1
+                continue
+        elif c == "\\" and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+class _RuleSet:
+    """The compiled rules of one .gitignore file (or of the --ignore patterns)."""
+
+    def __init__(self, base: str, lines: Iterable[str]) -> None:
+        self.base = base  # directory the rules are relative to, "" for the root
+        self._prefix = base + "/" if base else ""
+        dir_rules: list[tuple[str, bool]] = []   # (regex, negated), all rules
+        file_rules: list[tuple[str, bool]] = []  # same minus directory-only rules
+
+        for raw in lines:
+            line = raw.rstrip("\r")
+            stripped = line.rstrip(" ")
+            if stripped.endswith("\\") and len(stripped) < len(line):
+                stripped += " "                  # "foo\ " keeps its escaped space
+            line = stripped
+            if not line or line.startswith("#"):
+                continue
+            negated = line.startswith("!")
+            if negated:
+                line = line[1:]
+            dir_only = line.endswith("/")
+            line = line.rstrip("/")
+            if not line:
+                continue
+            # A slash anywhere but at the end anchors the pattern to `base`.
+            anchored = "/" in line
+            regex = ("" if anchored else "(?:.*/)?") + _translate(line.lstrip("/"))
+            dir_rules.append((regex, negated))
+            if not dir_only:
+                file_rules.append((regex, negated))
+
+        self._dirs = self._combine(dir_rules)
+        self._files = self._combine(file_rules)
+
+    @staticmethod
+    def _combine(rules: list[tuple[str, bool]]) -> tuple[re.Pattern[str], list[bool]] | None:
+        """
+        Fold all rules into one alternation, last rule first: the regex engine picks
+        the first alternative that matches, which is then the last matching line.
+        """
+        if not rules:
+            return None
+        rules = rules[::-1]
+        combined = re.compile("|".join(f"({regex})" for regex, _ in rules))
+        return combined, [negated for _, negated in rules]
+
+    def match(self, path: str, is_dir: bool) -> bool | None:
+        """True = ignored, False = re-included by a negation, None = no rule matched."""
+        compiled = self._dirs if is_dir else self._files
+        if compiled is None:
+            return None
+        if self._prefix:
+            if not path.startswith(self._prefix):
+                return None
+            path = path[len(self._prefix):]
+        m = compiled[0].fullmatch(path)
+        if m is None:
+            return None
+        return not compiled[1][m.lastindex - 1]  # type: ignore[operator]
+
+
+class GlobSet:
+    """
+    Gitignore-style globs used the other way round: to select files rather than
+    to hide them (`locus tree --include`). A path matches when the last pattern
+    that applies to it is not a `!` negation.
+    """
+
+    def __init__(self, patterns: Iterable[str]) -> None:
+        self.patterns = tuple(patterns)
+        self._rules = _RuleSet("", self.patterns)
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def match(self, path: str) -> bool:
+        """path: a file, "/"-separated and relative to the root the globs are for."""
+        return self._rules.match(path, False) is True
+
+
+class IgnoreMatcher:
+    """
+    Immutable stack of ignore rules. `names` are plain entry names ignored at any
+    depth (default ignores, plain --ignore values); rule sets are gitignore files.
+    extend() returns a new matcher, so sibling directories can share their parent's.
+    """
+
+    def __init__(self, names: Iterable[str] = (), rulesets: tuple[_RuleSet, ...] = ()) -> None:
+        self.names = frozenset(names)
+        self.rulesets = rulesets
+
+    @classmethod
+    def from_patterns(cls, names: Iterable[str], patterns: Iterable[str] = ()) -> IgnoreMatcher:
+        """
+        Build the root matcher: `names` are always exact names; each of `patterns` is
+        an exact name unless it contains glob syntax, then it is a root-level rule.
+        """
+        plain = set(names)
+        rules: list[str] = []
+        for p in patterns:
+            if _GLOB_CHARS.isdisjoint(p):
+                plain.add(p)
+            else:
+                rules.append(p)
+        matcher = cls(plain)
+        return matcher.extend("", rules) if rules else matcher
+
+    def extend(self, base: str, lines: Iterable[str]) -> IgnoreMatcher:
+        """Return a matcher with one more (deepest) rule set, relative to `base`."""
+        return IgnoreMatcher(self.names, self.rulesets + (_RuleSet(base, lines),))
+
+    def is_ignored(self, rel_dir: str, name: str, is_dir: bool) -> bool:
+        """
+        Whether entry `name` inside `rel_dir` ("/"-separated, relative to the root,
+        "" for the root itself) is ignored.
+        """
+        if name in self.names:
+            return True
+        if not self.rulesets:
+            return False
+        path = f"{rel_dir}/{name}" if rel_dir else name
+        for ruleset in reversed(self.rulesets):
+            decision = ruleset.match(path, is_dir)
+            if decision is not None:
+                return decision
+        return False
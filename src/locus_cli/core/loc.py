@@ -0,0 +1,284 @@
+"""
+Lines-of-code counting for `locus info --loc`.
+
+Every line of a source file is classified as blank, comment or code, tokei-style
+but without a tokenizer: a comment line is one whose first non-blank characters
+open a line comment, or one spanned by a block comment that starts a line.
+Comment markers inside string literals are not special-cased.
+
+Lines are never iterated in Python. A file is processed in windows of at most
+_WINDOW bytes — read straight into memory when small, sliced out of an mmap when
+large, read forward in _WINDOW-sized reads for streams such as archive
+members, so memory per worker stays bounded whatever the file size — and each
+window is classified with a handful of C-level passes: bytes.count() for line
+breaks, one re.sub() that drops block comments (the line breaks it removes are
+comment lines), and re.subn() with an empty replacement, whose match count is the
+number of line-comment or blank lines. The cost is proportional to the bytes read.
+
+Files are spread over a process pool in batches, because the counting itself is
+CPU-bound and threads would serialise on the GIL.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import re
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import IO, TYPE_CHECKING
+
+from .scanner import _EXTENSION_TO_LANGUAGE
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .gitrev import GitRevReader
+
+_WINDOW = 4 * 1024 * 1024
+_BINARY_SNIFF = 8192
+# A batch is one unit of work for a pool process: big enough to amortise the
+# inter-process round trip, small enough to keep every worker busy.
+_BATCH_BYTES = 16 * 1024 * 1024
+_BATCH_FILES = 512
+
+_BLANK = re.compile(rb"(?m)^[ \t\r\f\v]*\n")
+
+
+@dataclass
+class LineCounts:
+    """Line totals for one language (or one file)."""
+    lines: int = 0
+    blank: int = 0
+    comment: int = 0
+
+    @property
+    def code(self) -> int:
+        return self.lines - self.blank - self.comment
+
+    def add(self, other: LineCounts) -> None:
+        self.lines += other.lines
+        self.blank += other.blank
+        self.comment += other.comment
+
+
+class _Syntax:
+    """Compiled comment rules of one language family."""
+
+    def __init__(self, line: tuple[bytes, ...] = (), block: tuple[bytes, bytes] | None = None) -> None:
+        self.block = block
+        self.line_re = (
+            re.compile(rb"(?m)^[ \t]*(?:" + b"|".join(map(re.escape, line)) + rb")[^\n]*\n")
+            if line else None
+        )
+        # A block comment starting a line. Its trailing line break is consumed only
+        # when nothing but whitespace follows the closer, so a line like "*/ x = 1"
+        # survives the substitution and is counted as code.
+        self.block_re = (
+            re.compile(rb"(?ms)^[ \t]*" + re.escape(block[0]) + rb".*?" + re.escape(block[1]) + rb"(?:[ \t\r]*\n)?")
+            if block else None
+        )
+
+
+_PLAIN = _Syntax()
+_C_STYLE = _Syntax((b"//",), (b"/*", b"*/"))
+_HASH = _Syntax((b"#",))
+_MARKUP = _Syntax((), (b"<!--", b"-->"))
+
+_SYNTAX_BY_LANGUAGE: dict[str, _Syntax] = {
+    **dict.fromkeys(
+        ("JavaScript", "TypeScript", "C", "C++", "C#", "CUDA", "Java", "Kotlin", "Scala",
+         "Rust", "Go", "Zig", "Swift", "Dart", "Objective-C", "Protobuf", "GraphQL"),
+        _C_STYLE,
+    ),
+    **dict.fromkeys(
+        ("Python", "Ruby", "Perl", "Shell", "PowerShell", "R", "Julia", "Elixir", "Nim",
+         "YAML", "TOML", "Nix"),
+        _HASH,
+    ),
+    **dict.fromkeys(("HTML", "XML", "Vue", "Svelte", "Markdown"), _MARKUP),
+    "CSS": _Syntax((), (b"/*", b"*/")),
+    "Sass/SCSS": _C_STYLE,
+    "Less": _C_STYLE,
+    "PHP": _Syntax((b"//", b"#"), (b"/*", b"*/")),
+    "Terraform": _Syntax((b"#", b"//"), (b"/*", b"*/")),
+    "Lua": _Syntax((b"--",)),
+    "Haskell": _Syntax((b"--",), (b"{-", b"-}")),
+    "SQL": _Syntax((b"--",), (b"/*", b"*/")),
+    "OCaml": _Syntax((), (b"(*", b"*)")),
+    "F#": _Syntax((b"//",), (b"(*", b"*)")),
+    "Clojure": _Syntax((b";",)),
+    "Erlang": _Syntax((b"%",)),
+    "Assembly": _Syntax((b";", b"#")),
+}
+
+
+def _syntax_for(ext: str) -> _Syntax:
+    return _SYNTAX_BY_LANGUAGE.get(_EXTENSION_TO_LANGUAGE.get(ext, ""), _PLAIN)
+
+
+def _cut(buf: bytes | mmap.mmap, start: int, block: tuple[bytes, bytes] | None) -> int:
+    """
+    End of the window of buf starting at `start`: about _WINDOW bytes further,
+    on a line break and never through a block comment. len(buf) when buf ends
+    first, or before the line or comment does.
+    """
+    size = len(buf)
+    end = min(start + _WINDOW, size)
+    if end < size:
+        nl = buf.rfind(b"\n", start, end)
+        end = nl + 1 if nl >= start else buf.find(b"\n", end) + 1 or size
+        if block is not None and end < size:
+            opened = buf.rfind(block[0], start, end)
+            if opened > buf.rfind(block[1], start, end):
+                close = buf.find(block[1], end)
+                end = size if close == -1 else buf.find(b"\n", close) + 1 or size
+    return end
+
+
+def _windows(buf: bytes | mmap.mmap, block: tuple[bytes, bytes] | None) -> Iterator[bytes]:
+    """Slice buf into windows (see _cut())."""
+    start = 0
+    while start < len(buf):
+        end = _cut(buf, start, block)
+        yield buf[start:end]
+        start = end
+
+
+def _stream_windows(
+    pending: bytes, read: Callable[[int], bytes], block: tuple[bytes, bytes] | None,
+) -> Iterator[bytes]:
+    """
+    The windows _windows() cuts, from a stream read forward _WINDOW bytes at a
+    time after its first bytes `pending`. A cut is only made once the bytes it
+    depends on have been read, so the windows are the same as over the whole
+    content, and only the current window plus one read are held in memory.
+    """
+    eof = False
+    while True:
+        end = _cut(pending, 0, block)
+        if end == len(pending) and not eof:
+            chunk = read(_WINDOW)
+            eof = not chunk
+            pending += chunk
+            continue
+        if end == 0:
+            return
+        yield pending[:end]
+        pending = pending[end:]
+
+
+def count_buffer(buf: bytes | mmap.mmap, syntax: _Syntax = _PLAIN) -> LineCounts:
+    """Classify the lines of one file's content. Binary content counts as 0 lines."""
+    if buf.find(b"\0", 0, _BINARY_SNIFF) != -1:
+        return LineCounts()
+    return _count_windows(_windows(buf, syntax.block), syntax)
+
+
+def count_stream(f: IO[bytes], syntax: _Syntax = _PLAIN) -> LineCounts:
+    """count_buffer() for a file object read forward once, in bounded memory."""
+    head = f.read(_WINDOW)
+    if head.find(b"\0", 0, _BINARY_SNIFF) != -1:
+        return LineCounts()
+    return _count_windows(_stream_windows(head, f.read, syntax.block), syntax)
+
+
+def _count_windows(windows: Iterable[bytes], syntax: _Syntax) -> LineCounts:
+    counts = LineCounts()
+    for window in windows:
+        if not window.endswith(b"\n"):
+            window += b"\n"  # last line without a line break
+        lines = window.count(b"\n")
+        counts.lines += lines
+        if syntax.block_re is not None:
+            # Lines removed along with the block comments are comment lines.
+            window = syntax.block_re.sub(b"", window)
+            counts.comment += lines - window.count(b"\n")
+        if syntax.line_re is not None:
+            counts.comment += syntax.line_re.subn(b"", window)[1]
+        counts.blank += _BLANK.subn(b"", window)[1]
+    return counts
+
+
+def count_file(path: str, ext: str) -> LineCounts:
+    """Count the lines of the file at `path`; unreadable files count as empty."""
+    syntax = _syntax_for(ext)
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size == 0:
+                return LineCounts()
+            if size <= _WINDOW:
+                return count_buffer(f.read(), syntax)
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return count_buffer(mm, syntax)
+    except (OSError, ValueError):
+        return LineCounts()
+
+
+def _count_batch(batch: list[tuple[str, str]]) -> dict[str, LineCounts]:
+    """Pool task: count a batch of (ext, path) files, summed per extension."""
+    totals: dict[str, LineCounts] = {}
+    for ext, path in batch:
+        totals.setdefault(ext, LineCounts()).add(count_file(path, ext))
+    return totals
+
+
+def _batches(files: Iterable[tuple[str, str, int]]) -> Iterator[list[tuple[str, str]]]:
+    batch: list[tuple[str, str]] = []
+    batch_bytes = 0
+    for ext, path, size in files:
+        batch.append((ext, path))
+        batch_bytes += max(size, 0)
+        if batch_bytes >= _BATCH_BYTES or len(batch) >= _BATCH_FILES:
+            yield batch
+            batch, batch_bytes = [], 0
+    if batch:
+        yield batch
+
+
+def count_lines(files: list[tuple[str, str, int]], jobs: int = 1) -> dict[str, LineCounts]:
+    """
+    Count lines of (ext, path, size) files and return totals per extension.
+
+    jobs: worker processes. 1 counts in the calling process, 0 uses one per CPU.
+    """
+    totals: dict[str, LineCounts] = {}
+    if jobs == 1 or len(files) < 2:
+        for batch in _batches(files):
+            _merge(totals, _count_batch(batch))
+        return totals
+
+    with ProcessPoolExecutor(max_workers=jobs or None) as pool:
+        for partial in pool.map(_count_batch, _batches(files)):
+            _merge(totals, partial)
+    return totals
+
+
+def count_rev_lines(reader: GitRevReader, files: list[tuple[str, str, int]]) -> dict[str, LineCounts]:
+    """Same as count_lines() for the blobs of a revision; paths are relative to the root."""
+    totals: dict[str, LineCounts] = {}
+    for ext, rel, _ in files:
+        data = reader.read_bytes(rel)
+        if data is not None:
+            totals.setdefault(ext, LineCounts()).add(count_buffer(data, _syntax_for(ext)))
+    return totals
+
+
+def count_archive_lines(archive: Path, files: list[tuple[str, str, int]]) -> dict[str, LineCounts]:
+    """
+    Same as count_lines() for the members of an archive, in one pass over it,
+    each member streamed in windows; paths are "/"-separated.
+    """
+    from .archive import read_members
+    extensions = {rel: ext for ext, rel, _ in files}
+    totals: dict[str, LineCounts] = {}
+    for rel, f in read_members(archive, set(extensions)):
+        ext = extensions[rel]
+        totals.setdefault(ext, LineCounts()).add(count_stream(f, _syntax_for(ext)))
+    return totals
+
+
+def _merge(totals: dict[str, LineCounts], partial: dict[str, LineCounts]) -> None:
+    for ext, counts in partial.items():
+        totals.setdefault(ext, LineCounts()).add(counts)
@@ -2,16 +2,28 @@
 # object which the UI can then render
 
 # Global imports
-from collections.abc import Callable
+from __future__ import annotations
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
+from typing import TYPE_CHECKING
 import os
 from rich.tree import Tree
 from rich.filesize import decimal
 from rich.markup import escape
 
 # Local imports
+from .ignore import DEFAULT_IGNORE, IgnoreMatcher
+from .scanner import _apply_ignore, _build_matcher, _make_lister, _same_device
 from ..ui.console import console, supports_unicode, supports_nerd_fonts
 
+if TYPE_CHECKING:
+    from .cache import ScanIndex
+    from .filters import FileFilter
+    from .progress import ProgressBus
+    from .scanner import DirStat, Snapshot
+
 # Maps file extension → Nerd Font DEV icon.
 # Fallback for unrecognised extensions is "\ue5ff" (folder/file generic), or ">" on non-nerdfont terminals.
 _NERD_ICONS: dict[str, str] = {
@@ -59,128 +71,584 @@ _NERD_ICONS: dict[str, str] = {
     # Documents
     ".pdf": "\uf1c1",
 }
+_FILE_ICON = "\uf15b"    # default file icon
+_FOLDER_ICON = "\uf07b"
 
 class LocusMap:
-    # Default list of folders to ignore. (This is a class variable, like a static variable in C)
-    IGNORE_FOLDERS = {
-        "__pycache__", 
-        "node_modules", 
-        "venv", 
-        "myEnv",
-        ".git", 
-        ".idea", 
-        ".vscode",
-        "dist",
-        "build",
-        "target", # Rust/Java
-        "bin",    # C#
-        "obj",    # C#
-        "vendor"  # PHP/Go
-    }
+    # Default list of folders to ignore, shared with `locus info` (scanner). A frozenset,
+    # so instances can never mutate it.
+    IGNORE_FOLDERS = DEFAULT_IGNORE
+    SORT_KEYS = ("name", "size")
     
-    def __init__(self, root_dir, max_depth, max_files=10, ignore=None) -> None:
+    def __init__(
+        self,
+        root_dir,
+        max_depth,
+        max_files=10,
+        ignore=None,
+        index: ScanIndex | None = None,
+        source: str = "fs",
+        rev: str | None = None,
+        snapshot: Snapshot | None = None,
+        sort: str = "name",
+        rollups: dict[str, DirStat] | None = None,
+        max_nodes: int | None = None,
+        jobs: int = 1,
+        filter: FileFilter | None = None,
+        sizes: bool = True,
+        one_file_system: bool = False,
+    ) -> None:
         """
         root_dir: Root directory of the desired codebase to be inspected
         max_depth: commands will go inside subfolder max_depth times
         max_files: max files to show in the UI for every folder
         ignore: Files or folders to be excluded from the search
+        index: optional persistent ScanIndex shared with `locus info`; unchanged
+               directories are then served from it instead of being re-listed
+        source: "fs", "git-index" or "auto" (see scanner.SOURCES)
+        rev: git revision to show instead of the working directory (index and
+             source are then unused)
+        root_dir may also be a tar or zip archive, shown from its member
+        headers without extracting it (see archive.py)
+        snapshot: render from a scanner.Snapshot taken earlier instead of listing
+                  directories again (index, source and rev are then unused)
+        sort: "name" (default) or "size": biggest branches and files first, with
+              each folder labelled by its rolled-up size
+        rollups: InfoResult.directories of the same tree, required by sort="size"
+        max_nodes: show at most this many folders and files in total, shared
+                   breadth-first and evenly between sibling folders; the rest of
+                   each truncated folder is summed up in one "... more" line
+        jobs: threads listing directories (and stat()-ing displayed files) ahead
+              of the walk, 0 = auto; the output does not depend on it
+        filter: show only the files it matches, and only the folders holding
+                some of them (at any depth); the tree is then computed in one
+                bottom-up pass before the first line is produced
+        sizes: False shows names only: no file is stat()-ed (but for a
+               filter's min_size), so listings on d_type filesystems cost one
+               getdents per folder and nothing per file
+        one_file_system: do not enter mount points (those met are collected in
+                         skipped_mounts); not with rev
         """
+        if jobs < 0:
+            raise ValueError(f"jobs must be >= 0, got {jobs}")
+        if max_nodes is not None and max_nodes < 1:
+            raise ValueError("max_nodes must be at least 1")
+        if sort not in self.SORT_KEYS:
+            raise ValueError(f"unknown sort {sort!r}, expected one of {', '.join(self.SORT_KEYS)}")
+        if sort == "size" and rollups is None:
+            raise ValueError("sort='size' needs the directory rollups of a scan")
         self.root_dir = root_dir
         self.max_depth = max_depth
         self.max_files = max_files
-        # Combine user excluded folders to default excluded folders
-        gitignore_patterns = self._read_gitignore(root_dir)
-        if ignore is not None:
-            self.effective_ignore = self.IGNORE_FOLDERS | set(ignore) | gitignore_patterns
-        else:
-            self.effective_ignore = self.IGNORE_FOLDERS | gitignore_patterns
-
-    @staticmethod
-    def _read_gitignore(root: Path | str) -> set[str]:
-        gitignore = Path(root) / ".gitignore"
-        if not gitignore.is_file():
-            return set()
-        patterns: set[str] = set()
-        for line in gitignore.read_text(errors="replace").splitlines():
-            line = line.strip().lstrip("/")
-            if line and not line.startswith("#") and not line.startswith("!"):
-                patterns.add(line.rstrip("/"))
-        return patterns
-
-    def generate(self, on_progress: Callable[[], None] | None = None) -> Tree:
+        self.max_nodes = max_nodes
+        self.jobs = jobs
+        self.filter = filter if filter else None
+        self.sizes = sizes
+        self._pruned: dict[str, FolderListing | None] | None = None
+        self.index = index
+        self.rev = rev if snapshot is None else None
+        from .archive import is_archive
+        self.archive = snapshot is None and is_archive(Path(root_dir))
+        if self.archive and rev is not None:
+            raise ValueError("--rev reads a git repository, not an archive")
+        self.sort = sort
+        self.rollups = rollups
+        # Unless the git index provides sizes, only the files actually displayed get stat()-ed (in
+        # _prepare); the scan index keeps these size-less listings apart from sized ones.
+        self._list = (
+            snapshot.list_dir if snapshot is not None
+            else _make_lister(str(root_dir), source, index, sizes=False)
+        )
+        self.skipped_mounts: list[str] = []  # absolute paths
+        if one_file_system:
+            if rev is not None:
+                raise ValueError("one-file-system needs the working tree, not a revision")
+            if self.archive:
+                raise ValueError("one-file-system needs a directory, not an archive")
+            if snapshot is None:
+                try:
+                    device = os.stat(root_dir).st_dev
+                except OSError:
+                    raise ValueError(f"{root_dir} is not a valid directory") from None
+                self._list = _same_device(self._list, device, self.skipped_mounts)
+        # Combine user excluded folders to default excluded folders. Glob-style
+        # --ignore values and .gitignore files are handled by the shared matcher.
+        self.effective_ignore = self.IGNORE_FOLDERS | set(ignore or [])
+        self.matcher = _build_matcher(ignore, self.IGNORE_FOLDERS)
+
+    def generate(self, progress: ProgressBus | None = None) -> Tree:
         """
         Starting from the root folder, it creates the tree and then returns it.
 
-        on_progress: optional callback invoked after each directory is processed.
+        progress: optional ProgressBus counting the directories listed and the
+                  files they hold (see iter_nodes).
         """
-        root_name = Path(self.root_dir).resolve().name
-        tree = Tree(f"[bold blue]{root_name}[/]")
-        self._walk(self.root_dir, tree, current_depth=0, on_progress=on_progress)
+        icons = supports_nerd_fonts()
+        tree = Tree(f"[bold blue]{escape(self.root_name)}[/]")
+        # parents[d] is the Rich node that receives the nodes of depth d.
+        parents = [tree]
+        for node in self.iter_nodes(progress):
+            del parents[node.depth + 1:]
+            branch = parents[node.depth].add(markup_label(node, icons))
+            if node.kind == "dir":
+                parents.append(branch)
         return tree
 
-    # The walk is based on a DFS Search (Depth first search)
-    def _walk(self, directory, tree_node, current_depth, on_progress: Callable[[], None] | None = None) -> None:
+    def stream(
+        self,
+        write: Callable[[str], object],
+        markup: bool = True,
+        progress: ProgressBus | None = None,
+    ) -> None:
+        """
+        Write the tree line by line while walking, without building it in memory.
+
+        Each line is passed to write() as soon as its directory has been listed,
+        guides ("├── ", "│   "...) included. Memory stays bounded by the depth of
+        the walk whatever the size of the tree.
+
+        markup: Rich markup labels (for console.print) when True, plain text otherwise
         """
-        It looks at 'directory' and adds items to 'tree_node'.
-        It calls itself if it finds a subfolder.
+        branch, last, pipe, blank = _GUIDES if supports_unicode() else _ASCII_GUIDES
+        if markup:
+            icons = supports_nerd_fonts()
+            label = lambda node: markup_label(node, icons)  # noqa: E731
+        else:
+            label = plain_label
+        # Before the root line: a bad --rev raises here, with nothing written yet.
+        nodes = self.iter_nodes(progress)
+        write(f"[bold blue]{escape(self.root_name)}[/]" if markup else self.root_name)
+        # One guide segment per open ancestor directory.
+        open_guides: list[str] = []
+        for node in nodes:
+            del open_guides[node.depth:]
+            write("".join(open_guides) + (last if node.last else branch) + label(node))
+            if node.kind == "dir":
+                open_guides.append(blank if node.last else pipe)
+
+    @property
+    def root_name(self) -> str:
+        return Path(self.root_dir).resolve().name
+
+    def iter_nodes(self, progress: ProgressBus | None = None) -> Iterator[TreeNode]:
         """
+        Yield the lines of the tree in display order (DFS), one TreeNode each.
+
+        Directories are listed lazily as the iteration reaches them, except with
+        a filter or max_nodes, where the shown part of the tree is worked out
+        first; the scan index, if any, is saved once the iteration completes.
+        A revision or an archive is read right away, so a bad rev or a corrupt
+        archive raises ValueError here rather than at the first next().
+
+        progress: optional ProgressBus; dirs and files count what has been listed,
+                  with a tick() after each directory and a flush() at the end.
+        """
+        if self.rev is not None:
+            from .gitrev import iter_rev_listings
+            # One ls-tree pass up to the displayed depth; the walk then reads from memory.
+            listings = {
+                listing.path: listing
+                for listing in iter_rev_listings(
+                    # The filter pass looks below the displayed depth for matches.
+                    Path(self.root_dir), self.rev, self.matcher, None if self.filter else self.max_depth,
+                )
+            }
+            self._list = listings.get
+        elif self.archive:
+            from .archive import iter_archive_listings, merge_listings
+            # Same for an archive: one pass over its member headers.
+            self._list = merge_listings(iter_archive_listings(
+                Path(self.root_dir), self.matcher, None if self.filter else self.max_depth,
+            )).get
+        return self._iter_nodes(progress)
+
+    def _iter_nodes(self, progress: ProgressBus | None) -> Iterator[TreeNode]:
+        pool = (
+            ThreadPoolExecutor(max_workers=self.jobs or None, thread_name_prefix="locus-tree")
+            if self.jobs != 1 else None
+        )
+        root = str(self.root_dir)
         try:
-            # os.scandir() returns DirEntry objects whose is_dir() / is_file() /
-            # is_symlink() use the cached d_type from readdir() — no extra syscall.
-            entries = sorted(
-                os.scandir(directory),
-                key=lambda e: (not e.is_dir(follow_symlinks=False), e.name.lower())
+            if self.filter:
+                self._pruned = {}
+                self._prune(root, "", self.matcher, 0, self._pruned)
+            if self.max_nodes is not None:
+                plan = self._plan(pool)
+                fetch: _Fetch = lambda directory, rel, matcher, depth: plan.pop(directory)  # noqa: E731
+            elif pool is not None:
+                fetch = _Prefetcher(self, pool)
+                fetch.submit(root, "", self.matcher, 0)
+            else:
+                fetch = lambda directory, rel, matcher, depth: self._prepare(directory, rel, matcher)  # noqa: E731
+            yield from self._walk(root, "", self.matcher, 0, progress, fetch)
+            if progress is not None:
+                progress.flush()
+        finally:
+            self._pruned = None
+            if pool is not None:
+                # Also reached when the consumer stops early: drop queued work.
+                pool.shutdown(wait=True, cancel_futures=True)
+        if self.index is not None:
+            self.index.save()
+
+    def _children(self, directory: str, rel: str, matcher: IgnoreMatcher) -> FolderListing | None:
+        """The children of a displayed directory: listed now, or by the filter pass."""
+        if self._pruned is not None:
+            return self._pruned.pop(directory, None)
+        return self._list_children(directory, rel, matcher)
+
+    def _list_children(self, directory: str, rel: str, matcher: IgnoreMatcher) -> FolderListing | None:
+        """List one directory and put what survives the ignore rules and filter in display order."""
+        raw = self._list(directory)
+        if raw is None:
+            return None
+        listing, matcher = _apply_ignore(raw, rel, matcher)
+
+        directories = sorted((d for d in listing.dirs if not d.startswith(".")), key=str.lower)
+        files = listing.files
+        if self.filter:
+            files = self._filter_files(listing.path, rel, files)
+        files = sorted(files, key=lambda f: f[0].lower())
+        rolled: dict[str, DirStat | None] = {}
+        if self.rollups is not None and self.sort == "size":
+            # Rollup keys use OS separators, like FileEntry paths.
+            prefix = rel.replace("/", os.sep) + os.sep if rel else ""
+            rolled = {name: self.rollups.get(prefix + name) for name in directories}
+            directories.sort(key=lambda d: rolled[d].total_bytes if rolled[d] else 0, reverse=True)
+            files.sort(key=lambda f: f[1], reverse=True)
+        return FolderListing(listing.path, matcher, directories, files, rolled)
+
+    def _filter_files(
+        self, path: str, rel: str, files: list[tuple[str, int, float]],
+    ) -> list[tuple[str, int, float]]:
+        """Files of one directory that pass the filter; stat()s only for --min-size."""
+        assert self.filter is not None
+        files = [f for f in files if self.filter.match_name(rel, f[0])]
+        if self.filter.min_size:
+            files = [f for f in _with_sizes(path, files) if f[1] >= self.filter.min_size]
+        return files
+
+    def _prune(
+        self, directory: str, rel: str, matcher: IgnoreMatcher, depth: int, pruned: dict[str, FolderListing | None],
+    ) -> bool:
+        """
+        Filter pass, bottom-up: list `directory` and keep the matching files and
+        the sub-directories with a match somewhere below them, recording the
+        result in `pruned` for the walk. Below the displayed depth a sub-directory
+        is only searched until its first match. Returns whether anything was kept.
+        """
+        children = self._list_children(directory, rel, matcher)
+        pruned[directory] = children
+        if children is None:
+            return False
+        kept = []
+        for name in children.dirs:
+            path, child_rel = os.path.join(children.path, name), f"{rel}/{name}" if rel else name
+            if depth < self.max_depth - 1:
+                if self._prune(path, child_rel, children.matcher, depth + 1, pruned):
+                    kept.append(name)
+                else:
+                    del pruned[path]
+            elif self._has_match(path, child_rel, children.matcher):
+                kept.append(name)
+        children.dirs = kept
+        return bool(kept or children.files)
+
+    def _has_match(self, directory: str, rel: str, matcher: IgnoreMatcher) -> bool:
+        """Whether any file under `directory` passes the filter (stops at the first one)."""
+        stack = [(directory, rel, matcher)]
+        while stack:
+            path, rel, matcher = stack.pop()
+            raw = self._list(path)
+            if raw is None:
+                continue
+            listing, matcher = _apply_ignore(raw, rel, matcher)
+            if self._filter_files(listing.path, rel, listing.files):
+                return True
+            stack.extend(
+                (os.path.join(listing.path, d), f"{rel}/{d}" if rel else d, matcher)
+                for d in listing.dirs if not d.startswith(".")
             )
-        except PermissionError:
-            tree_node.add("[red]Access Denied[/]")
+        return False
+
+    def list_folder(self, directory: str, rel: str = "", matcher: IgnoreMatcher | None = None) -> FolderListing | None:
+        """
+        One folder as the tree shows it, on its own: ignore rules, filter, order
+        and max_files applied, every displayed file sized. None when permission
+        is denied. For a lazy viewer, which lists folders one at a time.
+
+        rel:     the folder relative to the root, "/"-separated ("" = the root)
+        matcher: the rules in force in the folder: self.matcher for the root,
+                 then the `matcher` of the parent's FolderListing
+        """
+        return self._prepare(directory, rel, self.matcher if matcher is None else matcher)
+
+    def _prepare(
+        self, directory: str, rel: str, matcher: IgnoreMatcher, keep: int | None = None,
+    ) -> FolderListing | None:
+        """
+        _children() trimmed to what is displayed (by default every folder and
+        max_files files), with the size of every displayed file known.
+        """
+        children = self._children(directory, rel, matcher)
+        if children is not None:
+            children.keep(len(children.dirs) + self.max_files if keep is None else keep, self.max_files)
+            if self.sizes:
+                children.stat_files()
+        return children
+
+    def _plan(self, pool: ThreadPoolExecutor | None = None) -> dict[str, FolderListing | None]:
+        """
+        Share max_nodes out breadth-first, one level of the tree at a time.
+
+        Every directory of a level asks for its sub-directories plus up to
+        max_files files; when the level asks for more than what is left, each
+        directory gets the same share (those wanting less give the rest back to
+        the others). Only the directories that got a share at the previous level
+        are listed, so the walk costs at most max_nodes + 1 listings. With a
+        pool, the directories of a level are listed in parallel.
+
+        Returns the trimmed children of every displayed directory, keyed by path.
+        """
+        each = pool.map if pool is not None else map
+        plan: dict[str, FolderListing | None] = {}
+        remaining = self.max_nodes
+        level = [(str(self.root_dir), "", self.matcher)]
+        depth = 0
+        while level and remaining > 0:
+            listed = list(each(lambda item: self._children(*item), level))
+            shares = _fair_shares(
+                [0 if c is None else len(c.dirs) + min(len(c.files), self.max_files) for c in listed],
+                remaining,
+            )
+            remaining -= sum(shares)
+            next_level = []
+            for (directory, rel, _), children, share in zip(level, listed, shares):
+                plan[directory] = children
+                if children is None:
+                    continue
+                children.keep(share, self.max_files)
+                if depth < self.max_depth - 1:
+                    next_level.extend(
+                        (os.path.join(children.path, name), f"{rel}/{name}" if rel else name, children.matcher)
+                        for name in children.dirs
+                    )
+            if self.sizes:
+                list(each(FolderListing.stat_files, filter(None, listed)))
+            level = next_level
+            depth += 1
+        # Out of budget: folders still to be displayed are listed only to say how much they hide.
+        for (directory, _, _), children in zip(level, each(lambda item: self._prepare(*item, keep=0), level)):
+            plan[directory] = children
+        return plan
+
+    # The walk is based on a DFS Search (Depth first search)
+    def _walk(
+        self,
+        directory: str,
+        rel: str,
+        matcher: IgnoreMatcher,
+        current_depth,
+        progress: ProgressBus | None,
+        fetch: _Fetch,
+    ) -> Iterator[TreeNode]:
+        """
+        It looks at 'directory' and yields its children at depth current_depth.
+        It recurses into a subfolder right after yielding it.
+        rel/matcher: directory path relative to the root and the ignore rules in effect there.
+        fetch: gives the prepared children of a directory (see iter_nodes)
+        """
+        children = fetch(directory, rel, matcher, current_depth)
+        if children is None:
+            yield TreeNode(current_depth, True, "denied")
             return
+        if progress is not None:
+            progress.dirs += 1
+            progress.files += len(children.files) + children.hidden_files
 
-        directories: list[os.DirEntry[str]] = []
-        files: list[os.DirEntry[str]] = []
+        # Every child is known once the directory is listed, so each one can be
+        # told whether it is the last of its parent before anything below it.
+        hidden = children.hidden_dirs + children.hidden_files
+        n_children = len(children.dirs) + len(children.files) + (hidden > 0)
 
-        for entry in entries:
-            if entry.name.startswith("."):
-                continue
-            if entry.name in self.effective_ignore:
-                continue
-            if entry.is_dir(follow_symlinks=False):
-                directories.append(entry)
-            elif entry.is_file(follow_symlinks=False):
-                files.append(entry)
-
-        for entry in directories:
-            folder_icon = "\uf07b " if supports_nerd_fonts() else ""
-            branch = tree_node.add(f"{folder_icon}[bold green]{escape(entry.name)}[/]")
+        for i, name in enumerate(children.dirs, 1):
+            stat = children.rolled.get(name)
+            yield TreeNode(
+                current_depth, i == n_children, "dir", name,
+                stat.total_bytes if stat is not None else None,
+            )
             if current_depth < self.max_depth - 1:
-                self._walk(entry.path, branch, current_depth + 1, on_progress)
+                yield from self._walk(
+                    os.path.join(children.path, name), f"{rel}/{name}" if rel else name,
+                    children.matcher, current_depth + 1, progress, fetch,
+                )
+
+        for i, (name, size, _) in enumerate(children.files, len(children.dirs) + 1):
+            yield TreeNode(current_depth, i == n_children, "file", name, size if self.sizes else None)
+
+        if hidden:
+            yield TreeNode(current_depth, True, "more", size=children.hidden_files, dirs=children.hidden_dirs)
+
+        if progress is not None:
+            progress.tick()
+
+
+# fetch(directory, rel, matcher, depth) -> children of directory, ready to display
+_Fetch = Callable[[str, str, IgnoreMatcher, int], "FolderListing | None"]
+
+
+class _Prefetcher:
+    """
+    Prepares directories on a thread pool ahead of the DFS cursor.
+
+    Each task queues the sub-directories it finds as soon as its own directory
+    is ready, so workers keep listing (and stat()-ing displayed files) while the
+    walk renders; scandir() and stat() release the GIL. The walk pops results in
+    its own order, so the output is the same as with a serial walk.
+    """
+
+    def __init__(self, tree: LocusMap, pool: ThreadPoolExecutor) -> None:
+        self.tree = tree
+        self.pool = pool
+        self.pending: dict[str, Future[FolderListing | None]] = {}
+
+    def submit(self, directory: str, rel: str, matcher: IgnoreMatcher, depth: int) -> None:
+        self.pending[directory] = self.pool.submit(self._task, directory, rel, matcher, depth)
+
+    def _task(self, directory: str, rel: str, matcher: IgnoreMatcher, depth: int) -> FolderListing | None:
+        children = self.tree._prepare(directory, rel, matcher)
+        if children is not None and depth < self.tree.max_depth - 1:
+            # Registered before this future resolves, so the walk always finds them.
+            for name in children.dirs:
+                self.submit(
+                    os.path.join(children.path, name), f"{rel}/{name}" if rel else name,
+                    children.matcher, depth + 1,
+                )
+        return children
+
+    def __call__(self, directory: str, rel: str, matcher: IgnoreMatcher, depth: int) -> FolderListing | None:
+        return self.pending.pop(directory).result()
+
 
-        files_shown = 0
-        for entry in files:
-            if files_shown >= self.max_files:
-                break
+@dataclass(slots=True)
+class FolderListing:
+    """The displayable content of one directory, trimmed by keep()."""
+    path: str
+    matcher: IgnoreMatcher                  # rules for the entries of the sub-folders
+    dirs: list[str]                         # names, in display order
+    files: list[tuple[str, int, float]]     # (name, size, mtime), in display order
+    rolled: dict[str, DirStat | None]       # rolled-up stats of dirs, when sorting by size
+    hidden_dirs: int = 0                    # cut by keep()
+    hidden_files: int = 0
+
+    def keep(self, n: int, max_files: int) -> None:
+        """Keep the first n entries, sub-directories first and at most max_files files."""
+        shown_dirs = min(n, len(self.dirs))
+        shown_files = min(n - shown_dirs, max_files, len(self.files))
+        self.hidden_dirs += len(self.dirs) - shown_dirs
+        self.hidden_files += len(self.files) - shown_files
+        del self.dirs[shown_dirs:]
+        del self.files[shown_files:]
+
+    def stat_files(self) -> None:
+        """stat() the kept files whose size the lister did not provide."""
+        self.files = _with_sizes(self.path, self.files)
+
+
+def _with_sizes(path: str, files: list[tuple[str, int, float]]) -> list[tuple[str, int, float]]:
+    """files of directory `path`, stat()-ing those listed without a size (-1 if that fails)."""
+    if all(size >= 0 for _, size, _ in files):
+        return files
+    sized = []
+    for name, size, mtime in files:
+        if size < 0:
             try:
-                file_size = decimal(entry.stat().st_size)
+                size = os.stat(os.path.join(path, name)).st_size
             except OSError:
-                file_size = "?"
-            if supports_nerd_fonts():
-                ext = Path(entry.name).suffix.lower()
-                icon = _NERD_ICONS.get(ext, "\uf15b") # default file icon
-            else:
-                icon = "" 
-            
-            # If icon is empty, we just don't add the space before it
-            prefix = f"{icon} " if icon else ""
-            tree_node.add(f"{prefix}{escape(entry.name)} ([dim]{file_size}[/])")
-            files_shown += 1
-
-        remaining_files = len(files) - files_shown
-        if remaining_files > 0:
-            tree_node.add(
-                f"[dim italic]... {remaining_files} more file{'s' if remaining_files > 1 else ''}[/]"
-            )
+                size = -1
+        sized.append((name, size, mtime))
+    return sized
+
+
+def _fair_shares(wants: list[int], budget: int) -> list[int]:
+    """
+    Split budget between wants, max-min fair: the largest common cap that fits,
+    then one more each for the first entries still wanting more.
+    """
+    if sum(wants) <= budget:
+        return list(wants)
+    low, high = 0, max(wants)
+    while low < high:
+        cap = (low + high + 1) // 2
+        if sum(min(w, cap) for w in wants) <= budget:
+            low = cap
+        else:
+            high = cap - 1
+    shares = [min(w, low) for w in wants]
+    left = budget - sum(shares)
+    for i, want in enumerate(wants):
+        if not left:
+            break
+        if want > low:
+            shares[i] += 1
+            left -= 1
+    return shares
+
+
+@dataclass(slots=True)
+class TreeNode:
+    """One line of the tree below the root, as yielded by LocusMap.iter_nodes()."""
+    depth: int              # 0 for the children of the root
+    last: bool              # last child of its parent ("└── " rather than "├── ")
+    kind: str               # "dir", "file", "more" (files cut by max_files) or "denied"
+    name: str = ""
+    size: int | None = None  # bytes (-1 unknown, None not shown); rolled-up for dirs, when sorted
+                             # by size; number of hidden files for "more"
+    dirs: int = 0            # number of hidden folders, for "more"
+
+
+_GUIDES = ("├── ", "└── ", "│   ", "    ")
+_ASCII_GUIDES = ("|-- ", "`-- ", "|   ", "    ")
+
+
+def markup_label(node: TreeNode, icons: bool) -> str:
+    """Rich markup for one node, as shown by `locus tree` on a terminal."""
+    if node.kind == "file":
+        # If icons are off, we just don't add the space before the name
+        prefix = f"{_NERD_ICONS.get(Path(node.name).suffix.lower(), _FILE_ICON)} " if icons else ""
+        if node.size is None:
+            return f"{prefix}{escape(node.name)}"
+        file_size = decimal(node.size) if node.size >= 0 else "?"
+        return f"{prefix}{escape(node.name)} ([dim]{file_size}[/])"
+    if node.kind == "dir":
+        folder_icon = f"{_FOLDER_ICON} " if icons else ""
+        size_label = f" ([dim]{decimal(node.size)}[/])" if node.size is not None else ""
+        return f"{folder_icon}[bold green]{escape(node.name)}[/]{size_label}"
+    if node.kind == "more":
+        return f"[dim italic]{_more_text(node)}[/]"
+    return "[red]Access Denied[/]"
+
+
+def plain_label(node: TreeNode) -> str:
+    """Plain-text label for one node; directories end with a "/"."""
+    if node.kind == "file":
+        if node.size is None:
+            return node.name
+        return f"{node.name} ({decimal(node.size) if node.size >= 0 else '?'})"
+    if node.kind == "dir":
+        return f"{node.name}/ ({decimal(node.size)})" if node.size is not None else f"{node.name}/"
+    if node.kind == "more":
+        return _more_text(node)
+    return "Access Denied"
+
 
-        if on_progress:
-            on_progress()
+def _more_text(node: TreeNode) -> str:
+    """ "... 3 more files", "... 2 more folders and 1 more file" """
+    parts = [
+        f"{count} more {noun}{'s' if count > 1 else ''}"
+        for count, noun in ((node.dirs, "folder"), (node.size, "file")) if count
+    ]
+    return "... " + " and ".join(parts)
 
 # [REMOVE LATER] Just use this as temporary quick tests
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+"""
+Progress of long operations (scans, tree walks, model downloads), from the code
+doing the work to whatever displays it.
+
+The producer owns a ProgressBus and keeps its counters up to date with plain
+attribute stores, then calls tick() at natural boundaries (after a directory,
+after a download chunk). tick() only reads the clock: subscribers hear about
+the counters at most `rate` times per second, everything in between being
+coalesced into the next event, so a tree of a million tiny directories costs
+the display a few dozen redraws instead of a million. flush() sends the final
+state once the work is done.
+
+    bus = ProgressBus(rate=10)
+    bus.subscribe(lambda event: live.update(render_progress(root, event)))
+    scan(root, progress=bus)
+"""
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ProgressEvent:
+    """The counters of a ProgressBus at one point in time."""
+    files: int = 0
+    dirs: int = 0
+    bytes: int = 0
+    total: int | None = None  # bytes expected, when known (downloads)
+
+
+class ProgressBus:
+    """
+    Rate-limited progress counters. Producers set files/dirs/bytes/total and
+    call tick(); subscribers receive a ProgressEvent at most `rate` times per
+    second, the first tick included, and once more on flush() if anything
+    changed since.
+    """
+
+    __slots__ = ("files", "dirs", "bytes", "total", "_subscribers", "_interval", "_due", "_clock", "_sent")
+
+    def __init__(self, rate: float = 10.0, clock: Callable[[], float] = time.monotonic) -> None:
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0, got {rate}")
+        self.files = 0
+        self.dirs = 0
+        self.bytes = 0
+        self.total: int | None = None
+        self._subscribers: list[Callable[[ProgressEvent], object]] = []
+        self._interval = 1.0 / rate
+        self._due = -float("inf")
+        self._clock = clock
+        self._sent: ProgressEvent | None = None
+
+    def subscribe(self, subscriber: Callable[[ProgressEvent], object]) -> ProgressBus:
+        self._subscribers.append(subscriber)
+        return self
+
+    def tick(self) -> None:
+        """Publish the counters if the last event is older than 1/rate seconds."""
+        now = self._clock()
+        if now >= self._due:
+            self._due = now + self._interval
+            self._publish()
+
+    def flush(self) -> None:
+        """Publish the counters now, unless subscribers already have them."""
+        if self._sent != self._event():
+            self._due = self._clock() + self._interval
+            self._publish()
+
+    def _event(self) -> ProgressEvent:
+        return ProgressEvent(self.files, self.dirs, self.bytes, self.total)
+
+    def _publish(self) -> None:
+        event = self._sent = self._event()
+        for subscriber in self._subscribers:
+            subscriber(event)
@@ -1,8 +1,9 @@
 import platform
 import urllib.request
-from collections.abc import Callable
 from pathlib import Path
 
+from .progress import ProgressBus
+
 class Provisioner:
     """
     Maps Hardware profiles to specific AI models and inference binaries,
@@ -95,15 +96,15 @@ class Provisioner:
     def download_model(
         self,
         tier: int,
-        on_progress: Callable[[int, int], None] | None = None,
+        progress: ProgressBus | None = None,
     ) -> Path:
         """
         Download the GGUF model for the given tier to ~/.locus/models/.
-        Streams in 1 MB chunks so progress updates fire frequently.
+        Streams in 1 MB chunks, with a progress tick after each one.
         Downloads to a .tmp file first and renames on success (atomic).
 
-        on_progress: called with (bytes_downloaded, total_bytes).
-                     total_bytes is -1 when the server does not send Content-Length.
+        progress: optional ProgressBus; bytes counts what has been downloaded,
+                  total is None when the server does not send Content-Length.
         """
         dest = self.get_model_path(tier)
         if dest.exists():
@@ -118,16 +119,19 @@ class Provisioner:
         try:
             with urllib.request.urlopen(req) as response:
                 total = int(response.headers.get("Content-Length", -1))
-                downloaded = 0
+                if progress is not None:
+                    progress.total = total if total > 0 else None
                 with open(tmp, "wb") as f:
                     while True:
                         chunk = response.read(self._CHUNK)
                         if not chunk:
                             break
                         f.write(chunk)
-                        downloaded += len(chunk)
-                        if on_progress:
-                            on_progress(downloaded, total)
+                        if progress is not None:
+                            progress.bytes += len(chunk)
+                            progress.tick()
+            if progress is not None:
+                progress.flush()
             tmp.rename(dest)
         except Exception:
             tmp.unlink(missing_ok=True)
@@ -1,10 +1,23 @@
 from __future__ import annotations # allows forward references in type hints
-from collections.abc import Callable
-from dataclasses import dataclass, field
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import partial
 from pathlib import Path
+from typing import TYPE_CHECKING
 import heapq
+import math
 import os
 
+from .ignore import DEFAULT_IGNORE, IgnoreMatcher, read_gitignore
+
+if TYPE_CHECKING:
+    from .cache import ScanIndex
+    from .duplicates import DuplicateReport
+    from .estimate import Estimate
+    from .filetable import FileTable
+    from .progress import ProgressBus
+
 @dataclass
 class LanguageStat:
     """
@@ -13,6 +26,11 @@ class LanguageStat:
     extension: str  # e.g. ".py, .c"
     file_count: int = 0
     total_bytes: int = 0
+    # Line counts, only filled in by scan(..., loc=True)
+    lines: int = 0
+    blank_lines: int = 0
+    comment_lines: int = 0
+    code_lines: int = 0
 
 @dataclass
 class ProjectHeuristics:
@@ -26,6 +44,60 @@ class ProjectHeuristics:
     test_dirs: list[str] = field(default_factory=list)
     config_files: list[str] = field(default_factory=list)
 
+@dataclass
+class SubProject:
+    """
+    A project nested below the scan root (a monorepo package, a vendored app):
+    a directory holding one of the project markers, with the same heuristics
+    the root gets. Its rolled-up totals and languages are in
+    InfoResult.directories[path].
+    """
+    path: str   # relative to the scan root, OS separators
+    heuristics: ProjectHeuristics = field(default_factory=ProjectHeuristics)
+
+@dataclass(slots=True)
+class FileEntry:
+    """
+    One file (or, on request, directory) streamed by iter_entries(). Kept small:
+    very large trees produce millions of these.
+    """
+    path: str             # relative to the scan root, OS separators
+    name: str             # last path component
+    ext: str              # lower-case extension (".py"), "" if none
+    size: int             # bytes, 0 for directories and when sizes were not asked for
+    depth: int            # directories between the root and the entry (0 = directly in root)
+    mtime: float          # modification time in epoch seconds, -1 if unknown
+    is_dir: bool = False
+    parent: str = ""      # relative path of the containing directory ("" = root)
+
+@dataclass
+class DirStat:
+    """
+    Recursive (du-style) totals of one directory: everything below it counts,
+    ignored entries excluded.
+    """
+    path: str                  # relative to the scan root, "" for the root itself
+    total_bytes: int = 0
+    file_count: int = 0
+    languages: dict[str, int] = field(default_factory=dict)  # extension -> file count
+
+    def add(self, other: DirStat) -> None:
+        self.total_bytes += other.total_bytes
+        self.file_count += other.file_count
+        for ext, count in other.languages.items():
+            self.languages[ext] = self.languages.get(ext, 0) + count
+
+@dataclass
+class DiskUsage:
+    """
+    What the files take on disk, du-style (scan(..., disk_usage=True)). A file
+    with several hard links is counted at its first path only: the others add
+    nothing to total_bytes, to directory rollups or to allocated_bytes.
+    """
+    allocated_bytes: int = 0   # st_blocks * 512: less than total_bytes for sparse files
+    hard_links: int = 0        # paths not counted again, their inode being counted already
+    hard_link_bytes: int = 0   # apparent bytes they would have added
+
 @dataclass
 class InfoResult:
     """
@@ -42,6 +114,41 @@ class InfoResult:
     heuristics: ProjectHeuristics = field(default_factory=ProjectHeuristics)
     # Top 5 files by size: list of (relative_path_str, bytes), sorted descending
     largest_files: list[tuple[str, int]] = field(default_factory=list)
+    # True when languages carry line counts (and are ranked by code lines)
+    lines_counted: bool = False
+    # Rolled-up totals of every scanned directory, keyed by path relative to the root
+    directories: dict[str, DirStat] = field(default_factory=dict)
+    # False for names-only scans (no stat()): byte totals stay 0, largest_files empty
+    sized: bool = True
+    # Allocated bytes and hard links, with scan(..., disk_usage=True)
+    disk: DiskUsage | None = None
+    # Mount points not crossed, relative to the root, with scan(..., one_file_system=True)
+    skipped_mounts: list[str] = field(default_factory=list)
+    # Projects found below the root, in path order (a monorepo's packages)
+    subprojects: list[SubProject] = field(default_factory=list)
+    # Set when totals and languages are extrapolated (`info --budget`, see estimate.py)
+    estimate: Estimate | None = field(default=None, compare=False)
+    # Files with identical contents (`info --duplicates`, see duplicates.py)
+    duplicates: DuplicateReport | None = field(default=None, compare=False)
+    # Every scanned file, in columnar form — only with scan(..., keep_files=True)
+    files: FileTable | None = field(default=None, repr=False, compare=False)
+
+
+@dataclass
+class _DirListing:
+    """
+    Raw contents of a single directory, as returned by one os.scandir() call.
+    Symlinks are dropped, hidden files are dropped before paying for their stat().
+    Hidden sub-directories are kept so root-level config dirs (.github) can be seen.
+    """
+    path: str                                                   # absolute directory path
+    dirs: list[str] = field(default_factory=list)               # sub-directory names
+    # (name, size in bytes, mtime in epoch seconds); both -1 if not stat'ed
+    files: list[tuple[str, int, float]] = field(default_factory=list)
+    has_gitignore: bool = False                                 # a .gitignore file sits in this dir
+    # With disk accounting, one (st_dev, st_ino, allocated bytes) per file, in the
+    # order of `files`; dev and ino are 0 for files with a single link.
+    disk: list[tuple[int, int, int]] | None = None
 
 
 # -------------------------------------------------------------------
@@ -54,7 +161,8 @@ class InfoResult:
 # The real bottleneck is always os.walk() (disk I/O).
 # -------------------------------------------------------------------
 
-# Maps a well-known root-level filename → human-readable project type.
+# Maps a well-known filename → human-readable project type: at the root it names
+# the project, below it a nested one (InfoResult.subprojects).
 _PROJECT_TYPE_MARKERS: dict[str, str] = {
     # Python
     "pyproject.toml":       "Python Package",
@@ -91,7 +199,7 @@ _PROJECT_TYPE_MARKERS: dict[str, str] = {
 }
 
 # Common entry-point filenames to detect the "start" of the program.
-# These are O(1) checked against each top-level file name.
+# These are O(1) checked against each file name (see _HEURISTIC_NAMES).
 _ENTRY_POINT_NAMES: set[str] = {
     # Python
     "main.py", "app.py", "__main__.py", "run.py",
@@ -155,6 +263,12 @@ _CONFIG_FILE_NAMES: set[str] = {
     ".readthedocs.yml", ".readthedocs.yaml",
 }
 
+# Every name one of the tables above knows: the scan looks each file and directory
+# up here once, and only the few hits go through the tables themselves.
+_HEURISTIC_NAMES: frozenset[str] = frozenset(_PROJECT_TYPE_MARKERS).union(
+    _ENTRY_POINT_NAMES, _TEST_DIR_NAMES, _CONFIG_FILE_NAMES,
+)
+
 # Maps file extension (lowercase, with dot) → human-readable language name.
 # Used by the rendering layer to display "Python" instead of ".py" etc.
 # Extensions for the same language point to the same label string.
@@ -227,141 +341,742 @@ _EXTENSION_TO_LANGUAGE: dict[str, str] = {
     ".txt": "Text",
 }
 
-# Default folders to skip — mirrors LocusMap.IGNORE_FOLDERS in map.py.
-# Defined here so scanner.py is self-contained (no circular import needed).
-def _read_gitignore(root: Path) -> set[str]:
-    """Parse .gitignore at root and return a set of name-based patterns to ignore."""
-    gitignore = root / ".gitignore"
-    if not gitignore.is_file():
-        return set()
-    patterns: set[str] = set()
-    for line in gitignore.read_text(errors="replace").splitlines():
-        line = line.strip().lstrip("/")
-        if line and not line.startswith("#") and not line.startswith("!"):
-            patterns.add(line.rstrip("/"))
-    return patterns
-
-
-_DEFAULT_IGNORE: set[str] = {
-    "__pycache__", "node_modules", "venv", "myEnv",
-    ".git", ".idea", ".vscode", "dist", "build",
-    "target", "bin", "obj", "vendor",
-    ".venv", "env", ".env",                 # more common Python venv names
-    "out", "output", "cache", ".cache",     # generic build output dirs
-    "coverage", ".nyc_output",              # test coverage artifacts
-    ".tox", ".nox",                         # Python test runners
-}
+
+
+def _list_dir(path: str, sizes: bool = True, disk: bool = False) -> _DirListing | None:
+    """
+    List one directory. Returns None when it cannot be read (permission denied).
+    With sizes=False no stat() is issued and every file size is reported as -1.
+    disk=True also fills listing.disk from the same stat() (sizes must be True).
+    """
+    try:
+        entries = list(os.scandir(path))
+    except PermissionError:
+        return None
+
+    listing = _DirListing(path, disk=[] if disk else None)
+    for entry in entries:
+        try:
+            # is_dir / is_symlink / is_file on DirEntry use cached d_type on
+            # Linux/macOS — no extra syscall unlike Path.is_symlink() + stat().
+            is_dir     = entry.is_dir(follow_symlinks=False)
+            is_symlink = entry.is_symlink()
+            is_file    = entry.is_file(follow_symlinks=False)
+        except OSError:
+            continue
+
+        if is_dir and not is_symlink:
+            listing.dirs.append(entry.name)
+        elif entry.name == ".gitignore":
+            listing.has_gitignore = True
+        elif is_file and not is_symlink and not entry.name.startswith("."):
+            if not sizes:
+                listing.files.append((entry.name, -1, -1.0))
+                continue
+            try:
+                st = entry.stat()  # cached on DirEntry after first call
+            except OSError:
+                listing.files.append((entry.name, 0, -1.0))
+                if listing.disk is not None:
+                    listing.disk.append((0, 0, 0))
+                continue
+            listing.files.append((entry.name, st.st_size, st.st_mtime))
+            if listing.disk is not None:
+                # st_blocks is POSIX-only: elsewhere the allocated size is taken to be the size.
+                allocated = st.st_blocks * 512 if hasattr(st, "st_blocks") else st.st_size
+                if st.st_nlink > 1:
+                    listing.disk.append((st.st_dev, st.st_ino, allocated))
+                else:
+                    listing.disk.append((0, 0, allocated))
+    return listing
+
+
+def _same_device(
+    list_dir: Callable[[str], _DirListing | None], device: int, mounts: list[str],
+) -> Callable[[str], _DirListing | None]:
+    """
+    Wrap a lister so that sub-directories on another device than `device` (mount
+    points) are left out of listings, their paths appended to `mounts`. Costs one
+    lstat() per sub-directory.
+    """
+    def list_same_device(path: str) -> _DirListing | None:
+        listing = list_dir(path)
+        if listing is None:
+            return None
+        kept: list[str] = []
+        for name in listing.dirs:
+            if not name.startswith("."):  # hidden ones are never entered
+                child = os.path.join(path, name)
+                try:
+                    if os.lstat(child).st_dev != device:
+                        mounts.append(child)
+                        continue
+                except OSError:
+                    pass  # gone or unreadable: its own listing will tell
+            kept.append(name)
+        # Listings may be shared with the scan index: never modified in place.
+        return listing if len(kept) == len(listing.dirs) else replace(listing, dirs=kept)
+
+    return list_same_device
+
+
+class _DiskAccounting:
+    """Hard-link dedupe for scan(..., disk_usage=True)."""
+
+    def __init__(self) -> None:
+        self.usage = DiskUsage()
+        # (st_dev, st_ino) of the files counted so far, kept only for files with
+        # several links: single-link files (nearly all) cannot be met twice.
+        self._seen: set[tuple[int, int]] = set()
+
+    def account(self, listing: _DirListing) -> list[tuple[str, int, float]]:
+        """listing.files, with the size of hard links met before set to 0."""
+        files = listing.files
+        if listing.disk is None:
+            return files
+        usage = self.usage
+        for i, (dev, ino, allocated) in enumerate(listing.disk):
+            if ino:
+                if (dev, ino) in self._seen:
+                    if files is listing.files:
+                        files = list(files)
+                    name, size, mtime = files[i]
+                    files[i] = (name, 0, mtime)
+                    usage.hard_links += 1
+                    usage.hard_link_bytes += size
+                    continue
+                self._seen.add((dev, ino))
+            usage.allocated_bytes += allocated
+        return files
+
+
+def _apply_ignore(listing: _DirListing, rel: str, matcher: IgnoreMatcher) -> tuple[_DirListing, IgnoreMatcher]:
+    """
+    Filter a raw listing through the ignore rules in effect for its directory.
+
+    `rel` is the directory path relative to the root, "/"-separated ("" for the root).
+    A .gitignore inside the directory is stacked on top of `matcher` first; the
+    returned matcher is the one its sub-directories must inherit. The raw listing is
+    left untouched, since it may be shared with a ScanIndex.
+    """
+    if listing.has_gitignore:
+        matcher = matcher.extend(rel, read_gitignore(os.path.join(listing.path, ".gitignore")))
+    dirs = [d for d in listing.dirs if not matcher.is_ignored(rel, d, True)]
+    if listing.disk is None:
+        files = [f for f in listing.files if not matcher.is_ignored(rel, f[0], False)]
+        return _DirListing(listing.path, dirs, files, listing.has_gitignore), matcher
+    kept = [(f, d) for f, d in zip(listing.files, listing.disk) if not matcher.is_ignored(rel, f[0], False)]
+    return _DirListing(
+        listing.path, dirs, [f for f, _ in kept], listing.has_gitignore, [d for _, d in kept],
+    ), matcher
+
+
+# What a scan() caller can need of every file — see ScanPlan.
+FIELDS = ("names", "sizes", "mtimes", "contents")
+
+
+@dataclass(frozen=True)
+class ScanPlan:
+    """
+    What a scan has to read for every file, worked out from the fields its
+    caller declares. Names come with the directory listing (d_type tells files
+    from folders without a syscall), and so do the heuristics and per-language
+    file counts built from them; sizes and mtimes cost one stat() per file,
+    contents a read of the file (line counts).
+    """
+    stat: bool
+    contents: bool
+
+    @classmethod
+    def for_fields(cls, fields: Iterable[str]) -> ScanPlan:
+        fields = set(fields)
+        unknown = sorted(fields - set(FIELDS))
+        if unknown:
+            raise ValueError(f"unknown field {unknown[0]!r}, expected some of {', '.join(FIELDS)}")
+        contents = "contents" in fields
+        # Line counting spreads files over its workers by size: contents need the stat too.
+        return cls(stat=contents or not fields.isdisjoint(("sizes", "mtimes")), contents=contents)
+
+
+# Where directory listings come from: "fs" always uses scandir + stat, "git-index"
+# takes tracked files from .git/index (checked against their stat data, like `git
+# status`), "auto" uses the git index when present.
+SOURCES = ("auto", "fs", "git-index")
+
+
+def _make_lister(
+    root: str,
+    source: str = "fs",
+    index: ScanIndex | None = None,
+    sizes: bool = True,
+) -> Callable[[str], _DirListing | None]:
+    """
+    Pick the directory lister for a walk: the git index and/or the persistent scan
+    index when requested, plain scandir otherwise. With sizes=False plain scandir
+    listings skip stat() and report sizes as -1, whatever the source (checking the
+    git index would take the stat() calls being saved), and the scan index keeps
+    them apart from sized listings.
+    """
+    if source not in SOURCES:
+        raise ValueError(f"unknown source {source!r}, expected one of {', '.join(SOURCES)}")
+    lister: Callable[[str], _DirListing | None] = _list_dir
+    names_lister: Callable[[str], _DirListing | None] = partial(_list_dir, sizes=False)
+    if source != "fs":
+        from .gitindex import GitIndexLister
+        git = GitIndexLister.open(root)
+        if git is not None:
+            lister = git.list_dir
+        elif source == "git-index":
+            raise ValueError(f"{root} has no readable .git/index")
+    if index is not None:
+        index.lister = lister
+        index.names_lister = names_lister
+        index.source = "fs" if lister is _list_dir else "git-index"
+        return index.list_dir if sizes else partial(index.list_dir, sizes=False)
+    return lister if sizes else names_lister
+
+
+def _build_matcher(ignore: list[str] | None, default: frozenset[str] = DEFAULT_IGNORE) -> IgnoreMatcher:
+    """Root matcher: default ignored names plus --ignore values (names or globs)."""
+    return IgnoreMatcher.from_patterns(default, ignore or [])
+
+
+def _walk(
+    root: str,
+    matcher: IgnoreMatcher,
+    jobs: int = 1,
+    list_dir: Callable[[str], _DirListing | None] = _list_dir,
+) -> Iterator[_DirListing]:
+    """
+    Yield the listing of every reachable directory under `root`, in DFS order,
+    already filtered through `matcher` and the .gitignore files found on the way.
+    Ignored directories are never listed. Hidden sub-directories are reported in
+    `dirs` but never entered.
+
+    With jobs == 1 directories are listed one after another on the calling thread.
+    Otherwise a thread pool lists them ahead of the consumer: scandir() and stat()
+    release the GIL, so on high-latency storage many round trips overlap. Each
+    worker queues the sub-directories it discovers as soon as it has listed its own
+    directory, so the pool never waits for the consumer to find new work. The
+    consumer still pops directories from the same stack as the serial path, which
+    makes the yield order (and therefore every aggregate built from it) identical.
+
+    jobs == 0 lets ThreadPoolExecutor pick its default pool size. `list_dir` can be
+    swapped for a cached lister (see cache.ScanIndex.list_dir).
+    """
+    def _children(listing: _DirListing, rel: str, m: IgnoreMatcher) -> Iterator[tuple[str, str, IgnoreMatcher]]:
+        for d in listing.dirs:
+            if not d.startswith("."):
+                yield os.path.join(listing.path, d), f"{rel}/{d}" if rel else d, m
+
+    if jobs == 1:
+        stack: list[tuple[str, str, IgnoreMatcher]] = [(root, "", matcher)]
+        while stack:
+            path, rel, m = stack.pop()
+            raw = list_dir(path)
+            if raw is None:
+                continue
+            listing, m = _apply_ignore(raw, rel, m)
+            yield listing
+            stack.extend(_children(listing, rel, m))
+        return
+
+    pool = ThreadPoolExecutor(max_workers=jobs or None, thread_name_prefix="locus-scan")
+    # path -> future of (filtered listing, matcher for its children). Children are
+    # registered before their parent's future resolves, so the consumer always finds them.
+    pending: dict[str, Future[tuple[_DirListing, IgnoreMatcher] | None]] = {}
+
+    def _task(path: str, rel: str, m: IgnoreMatcher) -> tuple[_DirListing, IgnoreMatcher] | None:
+        raw = list_dir(path)
+        if raw is None:
+            return None
+        listing, m = _apply_ignore(raw, rel, m)
+        for child in _children(listing, rel, m):
+            pending[child[0]] = pool.submit(_task, *child)
+        return listing, m
+
+    try:
+        pending[root] = pool.submit(_task, root, "", matcher)
+        stack2: list[tuple[str, str]] = [(root, "")]
+        while stack2:
+            path, rel = stack2.pop()
+            done = pending.pop(path).result()
+            if done is None:
+                continue
+            listing, m = done
+            yield listing
+            stack2.extend((child_path, child_rel) for child_path, child_rel, _ in _children(listing, rel, m))
+    finally:
+        # Also reached when the consumer stops early: drop queued work, finish in-flight listings.
+        pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _count_lines(
+    result: InfoResult, files: list[tuple[str, str, int]], jobs: int, rev: str | None, archive: bool,
+) -> None:
+    """Fill in the line counts of result.languages (see loc.py)."""
+    from . import loc
+    if archive:
+        totals = loc.count_archive_lines(result.root, files)
+    elif rev is not None:
+        from .gitrev import GitRevReader
+        with GitRevReader(result.root, rev) as reader:
+            totals = loc.count_rev_lines(reader, files)
+    else:
+        totals = loc.count_lines(files, jobs)
+    for ls in result.languages:
+        counts = totals.get(ls.extension)
+        if counts is not None:
+            ls.lines = counts.lines
+            ls.blank_lines = counts.blank
+            ls.comment_lines = counts.comment
+            ls.code_lines = counts.code
+    result.lines_counted = True
+
+
+def file_extension(name: str) -> str:
+    """Lower-case extension of a file name, "" if none (same rules as Path.suffix)."""
+    dot = name.rfind(".")
+    return name[dot:].lower() if 0 < dot < len(name) - 1 else ""
+
+
+def iter_entries(
+    root: Path,
+    ignore: list[str] | None = None,
+    jobs: int = 1,
+    index: ScanIndex | None = None,
+    source: str = "fs",
+    rev: str | None = None,
+    dirs: bool = False,
+    on_directory: Callable[[], None] | None = None,
+    snapshot: Snapshot | None = None,
+    fields: Iterable[str] = ("names", "sizes", "mtimes"),
+) -> Iterator[FileEntry]:
+    """
+    Stream one FileEntry per file under `root`, with the same ignore rules and
+    sources as scan(), which folds the same listings without building per-file
+    records. Memory stays proportional to the directories being walked, not to
+    the number of files, so several analyses can be folded into one pass over
+    very large trees.
+
+    Entries of one directory are yielded together, directories in DFS order (in
+    post-order with `rev`). Arguments are the ones of scan(), plus:
+        dirs:         also yield sub-directories (is_dir=True), hidden ones included
+                      even though they are never entered.
+        on_directory: called once a directory's entries have all been consumed.
+        snapshot:     read the listings from a Snapshot of `root` instead of walking
+                      (ignore, jobs, index, source and rev are then unused).
+        fields:       what the caller needs of every entry, as for scan(). Without
+                      "sizes" and "mtimes" no file is stat()-ed and sizes are 0.
+    Raises ValueError right away for an invalid root, jobs, source or field.
+    """
+    plan = ScanPlan.for_fields(fields)
+    if snapshot is not None:
+        return _iter_entries(str(root), snapshot.walk(), plan.stat, dirs, on_directory, None)
+    listings = _iter_listings(root, ignore, jobs, index, source, rev, sizes=plan.stat)
+    return _iter_entries(str(root), listings, plan.stat, dirs, on_directory, index)
+
+
+def _iter_listings(
+    root: Path,
+    ignore: list[str] | None,
+    jobs: int,
+    index: ScanIndex | None,
+    source: str,
+    rev: str | None,
+    sizes: bool = True,
+    disk: bool = False,
+    mounts: list[str] | None = None,
+) -> Iterator[_DirListing]:
+    """
+    Validate the walk arguments, then return the stream of filtered listings:
+    of `root`'s directories, or of its members when it is an archive file
+    (see archive.py; jobs, index, source and sizes are then unused).
+    sizes=False: files are not stat()-ed and sizes are -1, unless the source has them.
+    disk: fill listing.disk, from scandir whatever the source and without the index.
+    mounts: stay on the root's filesystem, collecting the mount points met in it.
+    """
+    from .archive import is_archive
+    archive = is_archive(root)
+    if not archive and (not root.exists() or not root.is_dir()):
+        raise ValueError(f"{root} is not a valid directory")
+    if jobs < 0:
+        raise ValueError(f"jobs must be >= 0, got {jobs}")
+
+    matcher = _build_matcher(ignore)
+    if archive:
+        if disk or mounts is not None:
+            raise ValueError("disk usage and one-file-system need a directory, not an archive")
+        if rev is not None:
+            raise ValueError("--rev reads a git repository, not an archive")
+        from .archive import iter_archive_listings
+        return iter_archive_listings(root, matcher)
+    if rev is not None:
+        if disk or mounts is not None:
+            raise ValueError("disk usage and one-file-system need the working tree, not a revision")
+        from .gitrev import iter_rev_listings
+        return iter_rev_listings(root, rev, matcher)
+    root_path = str(root)
+    lister = partial(_list_dir, disk=True) if disk else _make_lister(root_path, source, index, sizes)
+    if mounts is not None:
+        lister = _same_device(lister, os.stat(root_path).st_dev, mounts)
+    return _walk(root_path, matcher, jobs, lister)
+
+
+class Snapshot:
+    """
+    In-memory model of a tree: the filtered listing of every directory under
+    `root`, taken by one walk. `locus tree --stats` builds one and hands it to both
+    LocusMap and scan(), so every directory is listed once instead of once per
+    consumer. Holds the whole tree, so it is meant for a single command run.
+    """
+
+    def __init__(self, root: str, listings: dict[str, _DirListing]) -> None:
+        self.root = root
+        self.listings = listings
+
+    @classmethod
+    def build(
+        cls,
+        root: Path,
+        ignore: list[str] | None = None,
+        jobs: int = 1,
+        index: ScanIndex | None = None,
+        source: str = "fs",
+        rev: str | None = None,
+        one_file_system: bool = False,
+    ) -> Snapshot:
+        """Walk `root` once, with the same arguments and ignore rules as scan()."""
+        listings: dict[str, _DirListing] = {}
+        mounts = [] if one_file_system else None
+        for listing in _iter_listings(root, ignore, jobs, index, source, rev, mounts=mounts):
+            # Already filtered: consumers must not stack the .gitignore rules again.
+            listing.has_gitignore = False
+            seen = listings.get(listing.path)
+            if seen is None:
+                listings[listing.path] = listing
+            else:  # archives may list a directory in several parts
+                seen.dirs += listing.dirs
+                seen.files += listing.files
+        if index is not None:
+            index.save()
+        return cls(str(root), listings)
+
+    @classmethod
+    def from_index(cls, root: Path, index: ScanIndex, ignore: list[str] | None = None) -> Snapshot:
+        """
+        The tree as the scan index last saw it, built from cached listings only
+        (plus the .gitignore files met on the way). Directories the index never
+        listed are missing, so totals derived from it are as of the last scans.
+        """
+        listings: dict[str, _DirListing] = {}
+        for listing in _walk(str(root), _build_matcher(ignore), list_dir=index.peek):
+            listing.has_gitignore = False
+            listings[listing.path] = listing
+        return cls(str(root), listings)
+
+    def __len__(self) -> int:
+        return len(self.listings)
+
+    def list_dir(self, path: str) -> _DirListing | None:
+        """Lister over the snapshot (None for directories it does not hold)."""
+        return self.listings.get(path)
+
+    def walk(self) -> Iterator[_DirListing]:
+        """Listings in the same DFS order as a serial walk of the filesystem."""
+        stack = [self.root]
+        while stack:
+            listing = self.listings.get(stack.pop())
+            if listing is None:
+                continue
+            yield listing
+            stack.extend(os.path.join(listing.path, d) for d in listing.dirs if not d.startswith("."))
+
+
+# One directory as _fold() hands it over: the listing, its path relative to the
+# root, the prefix of its entries' relative paths, its depth, and its files as
+# (name, extension, size, mtime).
+_Folded = tuple[_DirListing, str, str, int, list[tuple[str, str, int, float]]]
+
+
+def _fold(
+    root_path: str,
+    listings: Iterable[_DirListing],
+    sized: bool = True,
+    accounting: _DiskAccounting | None = None,
+) -> Iterator[_Folded]:
+    """
+    The per-file work shared by scan() and iter_entries(). Relative paths and
+    depths are worked out once per directory, and the extension of each file
+    once per file, one string object per distinct extension; sizes that were
+    not stat()-ed (or not asked for: sized=False) come out as 0. No per-file
+    path string is built: consumers join prefix and name only for the files
+    they keep. accounting: count hard-linked files once (see _DiskAccounting).
+    """
+    root_prefix = root_path if root_path.endswith(os.sep) else root_path + os.sep
+    extensions: dict[str, str] = {}
+    intern = extensions.setdefault
+    for listing in listings:
+        if listing.path == root_path:
+            rel, prefix, depth = "", "", 0
+        else:
+            rel = listing.path[len(root_prefix):]
+            prefix, depth = rel + os.sep, rel.count(os.sep) + 1
+        files = listing.files if accounting is None else accounting.account(listing)
+        yield listing, rel, prefix, depth, [
+            (name, intern(ext, ext), size if sized and size > 0 else 0, mtime)
+            for name, size, mtime in files
+            for ext in (file_extension(name),)
+        ]
+
+
+def _iter_entries(
+    root_path: str,
+    listings: Iterator[_DirListing],
+    sized: bool,
+    dirs: bool,
+    on_directory: Callable[[], None] | None,
+    index: ScanIndex | None,
+) -> Iterator[FileEntry]:
+    for listing, rel, prefix, depth, files in _fold(root_path, listings, sized):
+        if dirs:
+            for name in listing.dirs:
+                yield FileEntry(prefix + name, name, "", 0, depth, -1.0, True, rel)
+        for name, ext, size, mtime in files:
+            yield FileEntry(prefix + name, name, ext, size, depth, mtime, False, rel)
+
+        if on_directory:
+            on_directory()
+
+    if index is not None:
+        index.save()
+
+
+def _merge_heuristics(into: ProjectHeuristics, other: ProjectHeuristics) -> None:
+    if into.project_type is None:
+        into.project_type, into.dependency_file = other.project_type, other.dependency_file
+    into.entry_points += other.entry_points
+    into.test_dirs += other.test_dirs
+    into.config_files += other.config_files
+
+
+def _roll_up(directories: dict[str, DirStat]) -> None:
+    """Add every directory's totals into its parent's, deepest directories first."""
+    for rel in sorted(directories, key=lambda r: r.count(os.sep) + 1 if r else 0, reverse=True):
+        if rel:
+            parent = rel.rpartition(os.sep)[0]
+            if parent not in directories:
+                directories[parent] = DirStat(parent)
+            directories[parent].add(directories[rel])
+
+
+def heaviest_directories(result: InfoResult, n: int = 8) -> list[DirStat]:
+    """The n sub-directories with the most bytes below them (the root excluded)."""
+    return heapq.nlargest(
+        n, (d for d in result.directories.values() if d.path), key=lambda d: (d.total_bytes, d.file_count),
+    )
 
 
 def scan(
     root: Path,
     ignore: list[str] | None = None,
-    on_progress: Callable[[InfoResult], None] | None = None,
+    progress: ProgressBus | None = None,
+    jobs: int = 1,
+    index: ScanIndex | None = None,
+    source: str = "fs",
+    rev: str | None = None,
+    loc: bool = False,
+    keep_files: bool = False,
+    snapshot: Snapshot | None = None,
+    fields: Iterable[str] = ("names", "sizes", "mtimes"),
+    disk_usage: bool = False,
+    one_file_system: bool = False,
 ) -> InfoResult:
     """
     Walk the directory tree from `root` and return an InfoResult.
 
     Args:
-        root:        directory to scan. Must be an existing directory.
-        ignore:      extra directory/file name patterns to skip.
-        on_progress: optional callback invoked after each directory is processed,
-                     receives the partially-populated InfoResult. Used for live
-                     progress displays.
+        root:        directory to scan. Must be an existing directory, or a tar
+                     or zip archive (see archive.ARCHIVE_SUFFIXES), scanned from
+                     its member headers without extracting it; jobs, index
+                     and source are then unused.
+        ignore:      extra names or gitignore-style patterns to skip. .gitignore files
+                     at any depth are honoured as well.
+        progress:    optional ProgressBus for live displays: its files, dirs and
+                     bytes follow the running totals, with a tick() after each
+                     directory and a flush() once the walk is done.
+        jobs:        number of threads listing directories in parallel. 1 (default)
+                     scans serially, 0 picks a pool size automatically. The result
+                     is identical whatever the value.
+        index:       optional persistent ScanIndex. Directories whose mtime did not
+                     change since the last run are served from it; it is saved
+                     back once the scan completes.
+        source:      "fs" (default), "git-index" or "auto" — see SOURCES. With the
+                     git index, tracked files are taken from .git/index while
+                     their size and mtime still match the file.
+        rev:         git revision (commit-ish) to scan instead of the working
+                     directory, read with `git ls-tree`; jobs, index and source
+                     are then unused. Raises ValueError if git cannot resolve it.
+        loc:         also count total/blank/comment/code lines per language (see
+                     loc.py) once the walk is done, on `jobs` processes, and rank
+                     languages by code lines instead of file count.
+        keep_files:  keep every file in result.files (a compact columnar FileTable)
+                     and derive the language and largest-file summaries from it.
+        snapshot:    aggregate a Snapshot of `root` taken earlier instead of walking
+                     again (ignore, index, source and rev are then unused).
+        fields:      what the caller needs of every file, among FIELDS (see
+                     ScanPlan). Without "sizes" and "mtimes" no file is
+                     stat()-ed: counts and heuristics only, result.sized is
+                     False. loc=True is the same as adding "contents".
+        disk_usage:  count hard-linked files once (by st_dev, st_ino) and sum
+                     allocated blocks as well, in result.disk. Files are then
+                     listed with scandir + stat whatever source and index are.
+        one_file_system: do not descend into mount points (du -x); those met
+                     are listed in result.skipped_mounts.
     Returns:
         fully populated InfoResult
     """
-    if not root.exists() or not root.is_dir():
-        raise ValueError(f"{root} is not a valid directory")
-
-    effective_ignore = _DEFAULT_IGNORE | set(ignore or []) | _read_gitignore(root)
-    result = InfoResult(root=root)
+    if disk_usage:
+        fields = (*fields, "sizes")
+    from .archive import is_archive
+    archive = snapshot is None and is_archive(root)
+    plan = ScanPlan.for_fields((*fields, "contents") if loc else fields)
+    loc = plan.contents
+    result = InfoResult(root=root, sized=plan.stat)
+    accounting = _DiskAccounting() if disk_usage else None
+    mounts: list[str] | None = [] if one_file_system else None
+    heuristics = result.heuristics
+    subprojects: dict[str, SubProject] = {}
     language_index: dict[str, int] = {}
     size_heap: list[tuple[int, str]] = []
+    loc_files: list[tuple[str, str, int]] = []  # (ext, path, size) to count lines of
+    root_path = str(root)
+    table: FileTable | None = None
+    if keep_files:
+        from .filetable import FileTable
+        table = result.files = FileTable()
+    # Each file is counted in its own directory only; ancestors are rolled up at the end.
+    directories = result.directories
+    dir_stat = directories[""] = DirStat("")
 
-    # Iterative DFS via explicit stack — avoids Python recursion limits on deep trees.
-    # Each item is (directory_path, is_root).
-    stack: list[tuple[Path, bool]] = [(root, True)]
+    # Listings arrive already filtered and in the same DFS order whatever `jobs` is,
+    # so folding them one by one here keeps the parallel result identical to the serial one.
+    # The loop below builds no FileEntry and no path string, except for files that
+    # enter the largest-files heap (or the FileTable / the line counter, when asked for).
+    if snapshot is not None:
+        listings = snapshot.walk()
+    else:
+        listings = _iter_listings(
+            root, ignore, jobs, index, source, rev, sizes=plan.stat, disk=disk_usage, mounts=mounts,
+        )
+    # Smallest size in the heap once it is full; names-only scans never fill it.
+    heap_floor: float = -1 if plan.stat else math.inf
+    for listing, rel, prefix, depth, files in _fold(root_path, listings, plan.stat, accounting):
+        is_root = depth == 0
 
-    while stack:
-        current, is_root = stack.pop()
-
-        try:
-            entries = list(os.scandir(current))
-        except PermissionError:
-            continue
+        # Heuristics of this directory: the project's at the root; below it, made on
+        # the first well-known name and kept if the directory holds a project marker.
+        h = heuristics if is_root else None
+        for name in listing.dirs:
+            if name in _HEURISTIC_NAMES:
+                if h is None:
+                    h = ProjectHeuristics()
+                if name in _TEST_DIR_NAMES:
+                    h.test_dirs.append(name)
+                # Hidden config dirs (e.g. .github) count, though they are pruned from traversal
+                if name in _CONFIG_FILE_NAMES:
+                    h.config_files.append(name)
+            if name.startswith("."):
+                continue
 
-        subdirs: list[os.DirEntry[str]] = []
+            result.total_dirs += 1
+            path = prefix + name
+            if path not in directories:
+                directories[path] = DirStat(path)
 
-        for entry in entries:
-            try:
-                # is_dir / is_symlink / is_file on DirEntry use cached d_type on
-                # Linux/macOS — no extra syscall unlike Path.is_symlink() + stat().
-                is_dir     = entry.is_dir(follow_symlinks=False)
-                is_symlink = entry.is_symlink()
-                is_file    = entry.is_file(follow_symlinks=False)
-            except OSError:
-                continue
+        if listing.files:
+            dir_stat = directories.get(rel)
+            if dir_stat is None:  # --rev yields children before their parent
+                dir_stat = directories[rel] = DirStat(rel)
+            languages = dir_stat.languages
+        for name, ext, size, mtime in files:
+            result.total_files += 1
+            result.total_bytes += size
+            dir_stat.file_count += 1
+            dir_stat.total_bytes += size
 
-            if is_dir and not is_symlink:
-                if entry.name.startswith("."):
-                    # Pruned from traversal, but still check for hidden config dirs (e.g. .github)
-                    if is_root and entry.name in _CONFIG_FILE_NAMES:
-                        result.heuristics.config_files.append(entry.name)
-                    continue
-                if entry.name in effective_ignore:
-                    continue
+            if ext:
+                languages[ext] = languages.get(ext, 0) + 1
+            if table is not None:
+                # Summaries are computed over its columns after the walk.
+                table.add(FileEntry(prefix + name, name, ext, size, depth, mtime, False, rel))
+            else:
+                if size >= heap_floor:
+                    path = prefix + name
+                    if len(size_heap) < 5:
+                        heapq.heappush(size_heap, (size, path))
+                        if len(size_heap) == 5:
+                            heap_floor = size_heap[0][0]
+                    elif (size, path) > size_heap[0]:
+                        heapq.heapreplace(size_heap, (size, path))
+                        heap_floor = size_heap[0][0]
+                if ext in language_index:
+                    ls = result.languages[language_index[ext]]
+                    ls.file_count += 1
+                    ls.total_bytes += size
+                elif ext:
+                    ls = LanguageStat(extension=ext, file_count=1, total_bytes=size)
+                    language_index[ext] = len(result.languages)
+                    result.languages.append(ls)
+            if loc and ext in _EXTENSION_TO_LANGUAGE:
+                if archive:
+                    loc_files.append((ext, (prefix + name).replace(os.sep, "/"), size))
+                else:
+                    loc_files.append((ext, prefix + name if rev is not None else os.path.join(listing.path, name), size))
 
-                subdirs.append(entry)
+            if name in _HEURISTIC_NAMES:
+                if h is None:
+                    h = ProjectHeuristics()
+                if h.project_type is None and name in _PROJECT_TYPE_MARKERS:
+                    h.project_type = _PROJECT_TYPE_MARKERS[name]
+                    h.dependency_file = name
+                if name in _ENTRY_POINT_NAMES:
+                    h.entry_points.append(name)
+                if name in _CONFIG_FILE_NAMES:
+                    h.config_files.append(name)
 
-                if is_root:
-                    if entry.name in _TEST_DIR_NAMES:
-                        result.heuristics.test_dirs.append(entry.name)
-                    if entry.name in _CONFIG_FILE_NAMES:
-                        result.heuristics.config_files.append(entry.name)
+        if h is not None and not is_root:
+            sub = subprojects.get(rel)
+            if sub is not None:  # a directory listed in several parts (archives)
+                _merge_heuristics(sub.heuristics, h)
+            elif h.project_type is not None:
+                subprojects[rel] = SubProject(rel, h)
 
-            elif is_file and not is_symlink and not entry.name.startswith("."):
-                try:
-                    size = entry.stat().st_size  # cached on DirEntry after first call
-                except OSError:
-                    size = 0
-
-                result.total_files += 1
-                result.total_bytes += size
-
-                rel_path = str(Path(entry.path).relative_to(root))
-                heapq.heappush(size_heap, (size, rel_path))
-                if len(size_heap) > 5:
-                    heapq.heappop(size_heap)
-
-                ext = Path(entry.name).suffix.lower()
-                if ext:
-                    if ext in language_index:
-                        ls = result.languages[language_index[ext]]
-                        ls.file_count += 1
-                        ls.total_bytes += size
-                    else:
-                        ls = LanguageStat(extension=ext, file_count=1, total_bytes=size)
-                        language_index[ext] = len(result.languages)
-                        result.languages.append(ls)
-
-                if is_root:
-                    if result.heuristics.project_type is None and entry.name in _PROJECT_TYPE_MARKERS:
-                        result.heuristics.project_type = _PROJECT_TYPE_MARKERS[entry.name]
-                        result.heuristics.dependency_file = entry.name
-                    if entry.name in _ENTRY_POINT_NAMES:
-                        result.heuristics.entry_points.append(entry.name)
-                    if entry.name in _CONFIG_FILE_NAMES:
-                        result.heuristics.config_files.append(entry.name)
-
-        for d in subdirs:
-            result.total_dirs += 1
-            stack.append((Path(d.path), False))
+        if progress is not None:
+            progress.files, progress.dirs, progress.bytes = result.total_files, result.total_dirs, result.total_bytes
+            progress.tick()
+    if progress is not None:
+        progress.flush()
+    if accounting is not None:
+        result.disk = accounting.usage
+    if mounts:
+        result.skipped_mounts = sorted(os.path.relpath(path, root_path) for path in mounts)
+    result.subprojects = [subprojects[rel] for rel in sorted(subprojects)]
+    if index is not None and snapshot is None:
+        index.save()
 
-        if on_progress:
-            on_progress(result)
+    _roll_up(directories)
+    if table is not None:
+        result.languages = table.languages()
+        result.largest_files = table.largest(5)
+    else:
+        result.largest_files = [(path, size) for size, path in sorted(size_heap, reverse=True)]
 
-    result.languages.sort(key=lambda ls: ls.file_count, reverse=True)
+    if loc:
+        _count_lines(result, loc_files, jobs, rev, archive)
+        result.languages.sort(key=lambda ls: ls.code_lines, reverse=True)
+    else:
+        result.languages.sort(key=lambda ls: ls.file_count, reverse=True)
     result.languages = result.languages[:5]
-    result.largest_files = [(path, size) for size, path in sorted(size_heap, reverse=True)]
 
-    return result
\ No newline at end of file
+    return result
@@ -0,0 +1,517 @@
+"""
+`locus info --watch`: an InfoResult kept up to date from filesystem events.
+
+LiveInfo walks the tree once, like scan(), and keeps what it found per
+directory (file sizes, sub-directories, ignore rules in effect). Changes are
+then applied as deltas: a created, modified or deleted file moves the totals,
+its language and the rolled-up DirStat of every ancestor; a created or
+deleted folder adds or removes its whole subtree; a .gitignore edit re-walks
+the folder it governs. The largest-files list is cached and only recomputed
+when one of its entries shrinks or goes away. Heuristics are rebuilt from the
+listing of the one directory they describe: the root's, and those of nested
+projects, looked at again only when a name they depend on comes or goes.
+
+Watch feeds LiveInfo. On Linux every directory gets an inotify watch, through
+ctypes, and events name the entries to look at again. inotify watches are
+limited per user (fs.inotify.max_user_watches, often 8k to 64k), so trees with
+hundreds of thousands of directories do not all fit: directories that cannot
+be watched, shallowest first, or every directory where inotify is not
+available, are polled instead, round-robin and at most _POLL_DIRS_PER_SECOND
+listings per second, so polling never costs more than a bounded trickle of
+syscalls. A kernel queue overflow re-lists every directory once.
+"""
+from __future__ import annotations
+
+import ctypes
+import ctypes.util
+import errno
+import heapq
+import os
+import select
+import stat
+import struct
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from pathlib import Path
+
+from .ignore import IgnoreMatcher
+from .scanner import (
+    DirStat, InfoResult, LanguageStat, ProjectHeuristics, Snapshot, SubProject,
+    _DirListing, _HEURISTIC_NAMES, _PROJECT_TYPE_MARKERS,
+    _apply_ignore, _build_matcher, _list_dir, file_extension, scan,
+)
+
+_POLL_DIRS_PER_SECOND = 1000
+
+# inotify(7) constants, from <sys/inotify.h>.
+_IN_MODIFY = 0x00000002
+_IN_ATTRIB = 0x00000004
+_IN_MOVED_FROM = 0x00000040
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_DELETE = 0x00000200
+_IN_Q_OVERFLOW = 0x00004000
+_IN_IGNORED = 0x00008000
+_IN_ONLYDIR = 0x01000000
+_IN_DONTFOLLOW = 0x02000000
+_IN_EXCL_UNLINK = 0x04000000
+_WATCH_MASK = (
+    _IN_MODIFY | _IN_ATTRIB | _IN_MOVED_FROM | _IN_MOVED_TO | _IN_CREATE | _IN_DELETE
+    | _IN_ONLYDIR | _IN_DONTFOLLOW | _IN_EXCL_UNLINK
+)
+_EVENT = struct.Struct("iIII")  # wd, mask, cookie, len; then len bytes of NUL-padded name
+
+
+@dataclass
+class _Dir:
+    """What LiveInfo knows of one walked directory."""
+    rel: str                    # "/"-separated, relative to the root ("" for the root)
+    key: str                    # the same with OS separators, as in InfoResult.directories
+    inherited: IgnoreMatcher    # rules from the parent
+    matcher: IgnoreMatcher      # plus this directory's .gitignore
+    gitignore: float | None     # mtime of its .gitignore, None without one
+    files: dict[str, int]       # name -> size
+    dirs: set[str]              # walked sub-directories (hidden ones excluded)
+
+
+class LiveInfo:
+    """
+    The aggregates of scan(root, ignore), updated in place by touch() and
+    refresh(). `version` changes whenever they do.
+    """
+
+    def __init__(self, root: Path, ignore: list[str] | None = None) -> None:
+        if not root.exists() or not root.is_dir():
+            raise ValueError(f"{root} is not a valid directory")
+        self.root = root
+        self.version = 0
+        self.total_files = 0
+        self.total_dirs = 0
+        self.total_bytes = 0
+        self.directories: dict[str, DirStat] = {}
+        self.heuristics = ProjectHeuristics()
+        self._root_path = str(root)
+        self._languages: dict[str, LanguageStat] = {}
+        self._dirs: dict[str, _Dir] = {}
+        self._subprojects: dict[str, SubProject] = {}  # by DirStat key
+        self._largest: list[tuple[int, str]] | None = None  # top 5 (size, path), None = recompute
+        self._add_tree(self._root_path, "", _build_matcher(ignore))
+
+    def paths(self) -> list[str]:
+        """Absolute paths of every walked directory."""
+        return list(self._dirs)
+
+    def result(self) -> InfoResult:
+        """The current state as an InfoResult (directories is shared, not copied)."""
+        if self._largest is None:
+            self._largest = heapq.nlargest(5, (
+                (size, os.path.join(d.key, name) if d.key else name)
+                for d in self._dirs.values() for name, size in d.files.items()
+            ))
+        languages = sorted(self._languages.values(), key=lambda ls: (-ls.file_count, ls.extension))
+        return InfoResult(
+            root=self.root,
+            total_files=self.total_files,
+            total_dirs=self.total_dirs,
+            total_bytes=self.total_bytes,
+            languages=[replace(ls) for ls in languages[:5]],
+            heuristics=self.heuristics,
+            largest_files=[(path, size) for size, path in self._largest],
+            directories=self.directories,
+            subprojects=[self._subprojects[key] for key in sorted(self._subprojects)],
+        )
+
+    # ── updates ─────────────────────────────────────────────────────
+
+    def touch(self, path: str, names: set[str]) -> tuple[list[str], list[str]]:
+        """
+        Look again at entries `names` of directory `path`, as named by events.
+        Returns the directories (absolute paths) that appeared and disappeared.
+        """
+        d = self._dirs.get(path)
+        if d is None:
+            return [], []
+        if ".gitignore" in names:
+            return self._rewalk(path, d)
+        added: list[str] = []
+        removed: list[str] = []
+        for name in names:
+            try:
+                st: os.stat_result | None = os.lstat(os.path.join(path, name))
+            except OSError:
+                st = None
+            is_dir = st is not None and stat.S_ISDIR(st.st_mode)
+            if name in d.dirs and not is_dir:
+                removed += self._remove_child(path, d, name)
+            elif is_dir and name not in d.dirs and not name.startswith(".") and \
+                    not d.matcher.is_ignored(d.rel, name, True):
+                added += self._add_child(path, d, name)
+            size = (
+                st.st_size
+                if st is not None and stat.S_ISREG(st.st_mode) and not name.startswith(".")
+                and not d.matcher.is_ignored(d.rel, name, False)
+                else None
+            )
+            if d.files.get(name) != size:
+                self._set_file(d, name, size)
+        if path in self._dirs and not _HEURISTIC_NAMES.isdisjoint(names):
+            self._update_heuristics(path)
+        return added, removed
+
+    def refresh(self, path: str) -> tuple[list[str], list[str]]:
+        """List directory `path` again and apply the differences (see touch())."""
+        d = self._dirs.get(path)
+        if d is None:
+            return [], []
+        if _gitignore_mtime(path) != d.gitignore:
+            return self._rewalk(path, d)
+        try:
+            raw = _list_dir(path)
+        except OSError:  # gone: its parent's turn will remove it
+            return [], []
+        if raw is None:
+            return [], []
+        listing, _ = _apply_ignore(raw, d.rel, d.inherited)
+        files = {name: max(size, 0) for name, size, _ in listing.files}
+        for name in [n for n in d.files if n not in files]:
+            self._set_file(d, name, None)
+        for name, size in files.items():
+            if d.files.get(name) != size:
+                self._set_file(d, name, size)
+        dirs = {name for name in listing.dirs if not name.startswith(".")}
+        added: list[str] = []
+        removed: list[str] = []
+        for name in d.dirs - dirs:
+            removed += self._remove_child(path, d, name)
+        for name in dirs - d.dirs:
+            added += self._add_child(path, d, name)
+        if path == self._root_path or d.key in self._subprojects or _has_marker(listing):
+            self._update_heuristics(path, listing)
+        return added, removed
+
+    def _rewalk(self, path: str, d: _Dir) -> tuple[list[str], list[str]]:
+        """Ignore rules changed: drop the subtree and walk it again."""
+        removed = self._remove_tree(path, d.key)
+        added = self._add_tree(path, d.rel, d.inherited)
+        return added, removed
+
+    def _set_file(self, d: _Dir, name: str, size: int | None) -> None:
+        """File `name` of `d` now has `size` bytes, or is gone (None)."""
+        old = d.files.get(name)
+        if size is None:
+            del d.files[name]
+        else:
+            d.files[name] = size
+        count = (size is not None) - (old is not None)
+        delta = (size or 0) - (old or 0)
+        self.total_files += count
+        self.total_bytes += delta
+        ext = file_extension(name)
+        if ext:
+            self._add_language(ext, count, delta)
+        self._propagate(d.key, count, delta, {ext: count} if ext and count else {})
+        path = os.path.join(d.key, name) if d.key else name
+        cache = self._largest
+        if cache is not None:
+            if old is not None and (old, path) in cache:
+                self._largest = None
+            elif size is not None and (len(cache) < 5 or (size, path) > cache[-1]):
+                cache.append((size, path))
+                cache.sort(reverse=True)
+                del cache[5:]
+        self.version += 1
+
+    def _add_child(self, path: str, d: _Dir, name: str) -> list[str]:
+        d.dirs.add(name)
+        self.total_dirs += 1
+        return self._add_tree(os.path.join(path, name), f"{d.rel}/{name}" if d.rel else name, d.matcher)
+
+    def _remove_child(self, path: str, d: _Dir, name: str) -> list[str]:
+        d.dirs.discard(name)
+        self.total_dirs -= 1
+        return self._remove_tree(os.path.join(path, name), os.path.join(d.key, name) if d.key else name)
+
+    def _add_tree(self, path: str, rel: str, inherited: IgnoreMatcher) -> list[str]:
+        """Walk a directory new to LiveInfo and add everything below it."""
+        added: list[str] = []
+        stack = [(path, rel, inherited)]
+        while stack:
+            path, rel, inherited = stack.pop()
+            key = rel.replace("/", os.sep)
+            self.directories.setdefault(key, DirStat(key))
+            try:
+                raw = _list_dir(path)
+            except OSError:
+                raw = None
+            if raw is None:
+                continue
+            listing, matcher = _apply_ignore(raw, rel, inherited)
+            d = self._dirs[path] = _Dir(
+                rel, key, inherited, matcher, _gitignore_mtime(path) if raw.has_gitignore else None,
+                {name: max(size, 0) for name, size, _ in listing.files},
+                {name for name in listing.dirs if not name.startswith(".")},
+            )
+            added.append(path)
+            counts: dict[str, int] = {}
+            size = 0
+            for name, file_size in d.files.items():
+                size += file_size
+                ext = file_extension(name)
+                if ext:
+                    counts[ext] = counts.get(ext, 0) + 1
+                    self._add_language(ext, 1, file_size)
+            self.total_files += len(d.files)
+            self.total_bytes += size
+            self.total_dirs += len(d.dirs)
+            self._propagate(key, len(d.files), size, counts)
+            if not rel or _has_marker(listing):
+                self._update_heuristics(path, listing)
+            stack.extend((os.path.join(path, name), f"{rel}/{name}" if rel else name, matcher) for name in d.dirs)
+        self._largest = None
+        self.version += 1
+        return added
+
+    def _remove_tree(self, path: str, key: str) -> list[str]:
+        """Forget a directory and everything below it."""
+        rolled = self.directories.get(key)
+        if rolled is not None and key:
+            self._propagate(
+                key.rpartition(os.sep)[0], -rolled.file_count, -rolled.total_bytes,
+                {ext: -count for ext, count in rolled.languages.items()},
+            )
+        removed: list[str] = []
+        stack = [(path, key)]
+        while stack:
+            path, key = stack.pop()
+            self.directories.pop(key, None)
+            self._subprojects.pop(key, None)
+            d = self._dirs.pop(path, None)
+            if d is None:
+                continue
+            removed.append(path)
+            for name, size in d.files.items():
+                self.total_files -= 1
+                self.total_bytes -= size
+                ext = file_extension(name)
+                if ext:
+                    self._add_language(ext, -1, -size)
+            self.total_dirs -= len(d.dirs)
+            stack.extend((os.path.join(path, name), os.path.join(key, name) if key else name) for name in d.dirs)
+        self._largest = None
+        self.version += 1
+        return removed
+
+    def _add_language(self, ext: str, count: int, size: int) -> None:
+        ls = self._languages.get(ext)
+        if ls is None:
+            ls = self._languages[ext] = LanguageStat(ext)
+        ls.file_count += count
+        ls.total_bytes += size
+        if ls.file_count == 0:
+            del self._languages[ext]
+
+    def _propagate(self, key: str, count: int, size: int, languages: dict[str, int]) -> None:
+        """Add file count, bytes and per-language counts to `key` and all its ancestors."""
+        while True:
+            dir_stat = self.directories[key]
+            dir_stat.file_count += count
+            dir_stat.total_bytes += size
+            for ext, n in languages.items():
+                total = dir_stat.languages.get(ext, 0) + n
+                if total:
+                    dir_stat.languages[ext] = total
+                else:
+                    del dir_stat.languages[ext]
+            if not key:
+                return
+            key = key.rpartition(os.sep)[0]
+
+    def _update_heuristics(self, path: str, listing: _DirListing | None = None) -> None:
+        """
+        Heuristics only look at one directory: rebuilt from its (filtered) listing
+        alone, listed again when not given. The root's are the project's; below
+        it, a directory with a project marker is a sub-project.
+        """
+        d = self._dirs[path]
+        if listing is None:
+            raw = _list_dir(path)
+            if raw is None:
+                return
+            listing, _ = _apply_ignore(raw, d.rel, d.inherited)
+        heuristics = scan(Path(path), snapshot=Snapshot(path, {path: listing})).heuristics
+        if path == self._root_path:
+            old: ProjectHeuristics | SubProject | None = self.heuristics
+            self.heuristics = heuristics
+        elif heuristics.project_type is not None:
+            old = self._subprojects.get(d.key)
+            self._subprojects[d.key] = SubProject(d.key, heuristics)
+            heuristics = self._subprojects[d.key]
+        else:
+            old = self._subprojects.pop(d.key, None)
+            heuristics = None
+        if heuristics != old:
+            self.version += 1
+
+
+def _has_marker(listing: _DirListing) -> bool:
+    """Whether a listing holds a project marker (pyproject.toml, package.json...)."""
+    return any(name in _PROJECT_TYPE_MARKERS for name, _, _ in listing.files)
+
+
+def _gitignore_mtime(path: str) -> float | None:
+    try:
+        return os.stat(os.path.join(path, ".gitignore")).st_mtime
+    except OSError:
+        return None
+
+
+class _Inotify:
+    """inotify(7) through ctypes. Raises OSError where it is not available."""
+
+    def __init__(self) -> None:
+        if not sys.platform.startswith("linux"):
+            raise OSError(errno.ENOSYS, "inotify is Linux only")
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c") or None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code))
+        self._paths: dict[int, str] = {}  # watch descriptor -> directory
+        self._wds: dict[str, int] = {}
+
+    def add(self, path: str) -> None:
+        """Watch `path`. OSError(ENOSPC) once fs.inotify.max_user_watches is reached."""
+        wd = self._libc.inotify_add_watch(self._fd, os.fsencode(path), _WATCH_MASK)
+        if wd < 0:
+            code = ctypes.get_errno()
+            raise OSError(code, os.strerror(code), path)
+        # A moved directory keeps its watch descriptor: it now stands for the new path.
+        self._paths[wd] = path
+        self._wds[path] = wd
+
+    def remove(self, path: str) -> None:
+        wd = self._wds.pop(path, None)
+        if wd is not None and self._paths.get(wd) == path:
+            del self._paths[wd]
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def __len__(self) -> int:
+        return len(self._wds)
+
+    def read(self, timeout: float) -> list[tuple[str | None, str, int]]:
+        """
+        Wait up to `timeout` seconds for events, then return all queued ones as
+        (directory or None, entry name, mask).
+        """
+        events: list[tuple[str | None, str, int]] = []
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return events
+        while True:
+            try:
+                data = os.read(self._fd, 1 << 16)
+            except BlockingIOError:
+                return events
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset:offset + length].rstrip(b"\0"))
+                offset += length
+                path = self._paths.get(wd)
+                if mask & _IN_IGNORED:  # watch gone with its directory
+                    if path is not None:
+                        del self._paths[wd]
+                        if self._wds.get(path) == wd:
+                            del self._wds[path]
+                    continue
+                events.append((path, name, mask))
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class Watch:
+    """
+    A LiveInfo kept current by inotify where possible and by polling elsewhere
+    (everywhere with poll=True).
+    """
+
+    def __init__(
+        self, root: Path, ignore: list[str] | None = None, poll: bool = False,
+        poll_rate: float = _POLL_DIRS_PER_SECOND,
+    ) -> None:
+        self.info = LiveInfo(root, ignore)
+        self._poll_rate = poll_rate
+        self._polled: set[str] = set()
+        self._queue: deque[str] = deque()  # round-robin order of the polled directories
+        self._inotify: _Inotify | None = None
+        if not poll:
+            try:
+                self._inotify = _Inotify()
+            except OSError:
+                pass
+        # Shallow directories first: when watches run out, the deep ones are polled.
+        self._track(sorted(self.info.paths(), key=lambda p: p.count(os.sep)))
+
+    @property
+    def watched(self) -> int:
+        """Directories watched through inotify."""
+        return len(self._inotify) if self._inotify is not None else 0
+
+    @property
+    def polled(self) -> int:
+        return len(self._polled)
+
+    def step(self, timeout: float) -> bool:
+        """Wait up to `timeout` seconds for changes and apply them. True if anything changed."""
+        version = self.info.version
+        if self._inotify is not None:
+            events = self._inotify.read(timeout)
+        else:
+            time.sleep(timeout)
+            events = []
+        names: dict[str, set[str]] = {}
+        overflow = False
+        for path, name, mask in events:
+            if mask & _IN_Q_OVERFLOW:
+                overflow = True
+            elif path is not None:
+                names.setdefault(path, set()).add(name)
+        if overflow:
+            for path in self.info.paths():
+                self._apply(*self.info.refresh(path))
+        else:
+            for path, changed in names.items():
+                self._apply(*self.info.touch(path, changed))
+        for _ in range(min(len(self._queue), max(1, int(self._poll_rate * timeout)))):
+            path = self._queue.popleft()
+            if path in self._polled:
+                self._queue.append(path)
+                self._apply(*self.info.refresh(path))
+        return self.info.version != version
+
+    def close(self) -> None:
+        if self._inotify is not None:
+            self._inotify.close()
+
+    def _apply(self, added: list[str], removed: list[str]) -> None:
+        for path in removed:
+            if self._inotify is not None:
+                self._inotify.remove(path)
+            self._polled.discard(path)
+        self._track(added)
+
+    def _track(self, paths: list[str]) -> None:
+        for path in paths:
+            if self._inotify is not None:
+                try:
+                    self._inotify.add(path)
+                    continue
+                except OSError as exc:
+                    if exc.errno != errno.ENOSPC:
+                        continue  # vanished or unreadable: its parent will notice
+            if path not in self._polled:
+                self._polled.add(path)
+                self._queue.append(path)
@@ -1,18 +1,129 @@
+from __future__ import annotations
 import argparse
+import os
+import sys
+from collections.abc import Callable
 from pathlib import Path
+from typing import TYPE_CHECKING, TextIO
 from .core.map import LocusMap
+from .core.progress import ProgressBus
+from .core.scanner import SOURCES
 from .ui.console import console
+from .ui.json_output import FORMATS
+
+if TYPE_CHECKING:
+    from .core.cache import ScanIndex
+    from .core.estimate import Budget
+    from .core.progress import ProgressEvent
+    from .core.scanner import InfoResult
 
 # Keep this in sync with pyproject.toml
 __version__ = "0.1.0"
 
+def _open_index(args: argparse.Namespace) -> ScanIndex | None:
+    """Load the persistent scan index for args.path, unless --no-cache was given."""
+    from .core.archive import is_archive
+    if args.no_cache or is_archive(Path(args.path)):
+        return None
+    from .core.cache import ScanIndex
+    try:
+        return ScanIndex.open(Path(args.path), _locus_dir())
+    except (OSError, RuntimeError):
+        # No usable home directory: scan without the index rather than fail.
+        return None
+
+def _locus_dir() -> Path:
+    """~/.locus, without creating anything (Provisioner() also creates the model dirs)."""
+    return Path.home() / ".locus"
+
 def cmd_tree(args: argparse.Namespace) -> int:
     """ Handler for: `locus tree` """
-    locus_map = LocusMap(args.path, args.depth, args.max_files, args.ignore)
-    with console.status(f"[dim]Scanning {args.path}[/]", spinner="dots"):
-        tree = locus_map.generate()
+    from .core.filters import FileFilter
+    try:
+        args.filter = FileFilter(args.include, args.lang, args.min_size)
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        return 1
+    if args.fast and (args.stats or args.sort == "size"):
+        console.print("[red]Error:[/red] --fast lists names only, --stats and --sort size need sizes")
+        return 1
+    if args.stats or args.sort == "size":
+        return _tree_from_snapshot(args)
+    try:
+        locus_map = LocusMap(
+            args.path, args.depth, args.max_files, args.ignore,
+            index=_open_index(args), source=args.source, rev=args.rev, max_nodes=args.max_nodes, jobs=args.jobs,
+            filter=args.filter, sizes=not args.fast, one_file_system=args.one_file_system,
+        )
+        # A bad --rev only shows once `git ls-tree` runs, at the start of the walk.
+        _print_tree(args, locus_map)
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        return 1
+    return 0
+
+def _print_tree(args: argparse.Namespace, locus_map: LocusMap, result: InfoResult | None = None) -> None:
+    """ Print the tree: laid out by Rich once the walk is done, or line by line as it goes """
+    if args.format != "text":
+        from .ui.json_output import JsonWriter, write_tree
+        _write_stdout(lambda out: write_tree(locus_map, JsonWriter(out), args.format == "ndjson", result))
+        return
+    if not console.is_terminal:
+        # Piped or redirected: plain text straight to stdout, no Rich layout.
+        # Flushing on progress ticks lets the reader see lines right away,
+        # without one write() syscall per directory.
+        _write_stdout(lambda out: locus_map.stream(
+            lambda line: out.write(line + "\n"), markup=False,
+            progress=ProgressBus().subscribe(lambda event: out.flush()),
+        ))
+        return
+    if args.stream:
+        console.rule(f"[dim]{args.path}[/]")
+        locus_map.stream(lambda line: console.print(line, highlight=False, soft_wrap=True))
+        return
+    with console.status(f"[dim]Scanning {args.path}[/]", spinner="dots") as status:
+        tree = locus_map.generate(ProgressBus().subscribe(lambda event: status.update(
+            f"[dim]Scanning {args.path}  {event.dirs:,} dirs  {event.files:,} files[/]"
+        )))
     console.rule(f"[dim]{args.path}[/]")
     console.print(tree)
+
+def _write_stdout(write: Callable[[TextIO], object]) -> None:
+    """ Output for other programs, straight to stdout """
+    out = sys.stdout
+    try:
+        write(out)
+        out.flush()
+    except BrokenPipeError:
+        # The reader went away (`locus tree | head`): stop quietly.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+
+def _tree_from_snapshot(args: argparse.Namespace) -> int:
+    """ `locus tree --stats` / `--sort size`: tree and scan results from a single walk """
+    from .core.scanner import Snapshot, scan
+    from .ui.info_renderer import render_info
+    path = Path(args.path)
+    try:
+        with console.status(f"[dim]Scanning {args.path}[/]", spinner="dots"):
+            snapshot = Snapshot.build(
+                path, args.ignore, jobs=args.jobs, index=_open_index(args), source=args.source, rev=args.rev,
+                one_file_system=args.one_file_system,
+            )
+            result = scan(path, snapshot=snapshot)
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        return 1
+    locus_map = LocusMap(
+        args.path, args.depth, args.max_files, args.ignore,
+        snapshot=snapshot, sort=args.sort, rollups=result.directories, max_nodes=args.max_nodes,
+        filter=args.filter,
+    )
+    if args.format != "text":
+        _print_tree(args, locus_map, result if args.stats else None)
+        return 0
+    _print_tree(args, locus_map)
+    if args.stats:
+        render_info(result, console)
     return 0
 
 def cmd_info(args: argparse.Namespace) -> int:
@@ -21,13 +132,122 @@ def cmd_info(args: argparse.Namespace) -> int:
     from .core.scanner import scan
     from .ui.info_renderer import render_info, render_progress
     path = Path(args.path)
-    with Live(console=console, refresh_per_second=10) as live:
-        result = scan(path, args.ignore, on_progress=lambda r: live.update(render_progress(path, r)))
-        live.update(render_progress(path, result))
+    on_disk = args.duplicates or args.disk_usage or args.one_file_system
+    from .core.archive import is_archive
+    if is_archive(path) and (args.watch or args.budget is not None or on_disk):
+        console.print(
+            "[red]Error:[/red] --watch, --budget, --duplicates, --disk-usage and --one-file-system read a folder: "
+            "not with an archive"
+        )
+        return 1
+    if args.watch:
+        if args.budget is not None or args.loc or args.rev is not None or on_disk or args.format != "text":
+            console.print(
+                "[red]Error:[/red] --watch follows the working tree on screen: not with --budget, --loc, --rev, "
+                "--duplicates, --disk-usage, --one-file-system or --format"
+            )
+            return 1
+        return _watch_info(path, args.ignore)
+    if on_disk and args.rev is not None:
+        console.print(
+            "[red]Error:[/red] --duplicates, --disk-usage and --one-file-system read the working tree: not with --rev"
+        )
+        return 1
+    try:
+        if args.budget is not None:
+            if args.loc or args.rev is not None or on_disk:
+                console.print(
+                    "[red]Error:[/red] --budget samples the working tree: not with --loc, --rev, --duplicates, "
+                    "--disk-usage or --one-file-system"
+                )
+                return 1
+            from .core.estimate import estimate
+            with console.status(f"[dim]Scanning {args.path} (budget)[/]", spinner="dots"):
+                result = estimate(
+                    path, args.budget, args.ignore, seed=args.seed, index=_open_index(args), source=args.source,
+                )
+        elif args.format != "text":
+            result = scan(
+                path, args.ignore, jobs=args.jobs, index=_open_index(args), source=args.source, rev=args.rev,
+                loc=args.loc, keep_files=args.duplicates, disk_usage=args.disk_usage,
+                one_file_system=args.one_file_system,
+            )
+        else:
+            with Live(console=console, refresh_per_second=10) as live:
+                # Live redraws 10 times per second: more status lines than that would never be seen.
+                progress = ProgressBus(rate=10).subscribe(lambda event: live.update(render_progress(path, event)))
+                result = scan(
+                    path, args.ignore,
+                    progress=progress,
+                    jobs=args.jobs,
+                    index=_open_index(args),
+                    source=args.source,
+                    rev=args.rev,
+                    loc=args.loc,
+                    keep_files=args.duplicates,
+                    disk_usage=args.disk_usage,
+                    one_file_system=args.one_file_system,
+                )
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        return 1
+    if args.duplicates:
+        from .core.duplicates import find_duplicates
+        if args.format != "text":
+            result.duplicates = find_duplicates(result)
+        else:
+            with console.status(f"[dim]Looking for duplicates in {args.path}[/]", spinner="dots"):
+                result.duplicates = find_duplicates(result)
+    if args.format != "text":
+        from .ui.json_output import JsonWriter, write_info
+        _write_stdout(lambda out: write_info(result, JsonWriter(out), args.format == "ndjson"))
+        return 0
     render_info(result, console)
     return 0
 
 
+# Redraws per second of `info --watch`: changes in between are applied, then shown together.
+_WATCH_FPS = 4
+
+def _watch_info(path: Path, ignore: list[str] | None = None) -> int:
+    """ `locus info --watch`: the info panels, updated as files change until Ctrl+C """
+    import time
+    from rich.console import Group
+    from rich.live import Live
+    from rich.text import Text
+    from .core.watch import Watch
+    from .ui.info_renderer import info_renderable
+    try:
+        with console.status(f"[dim]Scanning {path}[/]", spinner="dots"):
+            watch = Watch(path, ignore)
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        return 1
+
+    def view() -> Group:
+        polled = f", {watch.polled:,} polled" if watch.polled else ""
+        footer = Text(
+            f"  Watching {watch.watched:,} directories{polled} · "
+            f"updated {time.strftime('%H:%M:%S')} · Ctrl+C to stop", style="dim",
+        )
+        return Group(info_renderable(watch.info.result()), footer)
+
+    frame = 1 / _WATCH_FPS
+    try:
+        with Live(view(), console=console, auto_refresh=False) as live:
+            dirty, shown = False, time.monotonic()
+            while True:
+                dirty |= watch.step(frame)
+                if dirty and time.monotonic() - shown >= frame:
+                    live.update(view(), refresh=True)
+                    dirty, shown = False, time.monotonic()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watch.close()
+    return 0
+
+
 def cmd_overview(args: argparse.Namespace) -> int:
     """ Handler for: `locus overview` — setup TUI, then streams to terminal """
     from .core.scanner import scan
@@ -39,11 +259,30 @@ def cmd_overview(args: argparse.Namespace) -> int:
     from rich.progress import Progress, BarColumn, DownloadColumn, TransferSpeedColumn
 
     path = Path(args.path)
+    events = None
+    if args.format != "text":
+        from .ui.json_output import JsonWriter, OverviewEvents
+        events = OverviewEvents(JsonWriter(sys.stdout), args.format == "ndjson")
 
     # Pre-flight: scan + context extraction before opening TUI
-    with console.status("[dim]Scanning codebase...[/]", spinner="dots"):
-        result = scan(path, args.ignore)
-        context = extract_context(path, result)
+    try:
+        with console.status("[dim]Scanning codebase...[/]", spinner="dots"):
+            result = scan(
+                path, args.ignore, jobs=args.jobs, index=_open_index(args), source=args.source, rev=args.rev,
+                # The context is built from names (heuristics, languages by file count) and a few file reads.
+                fields=("names",) if args.fast else ("names", "sizes", "mtimes"),
+            )
+            if args.rev is not None:
+                from .core.gitrev import GitRevReader
+                with GitRevReader(path, args.rev) as reader:
+                    context = extract_context(path, result, reader)
+            else:
+                context = extract_context(path, result)
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        return 1
+    if events is not None:
+        events.scanned(result)
 
     profiler = HardwareProfiler()
     gpu_info = profiler.detect_gpu()
@@ -56,6 +295,26 @@ def cmd_overview(args: argparse.Namespace) -> int:
         vram_gb=float(gpu_info.get("vram_gb", 0.0)),
     )
 
+    if events is not None:
+        # stdout carries JSON: no setup screen, the GPU is used when it can be.
+        from .core.inference import check_gpu_support
+        n_gpu_layers = -1 if gpu_info.get("type", "CPU_ONLY") != "CPU_ONLY" and check_gpu_support() else 0
+        if not provisioner.is_model_cached(tier):
+            provisioner.download_model(tier)
+        events.model_ready()
+
+        def _emit(out: TextIO) -> None:
+            stream_overview(
+                model_path=provisioner.get_model_path(tier),
+                ctx=context,
+                n_gpu_layers=n_gpu_layers,
+                on_token=events.token,
+            )
+            events.done()
+
+        _write_stdout(_emit)
+        return 0
+
     # Setup screen: user picks GPU or CPU, app returns n_gpu_layers
     app = SetupApp(title="Overview", tier=tier, provisioner=provisioner, gpu_info=gpu_info)
     n_gpu_layers: int = app.run() or 0
@@ -73,10 +332,10 @@ def cmd_overview(args: argparse.Namespace) -> int:
         ) as progress:
             task_id = progress.add_task(f"Downloading {model_name}", total=None)
 
-            def _on_dl(downloaded: int, total: int) -> None:
-                progress.update(task_id, completed=downloaded, total=total if total > 0 else None)
+            def _on_dl(event: ProgressEvent) -> None:
+                progress.update(task_id, completed=event.bytes, total=event.total)
 
-            provisioner.download_model(tier, on_progress=_on_dl)
+            provisioner.download_model(tier, progress=ProgressBus().subscribe(_on_dl))
 
     # Stream inference, re-rendering as markdown every 15 tokens
     from rich.live import Live
@@ -155,9 +414,9 @@ def cmd_tutor(args: argparse.Namespace) -> int:
             console=console,
         ) as progress:
             task_id = progress.add_task(f"Downloading {model_name}", total=None)
-            def _on_dl(downloaded: int, total: int) -> None:
-                progress.update(task_id, completed=downloaded, total=total if total > 0 else None)
-            provisioner.download_model(tier, on_progress=_on_dl)
+            def _on_dl(event: ProgressEvent) -> None:
+                progress.update(task_id, completed=event.bytes, total=event.total)
+            provisioner.download_model(tier, progress=ProgressBus().subscribe(_on_dl))
 
     # Launch TUI
     from .ui.tutor_app import TutorApp
@@ -170,6 +429,74 @@ def cmd_tutor(args: argparse.Namespace) -> int:
     return 0
 
 
+def cmd_browse(args: argparse.Namespace) -> int:
+    """ Handler for: `locus browse` — lazy tree TUI, a selected file opens in the tutor """
+    from .ui.browse_app import BrowseApp
+    path = Path(args.path)
+    if not path.is_dir():
+        console.print(f"[red]Error:[/red] {args.path} is not a directory")
+        return 1
+    index = _open_index(args)
+    try:
+        app = BrowseApp(path, args.ignore, index=index, source=args.source, max_files=args.max_files)
+    except ValueError as exc:
+        console.print(f"[red]Error:[/red] {exc}")
+        return 1
+    selected = app.run()
+    if index is not None:
+        index.save()
+    if selected is None:
+        return 0
+    return cmd_tutor(argparse.Namespace(file=str(selected)))
+
+
+def cmd_cache_clear(args: argparse.Namespace) -> int:
+    """ Handler for: `locus cache clear` """
+    from .core.cache import clear_indexes
+    removed = clear_indexes(_locus_dir())
+    console.print(f"[dim]Removed {removed} scan index file{'s' if removed != 1 else ''}.[/dim]")
+    return 0
+
+
+def _job_count(value: str) -> int:
+    """ argparse type for --jobs: a thread count, 0 meaning auto """
+    try:
+        jobs = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if jobs < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0 (0 = auto), got {jobs}")
+    return jobs
+
+
+def _non_negative(value: str) -> int:
+    """ argparse type for counts where 0 makes sense: --depth, --max-files """
+    try:
+        n = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}") from None
+    if n < 0:
+        raise argparse.ArgumentTypeError(f"must be >= 0, got {n}")
+    return n
+
+
+def _positive(value: str) -> int:
+    """ argparse type for --max-nodes: at least one node """
+    n = _non_negative(value)
+    if n == 0:
+        raise argparse.ArgumentTypeError("must be >= 1, got 0")
+    return n
+
+
+def _budget(value: str) -> Budget:
+    """ argparse type for info --budget: a duration or a number of directory listings """
+    from .core.estimate import Budget
+    try:
+        return Budget.parse(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from None
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         prog="locus",
@@ -183,46 +510,256 @@ def build_parser() -> argparse.ArgumentParser:
 
     # ---- tree command ----
     tree_parser = subparser.add_parser("tree", help="Show repository tree.")
-    tree_parser.add_argument("path", nargs="?", default=".", help="Target Folder (default: current directory).")
-    tree_parser.add_argument("--depth", type=int, default=4, help="Max traversal depth.")
-    tree_parser.add_argument("--max-files", type=int, default=10, help="Max files to show for every subdir.")
+    tree_parser.add_argument(
+        "path", nargs="?", default=".", help="Target folder or .tar/.zip archive (default: current directory)."
+    )
+    tree_parser.add_argument("--depth", type=_non_negative, default=4, help="Max traversal depth.")
+    tree_parser.add_argument("--max-files", type=_non_negative, default=10, help="Max files to show for every subdir.")
+    tree_parser.add_argument(
+        "--include",
+        action="append",
+        default=[],
+        help="Only show files matching this glob (repeatable). Example --include '*_test.go'."
+    )
+    tree_parser.add_argument(
+        "--lang",
+        action="append",
+        default=[],
+        help="Only show files of this language (repeatable). Example --lang python --lang sql."
+    )
+    tree_parser.add_argument(
+        "--min-size",
+        type=int,
+        default=0,
+        help="Only show files of at least this many bytes."
+    )
+    tree_parser.add_argument(
+        "--max-nodes",
+        type=_positive,
+        default=None,
+        help="Max folders and files to show in total, shared out level by level and evenly between "
+             "sibling folders. Folders beyond it are not walked."
+    )
+    tree_parser.add_argument(
+        "--jobs", "-j",
+        type=_job_count,
+        default=1,
+        help="Threads listing directories ahead of the output (0 = auto, default: 1)."
+    )
     tree_parser.add_argument(
         "--ignore",
         action="append",
         default=[],
         help="Ignore files / folders (repeatable). Example --ignore .venv --ignore node_modules."
     )
+    tree_parser.add_argument("--no-cache", action="store_true", help="Do not read or update the scan index.")
+    tree_parser.add_argument(
+        "--source",
+        choices=SOURCES,
+        default="auto",
+        help="Where file lists come from: .git/index when present (auto), filesystem, or git index. "
+             "Index entries are only used while the file's size and mtime still match them."
+    )
+    tree_parser.add_argument(
+        "--rev",
+        default=None,
+        help="Scan a git revision (commit, tag, branch) instead of the working directory."
+    )
+    tree_parser.add_argument(
+        "--sort",
+        choices=LocusMap.SORT_KEYS,
+        default="name",
+        help="Order folders and files by name (default) or by size, folder sizes including everything below."
+    )
+    tree_parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Also print the `locus info` panels, computed from the same walk."
+    )
+    tree_parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Print lines as directories are walked instead of laying out the whole tree first. "
+             "Always on when the output is not a terminal."
+    )
+    tree_parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Names only: no stat() per file and no file sizes shown. "
+             "Not with --stats or --sort size."
+    )
+    tree_parser.add_argument(
+        "--one-file-system", "-x",
+        action="store_true",
+        help="Do not enter mount points (other filesystems, network mounts), like du -x."
+    )
+    tree_parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Output format: text (default), one JSON document, or one JSON record per node (ndjson)."
+    )
     # If the user invokes `tree`, attach a new attribute called handler and set value to the function
     # cmd_tree()
     tree_parser.set_defaults(handler=cmd_tree)
 
     # ---- info command ----
     info_parser = subparser.add_parser("info", help="Show static codebase analysis.")
-    info_parser.add_argument("path", nargs="?", default=".", help="Target folder (default: current directory).")
+    info_parser.add_argument(
+        "path", nargs="?", default=".", help="Target folder or .tar/.zip archive (default: current directory)."
+    )
     info_parser.add_argument(
         "--ignore",
         action="append",
         default=[],
         help="Ignore files / folders (repeatable)."
     )
+    info_parser.add_argument(
+        "--jobs", "-j",
+        type=_job_count,
+        default=1,
+        help="Threads listing directories in parallel (0 = auto, default: 1)."
+    )
+    info_parser.add_argument("--no-cache", action="store_true", help="Do not read or update the scan index.")
+    info_parser.add_argument(
+        "--source",
+        choices=SOURCES,
+        default="auto",
+        help="Where file lists come from: .git/index when present (auto), filesystem, or git index. "
+             "Index entries are only used while the file's size and mtime still match them."
+    )
+    info_parser.add_argument(
+        "--rev",
+        default=None,
+        help="Scan a git revision (commit, tag, branch) instead of the working directory."
+    )
+    info_parser.add_argument(
+        "--loc",
+        action="store_true",
+        help="Count code, comment and blank lines per language (uses --jobs processes)."
+    )
+    info_parser.add_argument(
+        "--budget",
+        type=_budget,
+        default=None,
+        help="Estimate instead of walking everything once the budget runs out: a duration (2s, 500ms) "
+             "or a number of directory listings (reproducible with --seed). Estimates are labelled."
+    )
+    info_parser.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="Seed of the --budget sampling (default: 0)."
+    )
+    info_parser.add_argument(
+        "--disk-usage",
+        action="store_true",
+        help="Count hard-linked files once and show the space allocated on disk next to the apparent "
+             "size (sparse files take less). Every file is stat()-ed from the filesystem."
+    )
+    info_parser.add_argument(
+        "--one-file-system", "-x",
+        action="store_true",
+        help="Do not enter mount points (other filesystems, network mounts), like du -x."
+    )
+    info_parser.add_argument(
+        "--duplicates",
+        action="store_true",
+        help="Find files with identical contents and the bytes their copies waste. Only files sharing "
+             "a size are read: a 4 KiB head and tail first, in full only if those match."
+    )
+    info_parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep the panels on screen and update them as files change (inotify on Linux, polling "
+             "elsewhere or beyond the inotify watch limit). Ctrl+C to stop."
+    )
+    info_parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Output format: text (default), one JSON document, or one JSON record per directory "
+             "then a summary (ndjson)."
+    )
     info_parser.set_defaults(handler=cmd_info)
 
     # ---- overview command ----
     overview_parser = subparser.add_parser("overview", help="AI-powered codebase overview (local LLM).")
-    overview_parser.add_argument("path", nargs="?", default=".", help="Target folder (default: current directory).")
+    overview_parser.add_argument(
+        "path", nargs="?", default=".", help="Target folder or .tar/.zip archive (default: current directory)."
+    )
     overview_parser.add_argument(
         "--ignore",
         action="append",
         default=[],
         help="Ignore files / folders (repeatable)."
     )
+    overview_parser.add_argument(
+        "--jobs", "-j",
+        type=_job_count,
+        default=1,
+        help="Threads listing directories in parallel (0 = auto, default: 1)."
+    )
+    overview_parser.add_argument("--no-cache", action="store_true", help="Do not read or update the scan index.")
+    overview_parser.add_argument(
+        "--source",
+        choices=SOURCES,
+        default="auto",
+        help="Where file lists come from: .git/index when present (auto), filesystem, or git index. "
+             "Index entries are only used while the file's size and mtime still match them."
+    )
+    overview_parser.add_argument(
+        "--rev",
+        default=None,
+        help="Scan a git revision (commit, tag, branch) instead of the working directory."
+    )
+    overview_parser.add_argument(
+        "--fast",
+        action="store_true",
+        help="Scan names only (no stat() per file) before the overview; the context does not use sizes."
+    )
+    overview_parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        default="text",
+        help="Output format: text (default), one JSON document once done, or one JSON record per token "
+             "(ndjson). Skips the setup screen: the GPU is used when supported."
+    )
     overview_parser.set_defaults(handler=cmd_overview)
 
+    # ---- browse command ----
+    browse_parser = subparser.add_parser("browse", help="Browse the project tree interactively; open a file in the tutor.")
+    browse_parser.add_argument("path", nargs="?", default=".", help="Target folder (default: current directory).")
+    browse_parser.add_argument(
+        "--max-files", type=_non_negative, default=200, help="Max files to show for every folder."
+    )
+    browse_parser.add_argument(
+        "--ignore",
+        action="append",
+        default=[],
+        help="Ignore files / folders (repeatable). Example --ignore .venv --ignore node_modules."
+    )
+    browse_parser.add_argument("--no-cache", action="store_true", help="Do not read or update the scan index.")
+    browse_parser.add_argument(
+        "--source",
+        choices=SOURCES,
+        default="auto",
+        help="Where file lists come from: .git/index when present (auto), filesystem, or git index. "
+             "Index entries are only used while the file's size and mtime still match them."
+    )
+    browse_parser.set_defaults(handler=cmd_browse)
+
     # ---- tutor command ----
     tutor_parser = subparser.add_parser("tutor", help="Line-by-line AI code tutor.")
     tutor_parser.add_argument("file", help="File to tutor.")
     tutor_parser.set_defaults(handler=cmd_tutor)
 
+    # ---- cache command ----
+    cache_parser = subparser.add_parser("cache", help="Manage the persistent scan index (~/.locus/index).")
+    cache_sub = cache_parser.add_subparsers(dest="cache_command")
+    cache_clear_parser = cache_sub.add_parser("clear", help="Delete all cached scan indexes.")
+    cache_clear_parser.set_defaults(handler=cmd_cache_clear)
+
     return parser
 
 # argv=None here just means that argv is an optional parameter. but if you still provide parameters
@@ -0,0 +1,174 @@
+"""
+Textual TUI for `locus browse`.
+
+A lazy version of `locus tree`: a folder is listed only when it is expanded,
+on a worker thread, so huge folders never freeze the UI. Folder sizes (everything
+below them) come from the scan index, as of the last scan. Selecting a file
+closes the browser and hands the file to `locus tutor`.
+Keyboard: j/k/up/down navigate, Enter/Space expand or open, q quit.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from textual import work
+from textual.app import App, ComposeResult
+from textual.widgets import Footer, Tree
+from textual.widgets.tree import TreeNode as UINode
+
+from ..core.ignore import IgnoreMatcher
+from ..core.map import FolderListing, LocusMap, TreeNode, markup_label
+from ..core.scanner import DirStat, Snapshot, scan
+
+if TYPE_CHECKING:
+    from ..core.cache import ScanIndex
+
+
+@dataclass
+class _Entry:
+    """What a node of the browser stands for."""
+    path: str
+    rel: str = ""                           # "/"-separated, relative to the root
+    matcher: IgnoreMatcher | None = None    # rules for a folder's children; None for files
+    loaded: bool = False
+
+
+class BrowseApp(App[Path | None]):
+    """Lazy project tree. run() returns the file picked for the tutor, if any."""
+
+    CSS = """
+    BrowseApp {
+        background: $surface;
+    }
+
+    #tree {
+        height: 1fr;
+        padding: 0 1;
+    }
+    """
+
+    BINDINGS = [
+        ("j", "cursor_down", "Down"),
+        ("k", "cursor_up", "Up"),
+        ("q", "quit", "Quit"),
+    ]
+
+    def __init__(
+        self,
+        root: Path,
+        ignore: list[str] | None = None,
+        index: ScanIndex | None = None,
+        source: str = "fs",
+        max_files: int = 200,
+    ) -> None:
+        super().__init__()
+        self._root = root
+        self._ignore = ignore
+        self._index = index
+        # Only used for its listing pipeline: ignore rules, sorting, max_files.
+        self._map = LocusMap(root, max_depth=1, max_files=max_files, ignore=ignore, index=index, source=source)
+        self._sizes: dict[str, DirStat] = {}
+
+    def compose(self) -> ComposeResult:
+        root = _Entry(str(self._root), "", self._map.matcher)
+        yield Tree(self._folder_label(self._map.root_name, root.path), data=root, id="tree")
+        yield Footer()
+
+    def on_mount(self) -> None:
+        self.query_one(Tree).root.expand()
+        if self._index is not None:
+            self._load_sizes()
+
+    # ------------------------------------------------------------------ #
+    # Rendering helpers
+    # ------------------------------------------------------------------ #
+
+    def _folder_label(self, name: str, path: str) -> str:
+        stat = self._sizes.get(path)
+        return markup_label(TreeNode(0, False, "dir", name, stat.total_bytes if stat else None), icons=False)
+
+    def _populate(self, node: UINode[_Entry], children: FolderListing | None) -> None:
+        """Replace the children of `node` with a fresh listing."""
+        node.remove_children()
+        if children is None:
+            node.add_leaf(markup_label(TreeNode(0, True, "denied"), icons=False))
+            return
+        entry = node.data
+        assert entry is not None
+        for name in children.dirs:
+            path = os.path.join(children.path, name)
+            rel = f"{entry.rel}/{name}" if entry.rel else name
+            node.add(self._folder_label(name, path), data=_Entry(path, rel, children.matcher))
+        for name, size, _ in children.files:
+            node.add_leaf(
+                markup_label(TreeNode(0, False, "file", name, size), icons=False),
+                data=_Entry(os.path.join(children.path, name)),
+            )
+        if children.hidden_dirs or children.hidden_files:
+            node.add_leaf(markup_label(
+                TreeNode(0, True, "more", size=children.hidden_files, dirs=children.hidden_dirs), icons=False,
+            ))
+
+    def _show_sizes(self, sizes: dict[str, DirStat]) -> None:
+        """Relabel every folder already shown once the index sizes are known."""
+        self._sizes = sizes
+        stack = [self.query_one(Tree).root]
+        while stack:
+            node = stack.pop()
+            entry = node.data
+            if entry is not None and entry.matcher is not None:
+                name = self._map.root_name if node.is_root else os.path.basename(entry.path)
+                node.set_label(self._folder_label(name, entry.path))
+                stack.extend(node.children)
+
+    # ------------------------------------------------------------------ #
+    # Workers
+    # ------------------------------------------------------------------ #
+
+    @work(thread=True)
+    def _expand(self, node: UINode[_Entry]) -> None:
+        entry = node.data
+        assert entry is not None and entry.matcher is not None
+        children = self._map.list_folder(entry.path, entry.rel, entry.matcher)
+        self.call_from_thread(self._populate, node, children)
+
+    @work(thread=True)
+    def _load_sizes(self) -> None:
+        assert self._index is not None
+        snapshot = Snapshot.from_index(self._root, self._index, self._ignore)
+        directories = scan(self._root, snapshot=snapshot).directories
+        root = str(self._root)
+        # Folders the index never listed would show 0 bytes: leave them unlabelled.
+        sizes = {
+            path: stat for path, stat in (
+                (os.path.join(root, rel) if rel else root, stat) for rel, stat in directories.items()
+            )
+            if path in snapshot.listings
+        }
+        self.call_from_thread(self._show_sizes, sizes)
+
+    # ------------------------------------------------------------------ #
+    # Actions and messages
+    # ------------------------------------------------------------------ #
+
+    def action_cursor_down(self) -> None:
+        self.query_one(Tree).action_cursor_down()
+
+    def action_cursor_up(self) -> None:
+        self.query_one(Tree).action_cursor_up()
+
+    def on_tree_node_expanded(self, event: Tree.NodeExpanded[_Entry]) -> None:
+        entry = event.node.data
+        if entry is None or entry.matcher is None or entry.loaded:
+            return
+        entry.loaded = True
+        event.node.add_leaf("[dim italic]listing...[/]")
+        self._expand(event.node)
+
+    def on_tree_node_selected(self, event: Tree.NodeSelected[_Entry]) -> None:
+        entry = event.node.data
+        if entry is not None and entry.matcher is None:
+            self.exit(Path(entry.path))
@@ -7,8 +7,11 @@ from rich.rule import Rule
 from rich.table import Table
 from rich.text import Text
 from rich.filesize import decimal
+from rich.markup import escape
 
-from ..core.scanner import InfoResult, LanguageStat
+from ..core.duplicates import DuplicateReport
+from ..core.progress import ProgressEvent
+from ..core.scanner import DirStat, InfoResult, LanguageStat, heaviest_directories
 from ..core.scanner import _EXTENSION_TO_LANGUAGE
 from ..ui.console import supports_unicode
 
@@ -36,16 +39,35 @@ def _build_languages_panel(result: InfoResult) -> Panel:
     table = Table(box=None, show_header=False, padding=(0, 1, 0, 0))
     table.add_column(style="bold white", no_wrap=True)  # language name
     table.add_column(no_wrap=True)                       # bar
+    if result.lines_counted:
+        table.add_column(justify="right", style="white")  # code lines
+        table.add_column(justify="right", style="dim")    # comment / blank lines
     table.add_column(justify="right", style="dim")       # file count
     table.add_column(justify="right", style="dim")       # size
 
-    max_count = result.languages[0].file_count if result.languages else 0
+    # With line counts the languages are ranked by code lines, so the bars follow them
+    def weight(ls: LanguageStat) -> int:
+        return ls.code_lines if result.lines_counted else ls.file_count
+
+    max_count = weight(result.languages[0]) if result.languages else 0
+    estimate = result.estimate
     for rank, ls in enumerate(result.languages):
+        line_cells = (
+            [f"{ls.code_lines:,} code", f"{ls.comment_lines:,} comment  {ls.blank_lines:,} blank"]
+            if result.lines_counted else []
+        )
+        if estimate is not None:
+            low, high = estimate.languages[ls.extension]
+            count_cell = f"~{ls.file_count:,} files ({low:,.0f}–{high:,.0f})"
+            size_cell = f"~{_human_size(ls.total_bytes)}"
+        else:
+            count_cell, size_cell = f"{ls.file_count} files", _human_size(ls.total_bytes)
         table.add_row(
             _language_label(ls),
-            _bar(ls.file_count, max_count, rank),
-            f"{ls.file_count} files",
-            _human_size(ls.total_bytes),
+            _bar(weight(ls), max_count, rank),
+            *line_cells,
+            count_cell,
+            size_cell,
         )
 
     return Panel(
@@ -87,57 +109,195 @@ def _build_largest_files_panel(result: InfoResult) -> Panel:
     table.add_column(style="white")                                         # path
 
     for path, size in result.largest_files:
-        table.add_row(_human_size(size), path)
+        table.add_row(_human_size(size), escape(path))
 
+    walked = " (walked part)" if result.estimate is not None else ""
     return Panel(
         table,
-        title="[bold yellow]Largest Files[/bold yellow]",
+        title=f"[bold yellow]Largest Files{walked}[/bold yellow]",
         border_style="yellow",
         padding=(1, 2),
     )
 
 
-def render_progress(root: Path, result: InfoResult | None) -> Text:
+def _top_language(d: DirStat) -> str:
+    if not d.languages:
+        return ""
+    ext = max(d.languages, key=lambda e: d.languages[e])
+    return _EXTENSION_TO_LANGUAGE.get(ext, ext)
+
+
+def _build_heaviest_dirs_panel(dirs: list[DirStat]) -> Panel:
+    table = Table(box=None, show_header=False, padding=(0, 1, 0, 0))
+    table.add_column(justify="right", style="bold blue", no_wrap=True)  # size
+    table.add_column(style="white")                                       # path
+    table.add_column(justify="right", style="dim")                       # file count
+    table.add_column(style="dim")                                         # main language
+
+    for d in dirs:
+        table.add_row(_human_size(d.total_bytes), f"{escape(d.path)}/", f"{d.file_count:,} files", _top_language(d))
+
+    return Panel(
+        table,
+        title="[bold blue]Heaviest Directories[/bold blue]",
+        border_style="blue",
+        padding=(1, 2),
+    )
+
+
+def _build_subprojects_panel(result: InfoResult, n: int = 12) -> Panel:
+    table = Table(box=None, show_header=False, padding=(0, 2, 0, 0))
+    table.add_column(style="white")                          # path
+    table.add_column(style="bold yellow", no_wrap=True)      # type
+    table.add_column(style="dim", no_wrap=True)              # main language
+    table.add_column(justify="right", style="dim")           # file count
+    table.add_column(style="bright_green")                   # entry points, test dirs
+
+    subprojects = result.subprojects
+    for sub in subprojects[:n]:
+        h = sub.heuristics
+        d = result.directories.get(sub.path)
+        details = Text("  ".join(h.entry_points), style="bright_green")
+        if h.test_dirs:
+            details.append(("  " if h.entry_points else "") + "tests: " + "  ".join(h.test_dirs), style="dim")
+        table.add_row(
+            f"{escape(sub.path)}/",
+            h.project_type,
+            _top_language(d) if d else "",
+            f"{d.file_count:,} files" if d else "",
+            details,
+        )
+    if len(subprojects) > n:
+        table.add_row(f"[dim]... {len(subprojects) - n:,} more[/dim]", "", "", "", "")
+
+    return Panel(
+        table,
+        title=f"[bold green]Sub-projects[/bold green] [dim]{len(subprojects):,}[/dim]",
+        border_style="green",
+        padding=(1, 2),
+    )
+
+
+def _build_duplicates_panel(report: DuplicateReport, n: int = 8) -> Panel:
+    table = Table(box=None, show_header=False, padding=(0, 1, 0, 0))
+    table.add_column(justify="right", style="bold red", no_wrap=True)  # wasted
+    table.add_column(justify="right", style="dim", no_wrap=True)       # copies x size
+    table.add_column(style="white")                                     # paths
+
+    for group in report.groups[:n]:
+        more = f"  [dim](+{len(group.paths) - 2} more)[/dim]" if len(group.paths) > 2 else ""
+        table.add_row(
+            _human_size(group.wasted),
+            f"{len(group.paths)} × {_human_size(group.size)}",
+            f"{escape(group.paths[0])}\n{escape(group.paths[1])}{more}",
+        )
+    if len(report.groups) > n:
+        table.add_row("", "", f"[dim]... {len(report.groups) - n:,} more groups[/dim]")
+
+    return Panel(
+        table,
+        title=f"[bold red]Duplicates[/bold red] [dim]{_human_size(report.wasted_bytes)} wasted "
+              f"in {len(report.groups):,} groups[/dim]",
+        border_style="red",
+        padding=(1, 2),
+    )
+
+
+def _estimate_note(result: InfoResult) -> Text:
+    """How an estimate was made and its 95% intervals, under the header."""
+    e = result.estimate
+    assert e is not None
+    files, dirs, size = e.files, e.dirs, e.bytes
+    return Text(
+        f"  Walked {e.exact_dirs:,} directories, then {e.probes:,} random descents into the "
+        f"{e.frontier:,} subtrees left (budget {e.listings:,} listings, seed {e.seed}).\n"
+        f"  95% intervals: {files[0]:,.0f}–{files[1]:,.0f} files, {dirs[0]:,.0f}–{dirs[1]:,.0f} dirs, "
+        f"{_human_size(round(size[0]))}–{_human_size(round(size[1]))}. "
+        f"Reproduce with --budget {e.listings} --seed {e.seed}.",
+        style="dim",
+    )
+
+
+def render_progress(root: Path, event: ProgressEvent | None) -> Text:
     """Compact one-line status shown while scanning is in progress."""
     t = Text()
     t.append(" Scanning ", style="dim")
     t.append(str(root), style="dim cyan")
-    if result is not None:
+    if event is not None:
         t.append("  ", style="dim")
-        t.append(f"{result.total_files:,}", style="bold white")
+        t.append(f"{event.files:,}", style="bold white")
         t.append(" files  ", style="dim")
-        t.append(f"{result.total_dirs:,}", style="bold white")
+        t.append(f"{event.dirs:,}", style="bold white")
         t.append(" dirs  ", style="dim")
-        t.append(_human_size(result.total_bytes), style="bold white")
+        t.append(_human_size(event.bytes), style="bold white")
     else:
         t.append("...", style="dim")
     return t
 
 
-def render_info(result: InfoResult, console: Console) -> None:
-    """Print the locus info output to the given console."""
+def info_renderable(result: InfoResult) -> Group:
+    """The locus info output as one renderable (printed by render_info, redrawn by `info --watch`)."""
     # ── header ──────────────────────────────────────────────────────
+    estimate = result.estimate
+    approx = "~" if estimate is not None else ""
     header = Text()
-    header.append(str(result.total_files), style="bold white")
+    header.append(f"{approx}{result.total_files:,}" if estimate else str(result.total_files), style="bold white")
     header.append(" files  ", style="dim")
-    header.append(str(result.total_dirs), style="bold white")
+    header.append(f"{approx}{result.total_dirs:,}" if estimate else str(result.total_dirs), style="bold white")
     header.append(" dirs  ", style="dim")
-    header.append(_human_size(result.total_bytes), style="bold white")
+    header.append(approx + _human_size(result.total_bytes), style="bold white")
+    if estimate is not None:
+        header.append("  estimated", style="bold yellow")
+    if result.disk is not None:
+        header.append(" apparent  ", style="dim")
+        header.append(_human_size(result.disk.allocated_bytes), style="bold white")
+        header.append(" on disk", style="dim")
 
-    console.print()
-    console.print(Rule(f"[dim]{result.root}[/dim]", style="bright_black"))
-    console.print(f"  {header}")
-    console.print()
+    parts: list = [
+        Text(), Rule(f"[dim]{escape(str(result.root))}[/dim]", style="bright_black"), Text.assemble("  ", header),
+    ]
+    if estimate is not None:
+        parts.append(_estimate_note(result))
+    if result.disk is not None and result.disk.hard_links:
+        parts.append(Text(
+            f"  {result.disk.hard_links:,} hard links counted once "
+            f"({_human_size(result.disk.hard_link_bytes)} not counted again)", style="dim",
+        ))
+    if result.skipped_mounts:
+        parts.append(Text(f"  Mount points not entered: {', '.join(result.skipped_mounts)}", style="dim"))
+    parts.append(Text())
 
     # ── languages + identity side by side ───────────────────────────
-    console.print(Columns(
+    parts.append(Columns(
         [_build_languages_panel(result), _build_identity_panel(result)],
         equal=False,
         expand=True,
     ))
 
+    # ── nested projects (monorepos) ─────────────────────────────────
+    if result.subprojects:
+        parts.append(_build_subprojects_panel(result))
+
     # ── largest files ───────────────────────────────────────────────
     if result.largest_files:
-        console.print(_build_largest_files_panel(result))
+        parts.append(_build_largest_files_panel(result))
+
+    # ── heaviest directories ────────────────────────────────────────
+    heaviest = heaviest_directories(result)
+    if heaviest:
+        parts.append(_build_heaviest_dirs_panel(heaviest))
 
-    console.print()
+    # ── duplicates (info --duplicates) ──────────────────────────────
+    if result.duplicates is not None:
+        if result.duplicates.groups:
+            parts.append(_build_duplicates_panel(result.duplicates))
+        else:
+            parts.append(Text("  No duplicate files.", style="dim"))
+
+    parts.append(Text())
+    return Group(*parts)
+
+
+def render_info(result: InfoResult, console: Console) -> None:
+    """Print the locus info output to the given console."""
+    console.print(info_renderable(result))
@@ -0,0 +1,289 @@
+"""
+Machine-readable output: `--format json|ndjson` for tree, info and overview.
+
+Everything goes out as it is produced, through a JsonWriter: records are
+serialised into a buffer that reaches the stream once it holds _BUFFER_CHARS, or
+when _FLUSH_SECONDS have passed since the last flush, so `locus tree --format
+ndjson | jq` shows its first records right away and memory stays flat whatever
+the size of the tree.
+
+ndjson: one compact JSON object per line, each with a "type":
+    tree      "root", then one "node" per line of the tree, in display order
+    info      one "directory" per scanned directory, then the "info" summary
+    overview  "scan", one "token" per generated token, then "done" with timings
+json: one document. A tree is nested ({"children": [...]} under every expanded
+folder) but still written as the walk goes.
+
+Paths are relative to the root and "/"-separated, sizes in bytes, null when
+unknown.
+"""
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import asdict
+from typing import TYPE_CHECKING, Any, TextIO
+
+from ..core.scanner import _EXTENSION_TO_LANGUAGE, DirStat, InfoResult, LanguageStat, SubProject
+
+if TYPE_CHECKING:
+    from ..core.map import LocusMap, TreeNode
+    from ..core.progress import ProgressBus
+
+FORMATS = ("text", "json", "ndjson")
+
+_BUFFER_CHARS = 64 * 1024
+_FLUSH_SECONDS = 0.1
+
+_dumps = json.JSONEncoder(separators=(",", ":")).encode
+
+
+class JsonWriter:
+    """Buffered, incremental writer of JSON text to `out`."""
+
+    def __init__(self, out: TextIO, buffer_chars: int = _BUFFER_CHARS, flush_seconds: float = _FLUSH_SECONDS) -> None:
+        self._out = out
+        self._buffer_chars = buffer_chars
+        self._flush_seconds = flush_seconds
+        self._parts: list[str] = []
+        self._size = 0
+        self._flushed = time.monotonic()
+
+    def write(self, text: str) -> None:
+        self._parts.append(text)
+        self._size += len(text)
+        if self._size >= self._buffer_chars or time.monotonic() - self._flushed >= self._flush_seconds:
+            self.flush()
+
+    def record(self, obj: dict[str, Any]) -> None:
+        """One NDJSON line."""
+        self.write(_dumps(obj) + "\n")
+
+    def document(self, obj: dict[str, Any]) -> None:
+        """One indented JSON document."""
+        self.write(json.dumps(obj, indent=2) + "\n")
+
+    def flush(self) -> None:
+        if self._parts:
+            self._out.write("".join(self._parts))
+            self._parts.clear()
+            self._size = 0
+        self._out.flush()
+        self._flushed = time.monotonic()
+
+
+# ── tree ────────────────────────────────────────────────────────────
+
+def _node_fields(node: TreeNode, path: str) -> dict[str, Any]:
+    if node.kind == "more":
+        return {"kind": "more", "depth": node.depth, "path": path, "files": node.size, "dirs": node.dirs}
+    if node.kind == "denied":
+        return {"kind": "denied", "depth": node.depth, "path": path}
+    size = node.size if node.size is not None and node.size >= 0 else None
+    return {"kind": node.kind, "depth": node.depth, "name": node.name, "path": path, "size": size}
+
+
+def write_tree(
+    locus_map: LocusMap,
+    writer: JsonWriter,
+    ndjson: bool,
+    info: InfoResult | None = None,
+    progress: ProgressBus | None = None,
+) -> None:
+    """
+    Write the tree of `locus_map` while it is walked, plus `info` (tree --stats).
+    "more" and "denied" nodes carry the path of their folder.
+    """
+    # Before the root record: a bad --rev raises here, with nothing written yet.
+    nodes = locus_map.iter_nodes(progress)
+    root = {"kind": "dir", "name": locus_map.root_name, "path": "", "root": str(locus_map.root_dir)}
+    open_dirs: list[str] = []  # names of the folders enclosing the current node
+    if ndjson:
+        writer.record({"type": "root", **root})
+        for node in nodes:
+            del open_dirs[node.depth:]
+            writer.record({"type": "node", **_node_fields(node, _node_path(open_dirs, node))})
+            if node.kind == "dir":
+                open_dirs.append(node.name)
+        if info is not None:
+            _write_info_records(info, writer)
+        writer.flush()
+        return
+
+    writer.write(_dumps(root)[:-1] + ',"children":[')
+    firsts = [True]    # per open "children" array: nothing written in it yet
+    pending = False    # the last node is a folder whose object is still open
+    for node in nodes:
+        if pending:
+            pending = False
+            if node.depth == len(firsts):  # its first child: the folder was expanded
+                writer.write(',"children":[')
+                firsts.append(True)
+            else:
+                writer.write("}")
+        while len(firsts) > node.depth + 1:
+            writer.write("]}")
+            firsts.pop()
+        del open_dirs[node.depth:]
+        if not firsts[-1]:
+            writer.write(",")
+        firsts[-1] = False
+        text = _dumps(_node_fields(node, _node_path(open_dirs, node)))
+        if node.kind == "dir":
+            writer.write(text[:-1])
+            open_dirs.append(node.name)
+            pending = True
+        else:
+            writer.write(text)
+    if pending:
+        writer.write("}")
+    writer.write("]}" * (len(firsts) - 1) + "]")
+    if info is not None:
+        writer.write(',"info":' + _dumps(info_fields(info)))
+    writer.write("}\n")
+    writer.flush()
+
+
+def _node_path(open_dirs: list[str], node: TreeNode) -> str:
+    if node.kind in ("dir", "file"):
+        return "/".join([*open_dirs, node.name])
+    return "/".join(open_dirs)
+
+
+# ── info ────────────────────────────────────────────────────────────
+
+def _rel(path: str) -> str:
+    return path.replace(os.sep, "/") if os.sep != "/" else path
+
+
+def _language_fields(ls: LanguageStat, lines: bool) -> dict[str, Any]:
+    fields: dict[str, Any] = {
+        "extension": ls.extension,
+        "language": _EXTENSION_TO_LANGUAGE.get(ls.extension),
+        "file_count": ls.file_count,
+        "total_bytes": ls.total_bytes,
+    }
+    if lines:
+        fields.update(
+            lines=ls.lines, blank_lines=ls.blank_lines, comment_lines=ls.comment_lines, code_lines=ls.code_lines,
+        )
+    return fields
+
+
+def _directory_fields(stat: DirStat) -> dict[str, Any]:
+    return {
+        "path": _rel(stat.path),
+        "total_bytes": stat.total_bytes,
+        "file_count": stat.file_count,
+        "languages": stat.languages,
+    }
+
+
+def _subproject_fields(sub: SubProject, result: InfoResult) -> dict[str, Any]:
+    stat = result.directories.get(sub.path)
+    return {
+        "path": _rel(sub.path),
+        "heuristics": asdict(sub.heuristics),
+        "total_bytes": stat.total_bytes if stat else 0,
+        "file_count": stat.file_count if stat else 0,
+        "languages": stat.languages if stat else {},
+    }
+
+
+def info_fields(result: InfoResult, directories: bool = True) -> dict[str, Any]:
+    """An InfoResult as JSON-ready data; `directories` adds every rolled-up directory."""
+    fields: dict[str, Any] = {
+        "root": str(result.root),
+        "total_files": result.total_files,
+        "total_dirs": result.total_dirs,
+        "total_bytes": result.total_bytes,
+        "sized": result.sized,
+        "lines_counted": result.lines_counted,
+        "languages": [_language_fields(ls, result.lines_counted) for ls in result.languages],
+        "largest_files": [{"path": _rel(path), "size": size} for path, size in result.largest_files],
+        "heuristics": asdict(result.heuristics),
+    }
+    if result.disk is not None:
+        fields["disk"] = asdict(result.disk)
+    if result.skipped_mounts:
+        fields["skipped_mounts"] = [_rel(path) for path in result.skipped_mounts]
+    if result.subprojects:
+        fields["subprojects"] = [_subproject_fields(sub, result) for sub in result.subprojects]
+    if result.estimate is not None:
+        fields["estimate"] = asdict(result.estimate)
+    if result.duplicates is not None:
+        fields["duplicates"] = {
+            **asdict(result.duplicates),
+            "groups": [
+                {"size": g.size, "wasted": g.wasted, "paths": [_rel(p) for p in g.paths]}
+                for g in result.duplicates.groups
+            ],
+        }
+    if directories:
+        fields["directories"] = [_directory_fields(stat) for stat in result.directories.values()]
+    return fields
+
+
+def _write_info_records(result: InfoResult, writer: JsonWriter) -> None:
+    for stat in result.directories.values():
+        writer.record({"type": "directory", **_directory_fields(stat)})
+    writer.record({"type": "info", **info_fields(result, directories=False)})
+
+
+def write_info(result: InfoResult, writer: JsonWriter, ndjson: bool) -> None:
+    if ndjson:
+        _write_info_records(result, writer)
+    else:
+        writer.document(info_fields(result))
+    writer.flush()
+
+
+# ── overview ────────────────────────────────────────────────────────
+
+class OverviewEvents:
+    """
+    Timings of `locus overview`, and its events as they happen with ndjson
+    (with json, one document once the overview is complete).
+    """
+
+    def __init__(self, writer: JsonWriter, ndjson: bool) -> None:
+        self._writer = writer
+        self._ndjson = ndjson
+        self._start = time.monotonic()
+        self._mark = self._start
+        self.timings: dict[str, float] = {}
+        self._tokens: list[str] = []
+
+    def _lap(self, name: str) -> None:
+        now = time.monotonic()
+        self.timings[name] = round(now - self._mark, 6)
+        self._mark = now
+
+    def scanned(self, result: InfoResult) -> None:
+        self._lap("scan_seconds")
+        if self._ndjson:
+            self._writer.record({
+                "type": "scan", "seconds": self.timings["scan_seconds"],
+                "total_files": result.total_files, "total_bytes": result.total_bytes if result.sized else None,
+            })
+
+    def model_ready(self) -> None:
+        self._lap("setup_seconds")
+
+    def token(self, text: str) -> None:
+        if not self._tokens:
+            self._lap("first_token_seconds")  # model load and prompt processing
+        self._tokens.append(text)
+        if self._ndjson:
+            self._writer.record({"type": "token", "text": text})
+
+    def done(self) -> None:
+        self._lap("generation_seconds")
+        self.timings["total_seconds"] = round(time.monotonic() - self._start, 6)
+        summary = {"tokens": len(self._tokens), "timings": self.timings}
+        if self._ndjson:
+            self._writer.record({"type": "done", **summary})
+        else:
+            self._writer.document({"overview": "".join(self._tokens), **summary})
+        self._writer.flush()
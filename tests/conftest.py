@@ -0,0 +1,13 @@
+import pytest
+from pathlib import Path
+
+
+@pytest.fixture(autouse=True)
+def _isolated_home(tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Point the home directory at a throwaway folder so CLI tests never write
+    scan indexes (or anything else) into the real ~/.locus.
+    """
+    home = tmp_path_factory.mktemp("home")
+    monkeypatch.setenv("HOME", str(home))
+    monkeypatch.setenv("USERPROFILE", str(home))
@@ -0,0 +1,164 @@
+import io
+import json
+import tarfile
+import zipfile
+import pytest
+from pathlib import Path
+
+from locus_cli.core.archive import ArchiveReader, iter_archive_listings
+from locus_cli.core.extractor import extract_context
+from locus_cli.core.ignore import IgnoreMatcher
+from locus_cli.core.map import LocusMap
+from locus_cli.core.scanner import Snapshot, scan
+from locus_cli.main import main
+
+
+def _make_project(root: Path) -> Path:
+    root.mkdir()
+    (root / "README.md").write_text("# Drop\n\nA source drop.\n")
+    (root / "pyproject.toml").write_text("[project]\nname = 'drop'\n")
+    (root / "main.py").write_text("import os\n# entry\n\nprint(os.name)\n")
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "core.py").write_text("y = 2\n" * 20)
+    (root / "src" / "pkg" / "util.js").write_text("let a = 1;\n")
+    (root / "tests").mkdir()
+    (root / "tests" / "test_core.py").write_text("def test(): pass\n")
+    (root / "empty").mkdir()
+    (root / ".github").mkdir()
+    (root / ".github" / "ci.yml").write_text("on: push")
+    (root / ".env").write_text("SECRET=1")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("x" * 1000)
+    return root
+
+
+def _tar(project: Path, path: Path, mode: str = "w:gz") -> Path:
+    with tarfile.open(path, mode) as tar:
+        tar.add(project, arcname=".")
+    return path
+
+
+def _zip(project: Path, path: Path) -> Path:
+    with zipfile.ZipFile(path, "w") as zf:
+        for file in sorted(project.rglob("*")):
+            zf.write(file, file.relative_to(project).as_posix() + ("/" if file.is_dir() else ""))
+    return path
+
+
+def _summary(result) -> tuple:
+    return (
+        result.total_files,
+        result.total_dirs,
+        result.total_bytes,
+        [(l.extension, l.file_count, l.total_bytes, l.code_lines) for l in result.languages],
+        sorted(result.largest_files),
+        {path: (d.file_count, d.total_bytes) for path, d in result.directories.items()},
+        result.heuristics.project_type,
+        sorted(result.heuristics.test_dirs),
+        sorted(result.heuristics.entry_points),
+        sorted(result.heuristics.config_files),
+    )
+
+
+def _tree(root: Path | str) -> list[str]:
+    lines: list[str] = []
+    LocusMap(str(root), 4).stream(lines.append, markup=False)
+    return lines[1:]  # the root line names the archive
+
+
+@pytest.fixture(params=["tar.gz", "tar", "zip"])
+def archive(request: pytest.FixtureRequest, tmp_path: Path) -> tuple[Path, Path]:
+    project = _make_project(tmp_path / "project")
+    if request.param == "zip":
+        return project, _zip(project, tmp_path / "drop.zip")
+    return project, _tar(project, tmp_path / f"drop.{request.param}", "w:gz" if request.param == "tar.gz" else "w")
+
+
+def test_archive_scan_matches_extracted(archive: tuple[Path, Path]) -> None:
+    project, path = archive
+    assert _summary(scan(path, loc=True)) == _summary(scan(project, loc=True))
+
+
+def test_archive_tree_matches_extracted(archive: tuple[Path, Path]) -> None:
+    project, path = archive
+    assert _tree(path) == _tree(project)
+
+
+def test_archive_context_matches_extracted(archive: tuple[Path, Path]) -> None:
+    project, path = archive
+    from_archive = extract_context(path, scan(path))
+    from_folder = extract_context(project, scan(project))
+    assert from_archive.readme == from_folder.readme
+    assert from_archive.snippets == from_folder.snippets
+    assert from_archive.tree_summary.splitlines()[1:] == from_folder.tree_summary.splitlines()[1:]
+
+
+def test_archive_out_of_order_members(tmp_path: Path) -> None:
+    """A directory met again after the stream left it is merged, not listed twice."""
+    path = tmp_path / "mixed.tar"
+    with tarfile.open(path, "w") as tar:
+        for name, data in [
+            ("a/one.py", b"1"), ("b/two.py", b"22"), ("a/sub/three.py", b"333"),
+            ("b/four.md", b"4444"), ("a/five.py", b"55555"), ("../escape.py", b"x"),
+        ]:
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+    listings = list(iter_archive_listings(path, IgnoreMatcher(frozenset())))
+    assert listings[-1].path == str(path) and listings[-1].dirs == ["a", "b"]
+
+    result = scan(path)
+    assert (result.total_files, result.total_dirs, result.total_bytes) == (5, 3, 15)
+    assert result.directories["a"].total_bytes == 9
+    snapshot = Snapshot.build(path)
+    assert sorted(name for name, _, _ in snapshot.list_dir(str(path / "a")).files) == ["five.py", "one.py"]
+    assert _tree(path) == [
+        "├── a/", "│   ├── sub/", "│   │   └── three.py (3 bytes)", "│   ├── five.py (5 bytes)",
+        "│   └── one.py (1 byte)", "└── b/", "    ├── four.md (4 bytes)", "    └── two.py (2 bytes)",
+    ]
+
+
+def test_archive_reader_keeps_the_summary_entries_only(tmp_path: Path) -> None:
+    path = tmp_path / "wide.zip"
+    with zipfile.ZipFile(path, "w") as zf:
+        for i in range(100):
+            zf.writestr(f"src/m{i:03}.py", "x")
+        zf.writestr("src/z/deep.py", "x")
+        zf.writestr("README.md", "# Wide\n")
+    reader = ArchiveReader(path)
+    assert reader.is_file("README.md") and not reader.is_file("src")
+    assert reader.read_text("README.md") == "# Wide\n"
+    entries = reader.list_dir("src")
+    assert entries is not None and len(entries) == 16 and entries[0] == ("z", True)
+
+
+def test_corrupt_archive(tmp_path: Path) -> None:
+    path = tmp_path / "broken.tar.gz"
+    path.write_bytes(b"not an archive")
+    with pytest.raises(ValueError, match="cannot read archive"):
+        scan(path)
+
+
+def test_cli_info_archive(archive: tuple[Path, Path], capsys: pytest.CaptureFixture[str]) -> None:
+    project, path = archive
+    assert main(["info", str(path), "--format", "json"]) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert document["total_files"] == scan(project).total_files
+
+    assert main(["info", str(path), "--duplicates"]) == 1
+    assert "not with an archive" in capsys.readouterr().out
+    assert main(["tree", str(path), "--rev", "HEAD"]) == 1
+    assert "not an archive" in capsys.readouterr().out
+
+
+def test_archive_subproject_context(tmp_path: Path) -> None:
+    project = _make_project(tmp_path / "project")
+    (project / "web").mkdir()
+    (project / "web" / "package.json").write_text('{"name": "web"}')
+    (project / "web" / "README.md").write_text("# Web\n")
+    path = _tar(project, tmp_path / "drop.tgz")
+    result = scan(path)
+    (sub,) = result.subprojects
+    ctx = extract_context(path, result, subproject=sub)
+    assert ctx.project_type == "Node.js Project" and ctx.readme == "# Web\n"
+    assert ctx.snippets == [("package.json", '{"name": "web"}')]
@@ -0,0 +1,52 @@
+import asyncio
+from pathlib import Path
+
+from textual.widgets import Tree
+
+from locus_cli.core.cache import ScanIndex
+from locus_cli.core.scanner import scan
+from locus_cli.ui.browse_app import BrowseApp
+
+
+def _make_project(root: Path) -> None:
+    (root / "main.py").write_text("x = 1")
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "core.py").write_text("y" * 100)
+    (root / "node_modules").mkdir()
+
+
+def _labels(node) -> list[str]:
+    return [str(child.label) for child in node.children]
+
+
+def test_browse_lists_folders_lazily_and_opens_files(tmp_path: Path) -> None:
+    _make_project(tmp_path)
+    index = ScanIndex.open(tmp_path, tmp_path / ".locus")
+    scan(tmp_path, index=index)  # gives the index the folder sizes
+    app = BrowseApp(tmp_path, index=index)
+
+    async def drive() -> None:
+        async with app.run_test() as pilot:
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            root = app.query_one(Tree).root
+            assert _labels(root) == ["src (100 bytes)", "main.py (5 bytes)"]
+            src = root.children[0]
+            assert src.data.loaded is False  # nothing below the root listed yet
+
+            src.expand()
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            assert src.data.loaded
+            pkg = src.children[0]
+            assert _labels(src) == ["pkg (100 bytes)"]
+            pkg.expand()
+            await pilot.pause()
+            await app.workers.wait_for_complete()
+            await pilot.pause()
+            app.query_one(Tree).select_node(pkg.children[0])
+            await pilot.pause()
+
+    asyncio.run(drive())
+    assert app.return_value == tmp_path / "src" / "pkg" / "core.py"
@@ -0,0 +1,223 @@
+import os
+import pytest
+from pathlib import Path
+
+from locus_cli.core.cache import ScanIndex, clear_indexes, index_dir
+from locus_cli.core.map import LocusMap
+from locus_cli.core.scanner import scan
+
+
+def _make_project(root: Path) -> None:
+    (root / "pyproject.toml").write_text("[project]\nname = 'test'")
+    (root / "main.py").write_text("x = 1")
+    (root / "src").mkdir()
+    (root / "src" / "core.py").write_text("y = 2" * 10)
+    (root / "src" / "nested").mkdir()
+    (root / "src" / "nested" / "util.js").write_text("z")
+
+
+def _age(root: Path) -> None:
+    """Push every directory mtime into the past so the racy-mtime guard does not apply."""
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, ns=(1_000_000_000, 1_000_000_000))
+
+
+def test_cached_scan_matches_uncached(tmp_path: Path) -> None:
+    """A scan served from the index must equal a fresh scan."""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    _age(project)
+    locus_dir = tmp_path / "locus"
+
+    first = scan(project, index=ScanIndex.open(project, locus_dir))
+    index = ScanIndex.open(project, locus_dir)
+    second = scan(project, index=index)
+
+    assert second == first == scan(project)
+    assert index.misses == 0
+    assert index.hits == 3  # root, src, src/nested
+
+
+def test_index_relists_only_changed_directories(tmp_path: Path) -> None:
+    """Only a directory whose mtime changed is listed again."""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    _age(project)
+    locus_dir = tmp_path / "locus"
+    scan(project, index=ScanIndex.open(project, locus_dir))
+
+    (project / "src" / "new.py").write_text("n = 1")
+    os.utime(project / "src", ns=(2_000_000_000, 2_000_000_000))
+
+    index = ScanIndex.open(project, locus_dir)
+    result = scan(project, index=index)
+    assert index.misses == 1
+    assert result.total_files == 5
+
+
+def test_recently_modified_directory_is_not_trusted(tmp_path: Path) -> None:
+    """A directory modified just before listing must be re-listed on the next run."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text("x")
+    locus_dir = tmp_path / "locus"
+    scan(project, index=ScanIndex.open(project, locus_dir))
+
+    index = ScanIndex.open(project, locus_dir)
+    scan(project, index=index)
+    assert index.misses == 1
+
+
+def test_corrupt_index_is_ignored(tmp_path: Path) -> None:
+    """A damaged index file must be treated as empty, never crash the scan."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text("x")
+    index = ScanIndex.open(project, tmp_path)
+    index.file.parent.mkdir(parents=True)
+    index.file.write_bytes(b"LCSI garbage")
+
+    result = scan(project, index=ScanIndex.open(project, tmp_path))
+    assert result.total_files == 1
+
+
+def test_index_drops_deleted_directories(tmp_path: Path) -> None:
+    """Directories that disappeared are pruned from the index when it is saved."""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    _age(project)
+    scan(project, index=ScanIndex.open(project, tmp_path))
+    assert len(ScanIndex.open(project, tmp_path)) == 3
+
+    for f in (project / "src" / "nested").iterdir():
+        f.unlink()
+    (project / "src" / "nested").rmdir()
+    scan(project, index=ScanIndex.open(project, tmp_path))
+    assert len(ScanIndex.open(project, tmp_path)) == 2
+
+
+def test_tree_uses_index(tmp_path: Path) -> None:
+    """LocusMap must populate and reuse the same index as scan()."""
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    _age(project)
+    scan(project, index=ScanIndex.open(project, tmp_path))
+
+    index = ScanIndex.open(project, tmp_path)
+    tree = LocusMap(project, max_depth=4, index=index).generate()
+    labels = [str(c.label) for c in tree.children]
+    assert any("src" in label for label in labels)
+    assert index.misses == 0
+
+
+def test_clear_indexes(tmp_path: Path) -> None:
+    """clear_indexes() removes every index file and reports the count."""
+    project = tmp_path / "project"
+    project.mkdir()
+    (project / "a.py").write_text("x")
+    scan(project, index=ScanIndex.open(project, tmp_path))
+    assert clear_indexes(tmp_path) == 1
+    assert list(index_dir(tmp_path).glob("*.idx")) == []
+
+
+def test_full_cli_wiring_cache_clear_and_no_cache(tmp_path: Path) -> None:
+    """`locus info --no-cache` writes no index; `locus cache clear` returns 0."""
+    from locus_cli.main import main
+    (tmp_path / "a.py").write_text("x")
+    assert main(["info", str(tmp_path), "--no-cache"]) == 0
+    assert not index_dir(Path.home() / ".locus").exists()
+    assert main(["info", str(tmp_path)]) == 0
+    assert len(list(index_dir(Path.home() / ".locus").glob("*.idx"))) == 1
+    assert main(["cache", "clear"]) == 0
+    assert list(index_dir(Path.home() / ".locus").glob("*.idx")) == []
+
+
+def test_snapshot_from_index_gives_rollups_without_listing(tmp_path: Path, monkeypatch) -> None:
+    """Folder totals can be rebuilt from the index alone, matching a real scan."""
+    from locus_cli.core import scanner
+    from locus_cli.core.scanner import Snapshot
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    index = ScanIndex.open(project, tmp_path / "locus")
+    expected = scan(project, index=index).directories
+
+    monkeypatch.setattr(scanner, "_list_dir", lambda *a, **k: pytest.fail("listed a directory"))
+    snapshot = Snapshot.from_index(project, index)
+    assert scan(project, snapshot=snapshot).directories == expected
+    assert index.peek(str(project / "missing")) is None
+
+
+def test_cli_scans_do_not_create_model_dirs(tmp_path: Path) -> None:
+    """tree and info only ever write the index file under ~/.locus."""
+    from locus_cli.main import main
+    (tmp_path / "project").mkdir()
+    _make_project(tmp_path / "project")
+    home = Path(os.environ["HOME"])
+    assert main(["info", str(tmp_path / "project")]) == 0
+    assert main(["tree", str(tmp_path / "project")]) == 0
+    assert [p.name for p in (home / ".locus").iterdir()] == ["index"]
+
+
+def test_cli_scans_survive_unusable_home(tmp_path: Path, monkeypatch) -> None:
+    """A home directory the index cannot be written to must not break a scan."""
+    from locus_cli.main import main
+    (tmp_path / "project").mkdir()
+    _make_project(tmp_path / "project")
+    not_a_dir = tmp_path / "home-file"
+    not_a_dir.write_text("")
+    monkeypatch.setenv("HOME", str(not_a_dir))
+    assert main(["info", str(tmp_path / "project")]) == 0
+    assert main(["tree", str(tmp_path / "project")]) == 0
+
+
+def test_tree_index_listings_skip_stat(tmp_path: Path, monkeypatch) -> None:
+    """With the index on, tree still stats only displayed files; info then gets real sizes."""
+    project = tmp_path / "project"
+    project.mkdir()
+    for i in range(20):
+        (project / f"f{i:02d}.txt").write_text("x" * i)
+    _age(project)
+    locus_dir = tmp_path / "locus"
+
+    stated: list[str] = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda p, *a, **k: stated.append(os.fspath(p)) or real_stat(p, *a, **k))
+    tree_index = ScanIndex.open(project, locus_dir)
+    list(LocusMap(project, max_depth=2, max_files=3, index=tree_index).iter_nodes())
+    monkeypatch.undo()
+    assert len([p for p in stated if p.endswith(".txt")]) == 3
+
+    index = ScanIndex.open(project, locus_dir)
+    assert scan(project, index=index).total_bytes == sum(range(20))
+    assert index.misses == 1  # the size-less entry is not served to info
+    again = ScanIndex.open(project, locus_dir)
+    list(LocusMap(project, max_depth=2, index=again).iter_nodes())
+    assert again.hits == 1  # a sized entry serves tree too
+
+
+def test_index_keeps_sources_apart(tmp_path: Path) -> None:
+    """Sizes cached by a git-index scan are not served to a filesystem scan, and back."""
+    import shutil
+    import subprocess
+    if shutil.which("git") is None:
+        pytest.skip("git is not installed")
+    project = tmp_path / "project"
+    project.mkdir()
+    _make_project(project)
+    subprocess.run(["git", "init", "-q"], cwd=project, check=True)
+    subprocess.run(["git", "add", "."], cwd=project, check=True)
+    _age(project)
+    locus_dir = tmp_path / "locus"
+
+    scan(project, index=ScanIndex.open(project, locus_dir), source="git-index")
+    index = ScanIndex.open(project, locus_dir)
+    assert scan(project, index=index, source="fs") == scan(project)
+    assert index.hits == 0
+    index = ScanIndex.open(project, locus_dir)
+    scan(project, index=index, source="fs")
+    assert index.misses == 0
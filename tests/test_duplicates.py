@@ -0,0 +1,74 @@
+import json
+import os
+import pytest
+from pathlib import Path
+
+from locus_cli.core import duplicates
+from locus_cli.core.duplicates import find_duplicates
+from locus_cli.core.scanner import scan
+from locus_cli.main import main
+
+
+def _make_tree(root: Path) -> None:
+    big = os.urandom(20_000)
+    (root / "third" / "a").mkdir(parents=True)
+    (root / "third" / "b").mkdir(parents=True)
+    for copy in ("third/a/lib.js", "third/b/lib.js", "lib.js"):
+        (root / copy).write_bytes(big)
+    # Same size and same head and tail as the copies, different middle.
+    (root / "near.js").write_bytes(big[:10_000] + bytes(1) + big[10_001:])
+    (root / "small1.txt").write_text("same small text")
+    (root / "small2.txt").write_text("same small text")
+    (root / "other.txt").write_text("same small TEXT")  # same size, different contents
+    (root / "empty1.py").write_text("")
+    (root / "empty2.py").write_text("")
+
+
+@pytest.mark.parametrize("jobs", [1, 0])
+def test_find_duplicates(tmp_path: Path, jobs: int) -> None:
+    _make_tree(tmp_path)
+    report = find_duplicates(scan(tmp_path, keep_files=True), jobs=jobs)
+    assert [(g.size, g.paths) for g in report.groups] == [
+        (20_000, ["lib.js", os.path.join("third", "a", "lib.js"), os.path.join("third", "b", "lib.js")]),
+        (15, ["small1.txt", "small2.txt"]),
+    ]
+    assert report.wasted_bytes == 2 * 20_000 + 15
+    # Stages: empty files never considered; the small copies are settled by their
+    # sample, and only the 20 kB files go on to a full hash.
+    assert report.same_size == 7
+    assert report.same_sample == 6
+
+
+def test_only_survivors_are_read_in_full(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    _make_tree(tmp_path)
+    (tmp_path / "unique.bin").write_bytes(os.urandom(20_000)[:-1] + b"x")  # same size, other head
+    hashed: list[str] = []
+    full_hash = duplicates._full_hash
+    monkeypatch.setattr(duplicates, "_full_hash", lambda path: hashed.append(path) or full_hash(path))
+    find_duplicates(scan(tmp_path, keep_files=True), jobs=1)
+    assert not any(path.endswith("unique.bin") for path in hashed)
+    assert len(hashed) == 4
+
+
+def test_hard_links_are_not_duplicates(tmp_path: Path) -> None:
+    (tmp_path / "a.txt").write_text("linked contents")
+    os.link(tmp_path / "a.txt", tmp_path / "b.txt")
+    assert find_duplicates(scan(tmp_path, keep_files=True)).groups == []
+
+
+def test_find_duplicates_needs_file_table(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        find_duplicates(scan(tmp_path))
+
+
+def test_cli_info_duplicates(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    _make_tree(tmp_path)
+    assert main(["info", str(tmp_path), "--duplicates"]) == 0
+    out = " ".join(capsys.readouterr().out.split())
+    assert "Duplicates 40.0 kB wasted in 2 groups" in out
+    assert "3 × 20.0 kB" in out
+
+    assert main(["info", str(tmp_path), "--duplicates", "--format", "json"]) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert document["duplicates"]["wasted_bytes"] == 40_015
+    assert document["duplicates"]["groups"][1] == {"size": 15, "wasted": 15, "paths": ["small1.txt", "small2.txt"]}
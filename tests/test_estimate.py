@@ -0,0 +1,86 @@
+import json
+import random
+import pytest
+from pathlib import Path
+
+from locus_cli.core.estimate import Budget, estimate
+from locus_cli.core.scanner import scan
+from locus_cli.main import main
+
+
+def _make_tree(root: Path, depth: int = 3, seed: int = 7) -> None:
+    """An irregular tree: every folder has 0-12 files and 1-4 subfolders down to `depth`."""
+    rng = random.Random(seed)
+
+    def fill(path: Path, level: int) -> None:
+        path.mkdir(exist_ok=True)
+        for f in range(rng.randint(0, 12)):
+            ext = rng.choice([".py", ".js", ".md"])
+            (path / f"f{f}{ext}").write_text("x" * rng.randint(0, 300))
+        if level < depth:
+            for d in range(rng.randint(1, 4)):
+                fill(path / f"d{d}", level + 1)
+
+    fill(root, 0)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2s", Budget(seconds=2.0)),
+    ("1.5s", Budget(seconds=1.5)),
+    ("500ms", Budget(seconds=0.5)),
+    ("20000", Budget(listings=20000)),
+])
+def test_budget_parse(text: str, expected: Budget) -> None:
+    assert Budget.parse(text) == expected
+
+
+@pytest.mark.parametrize("text", ["", "2m", "0", "1.5", "0s", "-1s"])
+def test_budget_parse_rejects(text: str) -> None:
+    with pytest.raises(ValueError):
+        Budget.parse(text)
+
+
+def test_estimate_is_exact_when_the_walk_fits(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    result = estimate(tmp_path, Budget(listings=10_000))
+    assert result.estimate is None
+    assert result == scan(tmp_path)
+
+
+def test_estimate_is_reproducible_from_seed_and_listings(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    first = estimate(tmp_path, Budget(listings=20), seed=3)
+    again = estimate(tmp_path, Budget(listings=20), seed=3)
+    assert first.estimate is not None
+    assert first.estimate == again.estimate
+    assert (first.total_files, first.total_dirs, first.total_bytes) == (
+        again.total_files, again.total_dirs, again.total_bytes,
+    )
+
+
+def test_estimate_intervals_hold_the_true_totals(tmp_path: Path) -> None:
+    _make_tree(tmp_path, depth=4)
+    exact = scan(tmp_path)
+    result = estimate(tmp_path, Budget(listings=60), seed=1)
+    e = result.estimate
+    assert e is not None and e.frontier > 0 and e.probes >= 30
+    assert e.exact_dirs <= 30
+    assert e.files[0] <= exact.total_files <= e.files[1]
+    assert e.dirs[0] <= exact.total_dirs <= e.dirs[1]
+    assert e.bytes[0] <= exact.total_bytes <= e.bytes[1]
+    assert set(e.languages) == {ls.extension for ls in result.languages}
+    assert result.directories == {}
+
+
+def test_cli_info_budget(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    _make_tree(tmp_path, depth=4)
+    assert main(["info", str(tmp_path), "--budget", "40", "--seed", "2", "--format", "json"]) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert document["estimate"]["listings"] == 40 and document["estimate"]["seed"] == 2
+
+    assert main(["info", str(tmp_path), "--budget", "40", "--seed", "2"]) == 0
+    out = " ".join(capsys.readouterr().out.split())
+    assert "estimated" in out and "--budget 40 --seed 2" in out
+
+    assert main(["info", str(tmp_path), "--budget", "40", "--loc"]) == 1
+    assert "--budget" in capsys.readouterr().out
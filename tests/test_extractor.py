@@ -133,4 +133,23 @@ def test_extract_context_no_snippets_on_empty_dir(tmp_path: Path) -> None:
     """With no entry points or manifest, snippets should be empty."""
     result = scan(tmp_path)
     ctx = extract_context(tmp_path, result)
-    assert ctx.snippets == []
\ No newline at end of file
+    assert ctx.snippets == []
+
+def test_extract_context_for_subproject(tmp_path: Path) -> None:
+    """A sub-project gets its own type, language, README, snippets and tree."""
+    _make_project(tmp_path)
+    web = tmp_path / "packages" / "web"
+    (web / "src").mkdir(parents=True)
+    (web / "package.json").write_text('{"name": "web"}')
+    (web / "README.md").write_text("# Web\n")
+    (web / "index.ts").write_text("export const x = 1;\n")
+    (web / "src" / "a.ts").write_text("let a = 1;\n")
+    result = scan(tmp_path)
+    (sub,) = result.subprojects
+    ctx = extract_context(tmp_path, result, subproject=sub)
+    assert ctx.project_type == "Node.js Project"
+    assert ctx.primary_language == "TypeScript"
+    assert ctx.readme == "# Web\n"
+    assert [name for name, _ in ctx.snippets] == ["index.ts", "package.json"]
+    assert ctx.tree_summary.splitlines()[:2] == ["web/", "  src/"]
+    assert extract_context(tmp_path, result).project_type == "Python Package"
@@ -0,0 +1,85 @@
+import os
+import pytest
+from pathlib import Path
+
+from locus_cli.core import filetable
+from locus_cli.core.filetable import FileTable
+from locus_cli.core.scanner import FileEntry, scan
+
+
+def _make_tree(root: Path) -> None:
+    (root / "pyproject.toml").write_text("[project]")
+    (root / "main.py").write_text("x" * 50)
+    for d in range(6):
+        sub = root / f"pkg{d}" / "inner"
+        sub.mkdir(parents=True)
+        for f in range(8):
+            (sub / f"mod{f}.py").write_text("y" * (d * 10 + f))
+            (sub / f"data{f}.json").write_text("{}")
+    (root / "tie_a.bin").write_bytes(b"\x00" * 57)
+    (root / "tie_b.bin").write_bytes(b"\x00" * 57)
+
+
+@pytest.fixture(params=["numpy", "fallback"])
+def backend(request: pytest.FixtureRequest, monkeypatch: pytest.MonkeyPatch) -> str:
+    if request.param == "numpy":
+        pytest.importorskip("numpy")
+    else:
+        monkeypatch.setattr(filetable, "_numpy", lambda: None)
+    return request.param
+
+
+def test_keep_files_gives_same_summaries(tmp_path: Path, backend: str) -> None:
+    """Languages and largest files derived from the table match the streaming fold."""
+    _make_tree(tmp_path)
+    streamed = scan(tmp_path)
+    kept = scan(tmp_path, keep_files=True)
+    assert streamed.files is None
+    assert kept.files is not None and len(kept.files) == kept.total_files
+    assert kept == streamed  # `files` is excluded from comparison
+    assert kept.largest_files == streamed.largest_files
+
+
+def test_rows_round_trip(tmp_path: Path) -> None:
+    _make_tree(tmp_path)
+    table = scan(tmp_path, keep_files=True).files
+    assert table is not None
+    paths = {table.path(i) for i in range(len(table))}
+    assert os.path.join("pkg3", "inner", "mod7.py") in paths
+    i = next(i for i in range(len(table)) if table.path(i) == os.path.join("pkg3", "inner", "mod7.py"))
+    assert (table.name(i), table.size[i], table.depth(i)) == ("mod7.py", 37, 2)
+    assert table.exts[table.ext_id[i]] == ".py"
+    assert table.mtime[i] == int((tmp_path / "pkg3" / "inner" / "mod7.py").stat().st_mtime)
+
+
+def test_size_percentiles(backend: str) -> None:
+    table = FileTable()
+    for size in range(1, 101):
+        table.add(FileEntry(f"f{size}", f"f{size}", "", size, 0, -1.0))
+    assert table.size_percentiles([0, 50, 90, 100]) == [1, 50, 90, 100]
+    assert FileTable().size_percentiles([50]) == [0]
+
+
+def test_memory_per_file_is_compact() -> None:
+    """Columns plus names stay under 40 bytes per file for typical names."""
+    table = FileTable()
+    for d in range(100):
+        for f in range(1000):
+            name = f"module_{f:05d}.py"  # 15 bytes
+            table.add(FileEntry(os.path.join(f"dir{d}", name), name, ".py", f, 1, 1.7e9))
+    assert len(table) == 100_000
+    assert table.nbytes / len(table) < 40
+    assert len(table.dirs) == 100
+
+
+def test_many_extensions(backend: str) -> None:
+    """Extension ids go past 65,535 (one per generated file name) with the columns in step."""
+    table = FileTable()
+    count = 70_000
+    for i in range(count):
+        table.add(FileEntry(f"f.x{i}", f"f.x{i}", f".x{i}", 1, 0, -1.0))
+    assert len(table.exts) == count + 1
+    assert len(table.ext_id) == len(table.size) == len(table.dir_id) == len(table.mtime) == count
+    assert table.exts[table.ext_id[count - 1]] == f".x{count - 1}"
+    languages = table.languages()
+    assert len(languages) == count and languages[-1].extension == f".x{count - 1}"
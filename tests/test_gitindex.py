@@ -0,0 +1,122 @@
+import shutil
+import subprocess
+import pytest
+from pathlib import Path
+
+from locus_cli.core.gitindex import GitIndexLister, find_git_dir, parse_index, read_tracked
+from locus_cli.core.map import LocusMap
+from locus_cli.core.scanner import scan
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(["git", *args], cwd=repo, check=True, capture_output=True)
+
+
+def _make_repo(root: Path, version: int = 2) -> Path:
+    _git(root, "init", "-q")
+    (root / "pyproject.toml").write_text("[project]\nname = 'test'")
+    (root / "main.py").write_text("x = 1\n")
+    (root / "src").mkdir()
+    (root / "src" / "core.py").write_text("y = 2\n" * 20)
+    (root / "src" / "deep").mkdir()
+    (root / "src" / "deep" / "very_long_module_name_for_prefix_compression.py").write_text("z")
+    (root / "src" / "deep" / "very_long_module_name_for_prefix_compression_2.py").write_text("zz")
+    _git(root, "add", ".")
+    _git(root, "update-index", "--index-version", str(version))
+    return root
+
+
+@pytest.mark.parametrize("version", [2, 3, 4])
+def test_parse_index_versions(tmp_path: Path, version: int) -> None:
+    """Paths and sizes must decode identically for every supported index version."""
+    repo = _make_repo(tmp_path, version)
+    entries = {path: size for path, _, size in parse_index((repo / ".git" / "index").read_bytes())}
+    assert entries == {
+        "main.py": 6,
+        "pyproject.toml": 23,
+        "src/core.py": 120,
+        "src/deep/very_long_module_name_for_prefix_compression.py": 1,
+        "src/deep/very_long_module_name_for_prefix_compression_2.py": 2,
+    }
+
+
+def test_parse_index_rejects_garbage() -> None:
+    with pytest.raises(ValueError):
+        list(parse_index(b"NOPE" + b"\0" * 40))
+
+
+def test_read_tracked_groups_by_directory(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    tracked = read_tracked(repo / ".git")
+    assert set(tracked) == {"", "src", "src/deep"}
+    assert tracked["src"] == {"core.py": 120}
+
+
+def test_git_index_scan_matches_filesystem_scan(tmp_path: Path) -> None:
+    """Tracked sizes come from the index, untracked files from the disk: same totals."""
+    repo = _make_repo(tmp_path)
+    (repo / "src" / "untracked.py").write_text("new")
+    (repo / "notes").mkdir()
+    (repo / "notes" / "todo.md").write_text("- a")
+    assert scan(repo, source="git-index") == scan(repo, source="fs")
+
+
+def test_git_index_lister_checks_entries_against_the_file(tmp_path: Path) -> None:
+    """An entry whose size or mtime no longer matches the file is stale: the disk wins."""
+    repo = _make_repo(tmp_path)
+    lister = GitIndexLister.open(repo)
+    assert lister.tracked[""]["main.py"][0] == 6
+    (repo / "main.py").write_text("x = 1\n" * 100)
+    listing = lister.list_dir(str(repo))
+    assert {name: size for name, size, _ in listing.files}["main.py"] == 600
+    assert scan(repo, source="auto") == scan(repo, source="fs")
+
+
+def test_auto_source_without_git_uses_filesystem(tmp_path: Path) -> None:
+    (tmp_path / "a.py").write_text("x")
+    assert find_git_dir(tmp_path) is None
+    assert scan(tmp_path, source="auto").total_files == 1
+    with pytest.raises(ValueError):
+        scan(tmp_path, source="git-index")
+
+
+def test_tree_from_git_index(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    tree = LocusMap(repo, max_depth=3, source="git-index").generate()
+    labels = [str(c.label) for c in tree.children]
+    assert any("main.py" in label for label in labels)
+    assert any("src" in label for label in labels)
+
+
+def test_parse_index_v3_extended_flags(tmp_path: Path) -> None:
+    """Intent-to-add entries carry extended flags (two extra bytes) in v3 indexes."""
+    repo = _make_repo(tmp_path, 3)
+    (repo / "later.py").write_text("later")
+    _git(repo, "add", "-N", "later.py")
+    _git(repo, "update-index", "--index-version", "3")
+    data = (repo / ".git" / "index").read_bytes()
+    assert data[4:8] == b"\0\0\0\x03"
+    paths = [path for path, _, _ in parse_index(data)]
+    assert paths == sorted(paths)
+    assert "later.py" in paths and "src/core.py" in paths
+
+
+def test_cli_default_source_sees_unstaged_edits(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """The index keeps the size of the last `git add`: the default auto source sees edits made since."""
+    from locus_cli.main import main
+    repo = _make_repo(tmp_path)
+    (repo / "main.py").write_text("x" * 100_000)
+    assert main(["tree", str(repo)]) == 0
+    assert "main.py (100.0 kB)" in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("command", ["tree", "info"])
+def test_cli_git_index_source_without_git(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], command: str,
+) -> None:
+    from locus_cli.main import main
+    (tmp_path / "a.py").write_text("x")
+    assert main([command, str(tmp_path), "--source", "git-index"]) == 1
+    assert "has no readable .git/index" in " ".join(capsys.readouterr().out.split())
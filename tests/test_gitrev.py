@@ -0,0 +1,159 @@
+import shutil
+import subprocess
+import pytest
+from pathlib import Path
+
+from locus_cli.core.extractor import extract_context
+from locus_cli.core.gitrev import GitRevReader
+from locus_cli.core.map import LocusMap
+from locus_cli.core.scanner import scan
+
+pytestmark = pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+
+
+def _git(repo: Path, *args: str) -> None:
+    subprocess.run(
+        ["git", "-c", "user.name=t", "-c", "user.email=t@t", *args],
+        cwd=repo, check=True, capture_output=True,
+    )
+
+
+def _make_repo(root: Path) -> Path:
+    _git(root, "init", "-q")
+    (root / "README.md").write_text("# Old readme\n")
+    (root / "pyproject.toml").write_text("[project]\nname = 'test'")
+    (root / "main.py").write_text("print('v1')\n")
+    (root / "src").mkdir()
+    (root / "src" / "core.py").write_text("y = 2\n" * 20)
+    (root / "src" / "with space.py").write_text("s")
+    (root / "tests").mkdir()
+    (root / "tests" / "test_core.py").write_text("def test(): pass\n")
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("x" * 1000)
+    _git(root, "add", ".")
+    _git(root, "commit", "-q", "-m", "v1")
+    return root
+
+
+def _summary(result) -> tuple:
+    return (
+        result.total_files,
+        result.total_dirs,
+        result.total_bytes,
+        [(l.extension, l.file_count, l.total_bytes) for l in result.languages],
+        sorted(result.largest_files),
+        result.heuristics.project_type,
+        sorted(result.heuristics.test_dirs),
+        sorted(result.heuristics.entry_points),
+    )
+
+
+def test_rev_scan_matches_checkout(tmp_path: Path) -> None:
+    """Scanning HEAD must give the same result as scanning a clean checkout of it."""
+    repo = _make_repo(tmp_path)
+    assert _summary(scan(repo, rev="HEAD")) == _summary(scan(repo, source="fs"))
+
+
+def test_rev_scan_ignores_work_tree_changes(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    (repo / "main.py").write_text("print('v2')\n" * 100)
+    (repo / "src" / "new.py").write_text("new")
+    (repo / "lib").mkdir()
+    (repo / "lib" / "x.py").write_text("x")
+
+    result = scan(repo, rev="HEAD")
+    assert result.total_files == 6
+    assert result.total_dirs == 2  # src, tests (node_modules is ignored)
+    assert ("main.py", 12) in result.largest_files
+
+
+def test_rev_scan_old_commit(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    (repo / "docs").mkdir()
+    (repo / "docs" / "guide.md").write_text("guide")
+    _git(repo, "add", ".")
+    _git(repo, "commit", "-q", "-m", "v2")
+
+    assert scan(repo, rev="HEAD").total_files == 7
+    assert scan(repo, rev="HEAD~1").total_files == 6
+
+
+def test_rev_scan_applies_ignore_patterns(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    result = scan(repo, ignore=["tests", "*.toml"], rev="HEAD")
+    assert result.total_files == 4
+    assert result.heuristics.test_dirs == []
+
+
+def test_rev_scan_of_subdirectory(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    result = scan(repo / "src", rev="HEAD")
+    assert result.total_files == 2
+    assert result.total_dirs == 0
+
+
+def test_rev_scan_unknown_revision(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    with pytest.raises(ValueError):
+        scan(repo, rev="does-not-exist")
+
+
+def test_rev_reader(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    (repo / "README.md").write_text("# New readme\n")
+    with GitRevReader(repo, "HEAD") as reader:
+        assert reader.is_file("README.md")
+        assert not reader.is_file("src")
+        assert not reader.is_file("missing file.txt")
+        assert reader.read_text("README.md") == "# Old readme\n"
+        assert reader.read_text("src/with space.py") == "s"
+        assert reader.read_lines("src/core.py", 3) == ["y = 2\n"] * 3
+        assert sorted(reader.list_dir("src")) == [("core.py", False), ("with space.py", False)]
+        assert ("src", True) in reader.list_dir("")
+        assert reader.list_dir("nope") is None
+
+
+def test_extract_context_from_rev(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    (repo / "README.md").write_text("# New readme\n")
+    (repo / "main.py").write_text("print('v2')\n")
+    result = scan(repo, rev="HEAD")
+    with GitRevReader(repo, "HEAD") as reader:
+        ctx = extract_context(repo, result, reader)
+    assert "Old readme" in ctx.readme
+    assert ("main.py", "print('v1')\n") in ctx.snippets
+    assert "  src/" in ctx.tree_summary
+    assert "    core.py" in ctx.tree_summary
+
+
+def test_tree_from_rev(tmp_path: Path) -> None:
+    from rich.console import Console
+    repo = _make_repo(tmp_path)
+    (repo / "untracked_dir").mkdir()
+    (repo / "untracked.py").write_text("u")
+
+    tree = LocusMap(repo, max_depth=2, rev="HEAD").generate()
+    console = Console(record=True, width=120)
+    console.print(tree)
+    text = console.export_text()
+    assert "core.py" in text
+    assert "test_core.py" in text
+    assert "untracked" not in text
+    assert "node_modules" not in text
+
+
+def test_rev_scan_counts_lines_of_blobs(tmp_path: Path) -> None:
+    repo = _make_repo(tmp_path)
+    (repo / "src" / "core.py").write_text("changed\n")
+    by_ext = {ls.extension: ls.code_lines for ls in scan(repo, rev="HEAD", loc=True).languages}
+    assert by_ext[".py"] == 20 + 1 + 1 + 1  # core.py, main.py, with space.py, test_core.py
+
+
+@pytest.mark.parametrize("command", [["tree"], ["tree", "--stats"], ["info"], ["overview"]])
+def test_cli_unknown_revision(tmp_path: Path, capsys: pytest.CaptureFixture[str], command: list[str]) -> None:
+    """A bad --rev is an error message and exit status 1, not a traceback or a partial tree."""
+    from locus_cli.main import main
+    repo = _make_repo(tmp_path)
+    assert main([command[0], str(repo), "--rev", "no-such-rev", *command[1:]]) == 1
+    out = " ".join(capsys.readouterr().out.split())
+    assert out.startswith("Error: git ls-tree 'no-such-rev' failed")
@@ -0,0 +1,79 @@
+import pytest
+from pathlib import Path
+from locus_cli.core.ignore import GlobSet, IgnoreMatcher, read_gitignore
+
+
+def _matcher(*lines: str) -> IgnoreMatcher:
+    return IgnoreMatcher().extend("", lines)
+
+
+# ---------------------------------------------------------------------------
+# Pattern grammar
+# ---------------------------------------------------------------------------
+
+@pytest.mark.parametrize("pattern, rel_dir, name, is_dir, expected", [
+    ("*.log",        "",        "debug.log",    False, True),
+    ("*.log",        "a/b",     "debug.log",    False, True),   # unanchored: any depth
+    ("*.log",        "",        "debug.txt",    False, False),
+    ("build-*/",     "",        "build-x86",    True,  True),
+    ("build-*/",     "",        "build-x86",    False, False),  # directory-only pattern
+    ("/dist",        "",        "dist",         True,  True),
+    ("/dist",        "pkg",     "dist",         True,  False),  # anchored to the root
+    ("docs/out",     "",        "out",          True,  False),
+    ("docs/out",     "docs",    "out",          True,  True),
+    ("**/cache",     "x/y",     "cache",        True,  True),
+    ("a/**/b",       "a/x/y",   "b",            False, True),
+    ("a/**/b",       "a",       "b",            False, True),   # ** matches zero dirs
+    ("logs/**",      "logs",    "today.txt",    False, True),
+    ("file?.txt",    "",        "file1.txt",    False, True),
+    ("file?.txt",    "",        "file10.txt",   False, False),
+    ("[ab].py",      "",        "a.py",         False, True),
+    ("[!ab].py",     "",        "a.py",         False, False),
+    ("*.egg-info/",  "src",     "pkg.egg-info", True,  True),
+    ("\\#notes",     "",        "#notes",       False, True),
+])
+def test_pattern_grammar(pattern: str, rel_dir: str, name: str, is_dir: bool, expected: bool) -> None:
+    assert _matcher(pattern).is_ignored(rel_dir, name, is_dir) is expected
+
+
+def test_comments_and_blank_lines_are_skipped() -> None:
+    m = _matcher("# comment", "", "   ")
+    assert not m.is_ignored("", "comment", False)
+
+
+def test_negation_last_match_wins() -> None:
+    m = _matcher("*.log", "!keep.log")
+    assert m.is_ignored("", "drop.log", False)
+    assert not m.is_ignored("", "keep.log", False)
+    # Order matters: a later positive rule wins over an earlier negation.
+    m = _matcher("!keep.log", "*.log")
+    assert m.is_ignored("", "keep.log", False)
+
+
+def test_nested_rule_sets_take_precedence() -> None:
+    """A deeper .gitignore overrides its parents, but only below its own directory."""
+    m = _matcher("*.gen").extend("sub", ["!*.gen"])
+    assert m.is_ignored("", "a.gen", False)
+    assert not m.is_ignored("sub", "a.gen", False)
+    assert not m.is_ignored("sub/deeper", "a.gen", False)
+    assert m.is_ignored("other", "a.gen", False)
+
+
+def test_from_patterns_splits_names_and_globs() -> None:
+    m = IgnoreMatcher.from_patterns({"node_modules"}, ["my_build", "*.tmp"])
+    assert "my_build" in m.names
+    assert m.is_ignored("deep", "node_modules", True)
+    assert m.is_ignored("deep", "x.tmp", False)
+    assert not m.is_ignored("", "x.py", False)
+
+
+def test_read_gitignore_missing_file(tmp_path: Path) -> None:
+    assert read_gitignore(tmp_path / ".gitignore") == []
+
+
+def test_glob_set_selects_files() -> None:
+    globs = GlobSet(["*.py", "src/**/*.sql", "!*_test.py"])
+    assert globs.match("main.py") and globs.match("pkg/deep/mod.py")
+    assert globs.match("src/db/q.sql") and not globs.match("db/q.sql")
+    assert not globs.match("core_test.py")
+    assert not GlobSet([]) and not GlobSet([]).match("main.py")
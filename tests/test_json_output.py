@@ -0,0 +1,128 @@
+import io
+import json
+import pytest
+from pathlib import Path
+
+from locus_cli.core.map import LocusMap
+from locus_cli.main import main
+from locus_cli.ui.json_output import JsonWriter, OverviewEvents, write_tree
+
+
+def _make_project(root: Path) -> None:
+    (root / "pyproject.toml").write_text("[project]")
+    (root / "main.py").write_text("x = 1\n")
+    (root / "src" / "pkg").mkdir(parents=True)
+    for i in range(3):
+        (root / "src" / "pkg" / f"mod{i}.py").write_text("y" * (i + 1))
+    (root / "docs").mkdir()
+    (root / "docs" / "index.md").write_text("# docs")
+
+
+def _flatten(node: dict) -> list[tuple]:
+    """(kind, path, size) of every node below a nested JSON tree, in document order."""
+    rows = []
+    for child in node.get("children", []):
+        rows.append((child["kind"], child["path"], child.get("size")))
+        rows.extend(_flatten(child))
+    return rows
+
+
+def test_tree_ndjson_one_record_per_node(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    _make_project(tmp_path)
+    assert main(["tree", str(tmp_path), "--format", "ndjson", "--max-files", "2"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert records[0] == {"type": "root", "kind": "dir", "name": tmp_path.name, "path": "", "root": str(tmp_path)}
+    nodes = {(r["kind"], r["path"]): r for r in records[1:]}
+    assert all(r["type"] == "node" for r in records[1:])
+    assert nodes[("file", "src/pkg/mod0.py")]["size"] == 1
+    assert nodes[("file", "src/pkg/mod0.py")]["depth"] == 2
+    assert nodes[("more", "src/pkg")] == {
+        "type": "node", "kind": "more", "depth": 2, "path": "src/pkg", "files": 1, "dirs": 0,
+    }
+
+
+def test_tree_json_document_matches_ndjson(tmp_path: Path) -> None:
+    """The nested document holds the same nodes, in the same order, as the record stream."""
+    _make_project(tmp_path)
+    outputs = []
+    for ndjson in (True, False):
+        out = io.StringIO()
+        write_tree(LocusMap(tmp_path, max_depth=2, max_files=2), JsonWriter(out), ndjson)
+        outputs.append(out.getvalue())
+    records = [json.loads(line) for line in outputs[0].splitlines()[1:]]
+    document = json.loads(outputs[1])
+    assert _flatten(document) == [(r["kind"], r["path"], r.get("size")) for r in records]
+    src = next(child for child in document["children"] if child["name"] == "src")
+    pkg = src["children"][0]
+    assert pkg["path"] == "src/pkg" and "children" not in pkg  # below max_depth: not expanded
+
+
+def test_tree_json_with_stats(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    _make_project(tmp_path)
+    assert main(["tree", str(tmp_path), "--format", "json", "--stats"]) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert document["info"]["total_files"] == 6
+    assert [c["name"] for c in document["children"]][:2] == ["docs", "src"]
+
+
+def test_info_json_and_ndjson(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    _make_project(tmp_path)
+    assert main(["info", str(tmp_path), "--format", "json"]) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert document["total_files"] == 6
+    assert document["heuristics"]["project_type"] == "Python Package"
+    assert document["heuristics"]["entry_points"] == ["main.py"]
+    assert document["largest_files"][0] == {"path": "pyproject.toml", "size": 9}
+    assert document["languages"][0]["language"] == "Python"
+    assert {d["path"] for d in document["directories"]} == {"", "src", "src/pkg", "docs"}
+
+    assert main(["info", str(tmp_path), "--format", "ndjson"]) == 0
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [r["type"] for r in records] == ["directory"] * 4 + ["info"]
+    summary = records[-1]
+    del summary["type"], document["directories"]
+    assert summary == document
+
+
+def test_writer_buffers_until_threshold() -> None:
+    out = io.StringIO()
+    writer = JsonWriter(out, buffer_chars=100, flush_seconds=3600)
+    writer.record({"n": 1})
+    assert out.getvalue() == ""
+    for n in range(20):
+        writer.record({"n": n})
+    assert 100 <= len(out.getvalue()) < 20 * 8
+    writer.flush()
+    assert len(out.getvalue().splitlines()) == 21
+
+
+def test_writer_flushes_after_interval() -> None:
+    out = io.StringIO()
+    writer = JsonWriter(out, buffer_chars=1 << 20, flush_seconds=0)
+    writer.record({"n": 1})
+    assert out.getvalue() == '{"n":1}\n'
+
+
+@pytest.mark.parametrize("ndjson", [True, False])
+def test_overview_events(ndjson: bool) -> None:
+    from locus_cli.core.scanner import InfoResult
+    out = io.StringIO()
+    events = OverviewEvents(JsonWriter(out), ndjson)
+    events.scanned(InfoResult(root=Path("."), total_files=3))
+    events.model_ready()
+    for token in ("Hello", " world"):
+        events.token(token)
+    events.done()
+    expected_timings = {
+        "scan_seconds", "setup_seconds", "first_token_seconds", "generation_seconds", "total_seconds",
+    }
+    if ndjson:
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        assert [r["type"] for r in records] == ["scan", "token", "token", "done"]
+        assert records[0]["total_files"] == 3
+        assert "".join(r["text"] for r in records[1:3]) == "Hello world"
+        assert records[-1]["tokens"] == 2 and set(records[-1]["timings"]) == expected_timings
+    else:
+        document = json.loads(out.getvalue())
+        assert document["overview"] == "Hello world"
+        assert set(document["timings"]) == expected_timings
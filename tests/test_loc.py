@@ -0,0 +1,112 @@
+import io
+import pytest
+from pathlib import Path
+
+from locus_cli.core import loc
+from locus_cli.core.loc import LineCounts, count_buffer, count_file, count_lines, count_stream, _syntax_for
+from locus_cli.core.scanner import scan
+
+
+def _counts(text: str, ext: str) -> tuple[int, int, int, int]:
+    c = count_buffer(text.encode(), _syntax_for(ext))
+    return c.lines, c.blank, c.comment, c.code
+
+
+@pytest.mark.parametrize("text, ext, expected", [
+    ("", ".py", (0, 0, 0, 0)),
+    ("x = 1", ".py", (1, 0, 0, 1)),                          # no trailing newline
+    ("x = 1\n\n   \n# note\n  # indented\ny = 2  # trailing\n", ".py", (6, 2, 2, 2)),
+    ("int a;\n// c\n/* one */\n/*\n * two\n */\nint b; /* not a comment line */\n", ".c", (7, 0, 5, 2)),
+    ("/* a\n b */ int x;\n", ".c", (2, 0, 1, 1)),             # code after the closer
+    ("<!-- a\n b -->\n<p>x</p>\n", ".html", (3, 0, 2, 1)),
+    ("line\n\n# not a comment in text\n", ".txt", (3, 1, 0, 2)),
+    ("a\r\n\r\nb\r\n", ".go", (3, 1, 0, 2)),                   # CRLF blank lines
+])
+def test_count_buffer(text: str, ext: str, expected: tuple[int, int, int, int]) -> None:
+    assert _counts(text, ext) == expected
+
+
+def test_count_buffer_binary() -> None:
+    assert count_buffer(b"\x7fELF\x00\x01\n\n") == LineCounts()
+
+
+def test_windows_do_not_split_lines_or_comments(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Windowed counting must give the same totals as a single pass."""
+    text = ("x = 1\n/* long\n comment\n block */\n\n// c\n" * 50).encode()
+    whole = count_buffer(text, _syntax_for(".c"))
+    monkeypatch.setattr(loc, "_WINDOW", 16)
+    assert count_buffer(text, _syntax_for(".c")) == whole
+    assert whole == LineCounts(lines=300, blank=50, comment=200)
+
+
+@pytest.mark.parametrize("ext", [".c", ".py", ".txt"])
+def test_count_stream_matches_count_buffer(monkeypatch: pytest.MonkeyPatch, ext: str) -> None:
+    """Streamed windows are the ones cut from the whole content, read in bounded chunks."""
+    text = (
+        "x = 1\n/* long\n comment\n block */\n\n// c\n# h\n" * 40
+        + "y" * 100 + "\n/*" + " z" * 60 + "\n*/ code\nend"
+    ).encode()
+    monkeypatch.setattr(loc, "_WINDOW", 16)
+    reads: list[int] = []
+
+    class Stream(io.BytesIO):
+        def read(self, n: int = -1) -> bytes:
+            reads.append(n)
+            return super().read(n)
+
+    assert count_stream(Stream(text), _syntax_for(ext)) == count_buffer(text, _syntax_for(ext))
+    assert reads and all(0 < n <= 16 for n in reads)
+    assert count_stream(io.BytesIO(b"")) == LineCounts()
+    assert count_stream(io.BytesIO(b"\x7fELF\x00\n")) == LineCounts()
+
+
+def test_count_file_uses_mmap_for_large_files(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    f = tmp_path / "big.py"
+    f.write_text("# header\n" + "x = 1\n" * 1000)
+    monkeypatch.setattr(loc, "_WINDOW", 100)
+    counts = count_file(str(f), ".py")
+    assert (counts.lines, counts.comment, counts.code) == (1001, 1, 1000)
+
+
+def test_count_file_missing(tmp_path: Path) -> None:
+    assert count_file(str(tmp_path / "nope.py"), ".py") == LineCounts()
+
+
+def test_count_lines_processes_match_serial(tmp_path: Path) -> None:
+    files = []
+    for i in range(20):
+        f = tmp_path / f"m{i}.py"
+        f.write_text("# c\n\n" + "x = 1\n" * i)
+        files.append((".py", str(f), f.stat().st_size))
+    serial = count_lines(files, jobs=1)
+    assert count_lines(files, jobs=2) == serial
+    assert serial[".py"] == LineCounts(lines=20 * 2 + sum(range(20)), blank=20, comment=20)
+
+
+def test_scan_loc_ranks_by_code_lines(tmp_path: Path) -> None:
+    """Many tiny JSON files must not outrank one real Python module."""
+    for i in range(5):
+        (tmp_path / f"data{i}.json").write_text("{}\n")
+    (tmp_path / "main.py").write_text('"""doc"""\n\n# comment\n' + "x = 1\n" * 50)
+    (tmp_path / "logo.png").write_bytes(b"\x89PNG\x00" * 10)
+
+    result = scan(tmp_path, loc=True)
+    assert result.lines_counted
+    top = result.languages[0]
+    assert top.extension == ".py"
+    assert (top.lines, top.blank_lines, top.comment_lines, top.code_lines) == (53, 1, 1, 51)
+    assert {ls.extension: ls.code_lines for ls in result.languages}[".json"] == 5
+    assert {ls.extension: ls.lines for ls in result.languages}[".png"] == 0
+
+
+def test_scan_without_loc_leaves_counts_empty(tmp_path: Path) -> None:
+    (tmp_path / "main.py").write_text("x = 1\n")
+    result = scan(tmp_path)
+    assert not result.lines_counted
+    assert result.languages[0].lines == 0
+
+
+def test_cli_info_loc(tmp_path: Path) -> None:
+    from locus_cli.main import main
+    (tmp_path / "main.py").write_text("x = 1\n")
+    assert main(["info", str(tmp_path), "--loc", "--jobs", "2"]) == 0
@@ -0,0 +1,43 @@
+import pytest
+
+from locus_cli.core.progress import ProgressBus, ProgressEvent
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ticks_are_rate_limited_and_coalesced() -> None:
+    clock = _Clock()
+    events: list[ProgressEvent] = []
+    bus = ProgressBus(rate=10, clock=clock).subscribe(events.append)
+    for step in range(1000):  # 1000 directories over one second
+        bus.files += 3
+        bus.dirs += 1
+        bus.tick()
+        clock.now += 0.001
+    # The first tick, then one per 100 ms.
+    assert 10 <= len(events) <= 11
+    assert events[0] == ProgressEvent(files=3, dirs=1)
+    assert [e.dirs for e in events] == sorted(e.dirs for e in events)
+    assert events[-1].dirs < 1000
+    bus.flush()
+    assert events[-1] == ProgressEvent(files=3000, dirs=1000)
+
+
+def test_flush_skips_an_unchanged_state() -> None:
+    events: list[ProgressEvent] = []
+    bus = ProgressBus(clock=lambda: 0.0).subscribe(events.append)
+    bus.bytes = 5
+    bus.tick()
+    bus.flush()
+    assert events == [ProgressEvent(bytes=5)]
+
+
+def test_rate_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        ProgressBus(rate=0)
@@ -1,3 +1,4 @@
+import os
 import pytest
 from pathlib import Path
 from locus_cli.core.scanner import scan, InfoResult, ProjectHeuristics
@@ -228,3 +229,408 @@ def test_full_cli_wiring_info_returns_zero(tmp_path: Path) -> None:
     from locus_cli.main import main
     result = main(["info", str(tmp_path)])
     assert result == 0
+
+
+# ---------------------------------------------------------------------------
+# Parallel traversal
+# ---------------------------------------------------------------------------
+
+def _make_wide_tree(root: Path) -> None:
+    """A few levels of directories with same-size files, so heap ties matter."""
+    (root / "pyproject.toml").write_text("[project]\nname = 'test'")
+    (root / "main.py").write_text("x = 1")
+    (root / "tests").mkdir()
+    (root / ".github").mkdir()
+    (root / "node_modules").mkdir()
+    (root / "node_modules" / "dep.js").write_text("x")
+    for i in range(6):
+        pkg = root / f"pkg{i}"
+        pkg.mkdir()
+        for j in range(4):
+            sub = pkg / f"sub{j}"
+            sub.mkdir()
+            for ext in (".py", ".js", ".ts", ".go", ".rs", ".c"):
+                (sub / f"f{j}{ext}").write_bytes(b"x" * (10 * j + i))
+
+
+def test_scan_parallel_matches_serial(tmp_path: Path) -> None:
+    """A parallel scan must produce exactly the same InfoResult as the serial one."""
+    _make_wide_tree(tmp_path)
+    serial = scan(tmp_path)
+    for jobs in (0, 2, 8):
+        assert scan(tmp_path, jobs=jobs) == serial
+
+
+def test_scan_parallel_reports_progress(tmp_path: Path) -> None:
+    """Progress events grow monotonically in parallel too, the last one with the final totals."""
+    from locus_cli.core.progress import ProgressBus
+    _make_wide_tree(tmp_path)
+    events = []
+    # A clock that never moves: only the first tick and the final flush get through.
+    bus = ProgressBus(clock=lambda: 0.0).subscribe(events.append)
+    result = scan(tmp_path, progress=bus, jobs=4)
+    assert len(events) == 2
+    assert events[0].files <= events[-1].files
+    last = events[-1]
+    assert (last.files, last.dirs, last.bytes) == (result.total_files, result.total_dirs, result.total_bytes)
+
+
+def test_scan_rejects_negative_jobs(tmp_path: Path) -> None:
+    """jobs < 0 is meaningless and must raise ValueError."""
+    with pytest.raises(ValueError):
+        scan(tmp_path, jobs=-1)
+
+
+def test_full_cli_wiring_info_with_jobs(tmp_path: Path) -> None:
+    """main(["info", <path>, "--jobs", "4"]) must return exit code 0."""
+    from locus_cli.main import main
+    (tmp_path / "main.py").write_text("x = 1")
+    assert main(["info", str(tmp_path), "--jobs", "4"]) == 0
+
+
+def test_scan_gitignore_globs(tmp_path: Path) -> None:
+    """Glob patterns in .gitignore must prune matching files and directories."""
+    (tmp_path / ".gitignore").write_text("*.log\ndist-*/\n*.egg-info/\n")
+    (tmp_path / "debug.log").write_text("x")
+    (tmp_path / "dist-linux").mkdir()
+    (tmp_path / "dist-linux" / "out.bin").write_bytes(b"\x00")
+    (tmp_path / "pkg.egg-info").mkdir()
+    (tmp_path / "pkg.egg-info" / "PKG-INFO").write_text("x")
+    (tmp_path / "main.py").write_text("x = 1")
+    result = scan(tmp_path)
+    assert result.total_files == 1
+    assert result.total_dirs == 0
+
+
+def test_scan_nested_gitignore(tmp_path: Path) -> None:
+    """A .gitignore in a sub-project applies to that sub-tree only, negations included."""
+    (tmp_path / ".gitignore").write_text("*.gen\n")
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / ".gitignore").write_text("generated/\n!keep.gen\n")
+    (sub / "generated").mkdir()
+    (sub / "generated" / "big.py").write_text("x")
+    (sub / "keep.gen").write_text("x")
+    (sub / "drop.gen").write_text("x")
+    (tmp_path / "generated").mkdir()
+    (tmp_path / "generated" / "ok.py").write_text("x")
+    result = scan(tmp_path)
+    assert result.total_files == 2  # sub/keep.gen, generated/ok.py
+
+
+def test_scan_ignore_accepts_globs(tmp_path: Path) -> None:
+    """--ignore values with glob syntax behave like root .gitignore patterns."""
+    (tmp_path / "a.tmp").write_text("x")
+    (tmp_path / "b.py").write_text("x")
+    result = scan(tmp_path, ignore=["*.tmp"])
+    assert result.total_files == 1
+
+
+# ---------------------------------------------------------------------------
+# Streaming entries
+# ---------------------------------------------------------------------------
+
+def test_iter_entries_yields_file_records(tmp_path: Path) -> None:
+    """Every non-ignored file is streamed once with its path, size, ext, depth and mtime."""
+    from locus_cli.core.scanner import iter_entries
+    (tmp_path / "main.py").write_text("x = 1")
+    (tmp_path / "src" / "pkg").mkdir(parents=True)
+    (tmp_path / "src" / "pkg" / "Mod.PY").write_text("abc")
+    (tmp_path / "node_modules").mkdir()
+    (tmp_path / "node_modules" / "dep.js").write_text("x")
+    (tmp_path / ".hidden").write_text("x")
+
+    entries = {e.path: e for e in iter_entries(tmp_path)}
+    assert set(entries) == {"main.py", os.path.join("src", "pkg", "Mod.PY")}
+    mod = entries[os.path.join("src", "pkg", "Mod.PY")]
+    assert (mod.name, mod.ext, mod.size, mod.depth, mod.is_dir) == ("Mod.PY", ".py", 3, 2, False)
+    assert mod.mtime == pytest.approx((tmp_path / "src" / "pkg" / "Mod.PY").stat().st_mtime)
+    assert entries["main.py"].depth == 0
+
+
+def test_iter_entries_dirs_and_directory_callback(tmp_path: Path) -> None:
+    from locus_cli.core.scanner import iter_entries
+    (tmp_path / "a").mkdir()
+    (tmp_path / "a" / "f.txt").write_text("x")
+    (tmp_path / ".github").mkdir()
+    done: list[int] = []
+
+    entries = list(iter_entries(tmp_path, dirs=True, on_directory=lambda: done.append(1)))
+    assert sorted(e.path for e in entries if e.is_dir) == [".github", "a"]
+    assert [e.path for e in entries if not e.is_dir] == [os.path.join("a", "f.txt")]
+    assert len(done) == 2  # the root and "a"; hidden directories are not entered
+
+
+def test_iter_entries_validates_eagerly(tmp_path: Path) -> None:
+    """Bad arguments raise when iter_entries() is called, not on first next()."""
+    from locus_cli.core.scanner import iter_entries
+    with pytest.raises(ValueError):
+        iter_entries(tmp_path / "missing")
+    with pytest.raises(ValueError):
+        iter_entries(tmp_path, jobs=-1)
+
+
+def test_iter_entries_parallel_matches_serial(tmp_path: Path) -> None:
+    from locus_cli.core.scanner import iter_entries
+    _make_wide_tree(tmp_path)
+    serial = list(iter_entries(tmp_path, dirs=True))
+    assert list(iter_entries(tmp_path, dirs=True, jobs=4)) == serial
+
+
+def test_iter_entries_can_stop_early(tmp_path: Path) -> None:
+    from locus_cli.core.scanner import iter_entries
+    _make_wide_tree(tmp_path)
+    stream = iter_entries(tmp_path, jobs=4)
+    first = next(stream)
+    stream.close()  # shuts the listing pool down
+    assert first.size >= 0
+
+
+def test_scan_hot_loop_builds_paths_for_heap_entries_only(monkeypatch: pytest.MonkeyPatch) -> None:
+    """No per-file record, and the largest files (ties broken by path) as the entry stream gives them."""
+    from locus_cli.core import scanner
+    from locus_cli.core.scanner import Snapshot, _DirListing, iter_entries
+    root = os.path.abspath(os.sep + "synthetic")
+    sub = os.path.join(root, "sub")
+    snapshot = Snapshot(root, {
+        root: _DirListing(root, ["sub"], [(f"f{i}.py", i % 7, 1.0) for i in range(50)]),
+        sub: _DirListing(sub, [], [(f"g{i}.PY", 6, 1.0) for i in range(10)] + [("big", 100, 1.0)]),
+    })
+    expected = sorted(((e.size, e.path) for e in iter_entries(Path(root), snapshot=snapshot)), reverse=True)[:5]
+    monkeypatch.setattr(scanner, "FileEntry", lambda *args: pytest.fail("FileEntry built by scan()"))
+    result = scan(Path(root), snapshot=snapshot)
+    assert result.largest_files == [(path, size) for size, path in expected]
+    assert result.largest_files[0] == (os.path.join("sub", "big"), 100)
+    assert {ls.extension: ls.file_count for ls in result.languages} == {".py": 60}
+    assert result.directories["sub"].languages == {".py": 10}
+
+
+def test_scan_names_only_skips_stat(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """fields=("names",): no listing asks for sizes; counts and heuristics are unchanged."""
+    from locus_cli.core import scanner
+    (tmp_path / "pyproject.toml").write_text("[project]")
+    (tmp_path / "main.py").write_text("x = 1")
+    (tmp_path / "tests").mkdir()
+    (tmp_path / "tests" / "test_main.py").write_text("assert True")
+    full = scan(tmp_path)
+
+    asked: list[bool] = []
+    real_list_dir = scanner._list_dir
+
+    def list_dir(path: str, sizes: bool = True):
+        asked.append(sizes)
+        return real_list_dir(path, sizes)
+
+    monkeypatch.setattr(scanner, "_list_dir", list_dir)
+    fast = scan(tmp_path, fields=("names",), jobs=2)
+    assert asked and not any(asked)
+    assert not fast.sized and full.sized
+    assert (fast.total_files, fast.total_dirs, fast.total_bytes) == (full.total_files, full.total_dirs, 0)
+    assert fast.heuristics == full.heuristics
+    assert [(ls.extension, ls.file_count) for ls in fast.languages] == [
+        (ls.extension, ls.file_count) for ls in full.languages
+    ]
+    assert fast.largest_files == []
+
+
+def test_iter_entries_names_only_skips_stat(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from locus_cli.core import scanner
+    from locus_cli.core.scanner import iter_entries
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "app.py").write_text("x = 1")
+    (tmp_path / "README.md").write_text("# Hi")
+
+    asked: list[bool] = []
+    real_list_dir = scanner._list_dir
+
+    def list_dir(path: str, sizes: bool = True):
+        asked.append(sizes)
+        return real_list_dir(path, sizes)
+
+    monkeypatch.setattr(scanner, "_list_dir", list_dir)
+    entries = list(iter_entries(tmp_path, fields=("names",), jobs=2))
+    assert asked and not any(asked)
+    assert sorted((e.path, e.ext, e.size) for e in entries) == [
+        ("README.md", ".md", 0), (os.path.join("src", "app.py"), ".py", 0),
+    ]
+    with pytest.raises(ValueError, match="owner"):
+        iter_entries(tmp_path, fields=("owner",))
+
+
+def test_scan_plan_for_fields() -> None:
+    from locus_cli.core.scanner import ScanPlan
+    assert ScanPlan.for_fields(["names"]) == ScanPlan(stat=False, contents=False)
+    assert ScanPlan.for_fields(["names", "mtimes"]) == ScanPlan(stat=True, contents=False)
+    assert ScanPlan.for_fields(["names", "contents"]) == ScanPlan(stat=True, contents=True)
+    with pytest.raises(ValueError, match="owner"):
+        ScanPlan.for_fields(["names", "owner"])
+
+
+def test_scan_directory_rollups(tmp_path: Path) -> None:
+    """Every directory carries the size, file count and languages of everything below it."""
+    from locus_cli.core.scanner import heaviest_directories
+    (tmp_path / "a" / "b").mkdir(parents=True)
+    (tmp_path / "a" / "one.py").write_text("x" * 10)
+    (tmp_path / "a" / "b" / "two.py").write_text("x" * 20)
+    (tmp_path / "a" / "b" / "three.md").write_text("x" * 30)
+    (tmp_path / "c").mkdir()
+    (tmp_path / "c" / "four.txt").write_text("x" * 5)
+    (tmp_path / "top.txt").write_text("x")
+
+    result = scan(tmp_path)
+    dirs = result.directories
+    b = dirs[os.path.join("a", "b")]
+    assert (b.total_bytes, b.file_count, b.languages) == (50, 2, {".py": 1, ".md": 1})
+    assert (dirs["a"].total_bytes, dirs["a"].file_count, dirs["a"].languages) == (60, 3, {".py": 2, ".md": 1})
+    assert (dirs[""].total_bytes, dirs[""].file_count) == (result.total_bytes, result.total_files)
+    assert [d.path for d in heaviest_directories(result, 2)] == ["a", os.path.join("a", "b")]
+
+    (tmp_path / "wide").mkdir()
+    _make_wide_tree(tmp_path / "wide")
+    assert scan(tmp_path, jobs=4).directories == scan(tmp_path).directories
+
+
+def test_cli_info_shows_paths_with_brackets(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Folder and file names are printed as they are, not read as Rich markup."""
+    from locus_cli.main import main
+    (tmp_path / "[bold]").mkdir()
+    (tmp_path / "[bold]" / "[red]big.txt").write_text("x" * 100)
+    assert main(["info", str(tmp_path), "--no-cache"]) == 0
+    out = capsys.readouterr().out
+    assert "[bold]/" in out and "[red]big.txt" in out
+
+
+def test_cli_rejects_negative_jobs(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """A negative --jobs is a usage error, not a traceback."""
+    from locus_cli.main import main
+    with pytest.raises(SystemExit) as exc:
+        main(["info", str(tmp_path), "--jobs", "-1"])
+    assert exc.value.code == 2
+    assert "must be >= 0" in capsys.readouterr().err
+
+
+def test_scan_disk_usage_counts_hard_links_once(tmp_path: Path) -> None:
+    (tmp_path / "store").mkdir()
+    (tmp_path / "store" / "lib.js").write_bytes(b"x" * 10_000)
+    for name in ("a.js", "b.js"):
+        os.link(tmp_path / "store" / "lib.js", tmp_path / name)
+    (tmp_path / "own.js").write_bytes(b"y" * 100)
+
+    plain = scan(tmp_path)
+    assert plain.total_bytes == 30_100 and plain.disk is None
+    result = scan(tmp_path, disk_usage=True)
+    assert result.total_files == 4
+    assert result.total_bytes == 10_100
+    assert result.disk is not None
+    assert (result.disk.hard_links, result.disk.hard_link_bytes) == (2, 20_000)
+    assert result.disk.allocated_bytes > 0
+    # Rollups count the inode at its first path only, like the totals.
+    assert result.directories[""].total_bytes == result.total_bytes
+
+
+def test_scan_disk_usage_sparse_file(tmp_path: Path) -> None:
+    with open(tmp_path / "disk.img", "wb") as f:
+        f.truncate(50_000_000)
+        f.write(b"data")
+    if os.stat(tmp_path / "disk.img").st_blocks * 512 >= 50_000_000:
+        pytest.skip("filesystem without sparse files")
+    result = scan(tmp_path, disk_usage=True)
+    assert result.total_bytes == 50_000_000
+    assert result.disk is not None and result.disk.allocated_bytes < 1_000_000
+
+
+def test_scan_one_file_system(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """A folder on another device (a mount point) is neither entered nor counted."""
+    from locus_cli.core.map import LocusMap
+    (tmp_path / "src").mkdir()
+    (tmp_path / "src" / "main.py").write_text("x")
+    (tmp_path / "src" / "nfs").mkdir()
+    (tmp_path / "src" / "nfs" / "remote.py").write_text("y")
+    lstat = os.lstat
+
+    def other_device_for_nfs(path, *args, **kwargs):  # type: ignore[no-untyped-def]
+        st = lstat(path, *args, **kwargs)
+        if str(path).endswith("nfs"):
+            values = list(st)
+            values[2] += 1  # st_dev
+            return os.stat_result(values)
+        return st
+
+    monkeypatch.setattr(os, "lstat", other_device_for_nfs)
+    assert scan(tmp_path).total_files == 2
+    result = scan(tmp_path, one_file_system=True)
+    assert (result.total_files, result.total_dirs) == (1, 1)
+    assert result.skipped_mounts == [os.path.join("src", "nfs")]
+    labels = [node.name for node in LocusMap(tmp_path, 4, one_file_system=True).iter_nodes()]
+    assert labels == ["src", "main.py"]
+
+
+def test_cli_info_disk_usage(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    import json
+    from locus_cli.main import main
+    (tmp_path / "a.txt").write_text("z" * 1000)
+    os.link(tmp_path / "a.txt", tmp_path / "b.txt")
+    assert main(["info", str(tmp_path), "--disk-usage", "-x"]) == 0
+    out = " ".join(capsys.readouterr().out.split())
+    assert "1.0 kB apparent" in out and "on disk" in out
+    assert "1 hard links counted once" in out
+    assert main(["info", str(tmp_path), "--disk-usage", "--format", "json"]) == 0
+    document = json.loads(capsys.readouterr().out)
+    assert document["total_bytes"] == 1000
+    assert document["disk"]["hard_links"] == 1
+    assert main(["info", str(tmp_path), "--disk-usage", "--rev", "HEAD"]) == 1
+
+
+def _make_monorepo(root: Path) -> None:
+    (root / "package.json").write_text("{}")
+    api = root / "packages" / "api"
+    (api / "tests").mkdir(parents=True)
+    (api / "pyproject.toml").write_text("[project]")
+    (api / "app.py").write_text("app = 1\n")
+    (api / "tests" / "test_app.py").write_text("def test(): pass\n")
+    (api / ".github").mkdir()
+    web = root / "packages" / "web"
+    (web / "src").mkdir(parents=True)
+    (web / "package.json").write_text("{}")
+    (web / "index.ts").write_text("export {}")
+    (web / "src" / "a.ts").write_text("let a = 1")
+    (web / "node_modules" / "dep").mkdir(parents=True)
+    (web / "node_modules" / "dep" / "package.json").write_text("{}")
+    (root / "tools").mkdir()
+    (root / "tools" / "main.py").write_text("print()")  # entry point name, but no project marker
+
+
+def test_scan_detects_subprojects(tmp_path: Path) -> None:
+    _make_monorepo(tmp_path)
+    result = scan(tmp_path)
+    assert result.heuristics == ProjectHeuristics("Node.js Project", "package.json")
+    assert [sub.path for sub in result.subprojects] == [
+        os.path.join("packages", "api"), os.path.join("packages", "web"),
+    ]
+    api, web = (sub.heuristics for sub in result.subprojects)
+    assert api == ProjectHeuristics("Python Package", "pyproject.toml", ["app.py"], ["tests"], [".github"])
+    assert web == ProjectHeuristics("Node.js Project", "package.json", ["index.ts"])
+    assert result.directories[result.subprojects[1].path].languages == {".json": 1, ".ts": 2}
+
+
+def test_scan_subprojects_same_for_every_walk(tmp_path: Path) -> None:
+    from locus_cli.core.scanner import Snapshot
+    _make_monorepo(tmp_path)
+    serial = scan(tmp_path).subprojects
+    assert scan(tmp_path, jobs=4).subprojects == serial
+    assert scan(tmp_path, keep_files=True).subprojects == serial
+    assert scan(tmp_path, snapshot=Snapshot.build(tmp_path)).subprojects == serial
+
+
+def test_cli_info_subprojects(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    import json
+    from locus_cli.main import main
+    _make_monorepo(tmp_path)
+    assert main(["info", str(tmp_path)]) == 0
+    out = " ".join(capsys.readouterr().out.split())
+    assert "Sub-projects 2" in out and "packages/api/ Python Package Python 3 files app.py tests:" in out
+    assert main(["info", str(tmp_path), "--format", "json"]) == 0
+    subprojects = json.loads(capsys.readouterr().out)["subprojects"]
+    assert [sub["path"] for sub in subprojects] == ["packages/api", "packages/web"]
+    assert subprojects[0]["heuristics"]["entry_points"] == ["app.py"]
+    assert subprojects[0]["file_count"] == 3
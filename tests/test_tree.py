@@ -105,23 +105,27 @@ def test_hidden_files_are_excluded(tmp_path: Path) -> None:
 
 def test_tree_progress_callback_is_called(tmp_path: Path) -> None:
     """
-    generate() must invoke on_progress at least once when subdirectories exist.
-    This covers the contract between LocusMap and the Live progress display.
+    generate() must report progress when subdirectories exist, ending with
+    every listed directory counted. This covers the contract between LocusMap
+    and the progress display.
     """
+    from locus_cli.core.progress import ProgressBus
     (tmp_path / "src").mkdir()
     (tmp_path / "src" / "nested").mkdir()
     (tmp_path / "src" / "nested" / "deep").mkdir()
+    (tmp_path / "src" / "main.py").write_text("x")
 
-    calls = []
+    events = []
     locus_map = LocusMap(tmp_path, max_depth=4, max_files=10, ignore=None)
-    locus_map.generate(on_progress=lambda: calls.append(1))
+    locus_map.generate(ProgressBus().subscribe(events.append))
 
-    assert len(calls) > 0
+    assert len(events) > 0
+    assert (events[-1].dirs, events[-1].files) == (4, 1)
 
 
 def test_tree_progress_callback_not_required(tmp_path: Path) -> None:
     """
-    generate() must work normally when on_progress is not provided (default None).
+    generate() must work normally when no progress bus is given (default None).
     Ensures backwards compatibility.
     """
     locus_map = LocusMap(tmp_path, max_depth=2, max_files=10, ignore=None)
@@ -162,4 +166,339 @@ def test_full_cli_wiring_returns_zero(tmp_path: Path) -> None:
 
     # Pass the tmp_path as a string, exactly as the OS would pass it
     result = main(["tree", str(tmp_path)])
-    assert result == 0
\ No newline at end of file
+    assert result == 0
+
+def test_tree_respects_nested_gitignore_globs(tmp_path: Path) -> None:
+    """Glob patterns from nested .gitignore files must hide entries in the tree."""
+    sub = tmp_path / "sub"
+    sub.mkdir()
+    (sub / ".gitignore").write_text("*.log\n")
+    (sub / "trace.log").write_text("x")
+    (sub / "code.py").write_text("x")
+
+    locus_map = LocusMap(tmp_path, max_depth=3, max_files=10, ignore=None)
+    tree = locus_map.generate()
+    sub_node = tree.children[0]
+    labels = [str(c.label) for c in sub_node.children]
+    assert any("code.py" in label for label in labels)
+    assert not any("trace.log" in label for label in labels)
+
+
+def _labels(node) -> list:
+    return [(str(c.label), _labels(c)) for c in node.children]
+
+
+def _make_project(root: Path) -> None:
+    (root / ".gitignore").write_text("*.log\n")
+    (root / "main.py").write_text("x = 1")
+    (root / "debug.log").write_text("x")
+    (root / "src" / "pkg").mkdir(parents=True)
+    (root / "src" / "pkg" / "core.py").write_text("y" * 100)
+    (root / "tests").mkdir()
+    (root / "tests" / "test_core.py").write_text("z")
+    (root / ".venv").mkdir()
+    (root / "coverage").mkdir()
+
+
+def test_tree_and_info_share_default_ignores() -> None:
+    """One ignore set for both commands: the two lists used to drift apart."""
+    from locus_cli.core.ignore import DEFAULT_IGNORE
+    assert LocusMap.IGNORE_FOLDERS == DEFAULT_IGNORE
+    assert {".venv", "coverage", "node_modules"} <= LocusMap.IGNORE_FOLDERS
+
+
+def test_snapshot_lists_each_directory_once(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Tree and stats built from one Snapshot match their standalone results with a single walk."""
+    from locus_cli.core import scanner
+    from locus_cli.core.scanner import Snapshot, scan
+    _make_project(tmp_path)
+    expected_tree = _labels(LocusMap(tmp_path, max_depth=4).generate())
+    expected_info = scan(tmp_path)
+
+    listed: list[str] = []
+    real_list_dir = scanner._list_dir
+    monkeypatch.setattr(scanner, "_list_dir", lambda path, sizes=True: listed.append(path) or real_list_dir(path, sizes))
+
+    snapshot = Snapshot.build(tmp_path)
+    assert sorted(listed) == sorted({str(tmp_path), str(tmp_path / "src"), str(tmp_path / "src" / "pkg"), str(tmp_path / "tests")})
+    tree = LocusMap(tmp_path, max_depth=4, snapshot=snapshot).generate()
+    info = scan(tmp_path, snapshot=snapshot)
+    assert len(listed) == len(snapshot)  # nothing listed again
+
+    assert _labels(tree) == expected_tree
+    assert info == expected_info
+
+
+def test_full_cli_wiring_tree_stats(tmp_path: Path) -> None:
+    from locus_cli.main import main
+    _make_project(tmp_path)
+    assert main(["tree", str(tmp_path), "--stats"]) == 0
+
+
+def test_tree_sort_by_size(tmp_path: Path) -> None:
+    """Branches are ordered by their rolled-up size, files by their own size."""
+    from locus_cli.core.scanner import Snapshot, scan
+    (tmp_path / "a_small").mkdir()
+    (tmp_path / "a_small" / "x.txt").write_text("x")
+    (tmp_path / "b_big" / "deep").mkdir(parents=True)
+    (tmp_path / "b_big" / "deep" / "y.txt").write_text("y" * 500)
+    (tmp_path / "little.txt").write_text("z")
+    (tmp_path / "large.txt").write_text("z" * 50)
+
+    snapshot = Snapshot.build(tmp_path)
+    result = scan(tmp_path, snapshot=snapshot)
+    tree = LocusMap(tmp_path, max_depth=3, snapshot=snapshot, sort="size", rollups=result.directories).generate()
+    labels = [label for label, _ in _labels(tree)]
+    assert [next(n for n in ("a_small", "b_big", "little", "large") if n in label) for label in labels] == [
+        "b_big", "a_small", "large", "little",
+    ]
+    assert "500" in labels[0]  # folders carry their rolled-up size
+
+    with pytest.raises(ValueError):
+        LocusMap(tmp_path, max_depth=3, sort="size")
+    with pytest.raises(ValueError):
+        LocusMap(tmp_path, max_depth=3, sort="mtime")
+
+
+def test_full_cli_wiring_tree_sort_size(tmp_path: Path) -> None:
+    from locus_cli.main import main
+    _make_project(tmp_path)
+    assert main(["tree", str(tmp_path), "--sort", "size"]) == 0
+
+
+def test_stream_matches_rich_tree(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Streamed lines, guides included, are what Rich prints for the full tree."""
+    import io
+    from rich.console import Console
+    from rich.text import Text
+    from locus_cli.core import map as map_module
+    monkeypatch.setenv("LOCUS_NERD_FONTS", "0")
+    monkeypatch.setattr(map_module, "supports_unicode", lambda: True)
+    _make_project(tmp_path)
+    for i in range(4):
+        (tmp_path / "src" / f"m{i}.py").write_text("x")
+
+    out = io.StringIO()
+    Console(file=out, width=200, color_system=None).print(LocusMap(tmp_path, max_depth=4, max_files=3).generate())
+    lines: list[str] = []
+    LocusMap(tmp_path, max_depth=4, max_files=3).stream(lambda line: lines.append(Text.from_markup(line).plain))
+    assert [line.rstrip() for line in out.getvalue().splitlines()] == lines
+
+
+def test_stream_plain_writes_while_walking(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Lines come out before the walk is over, in plain text with ASCII guides when needed."""
+    from locus_cli.core import map as map_module
+    monkeypatch.setattr(map_module, "supports_unicode", lambda: False)
+    _make_project(tmp_path)
+    locus_map = LocusMap(tmp_path, max_depth=4)
+    listed: list[str] = []
+    real_list = locus_map._list
+    locus_map._list = lambda path: listed.append(path) or real_list(path)
+    lines: list[tuple[int, str]] = []
+    locus_map.stream(lambda line: lines.append((len(listed), line)), markup=False)
+
+    assert [line for _, line in lines] == [
+        tmp_path.name,
+        "|-- src/",
+        "|   `-- pkg/",
+        "|       `-- core.py (100 bytes)",
+        "|-- tests/",
+        "|   `-- test_core.py (1 byte)",
+        "`-- main.py (5 bytes)",
+    ]
+    assert lines[1][0] == 1  # src/ is written before anything below the root is listed
+
+
+def test_fair_shares() -> None:
+    from locus_cli.core.map import _fair_shares
+    assert _fair_shares([3, 1, 0], 10) == [3, 1, 0]
+    assert _fair_shares([10, 1, 10], 7) == [3, 1, 3]
+    assert _fair_shares([10, 10, 10], 8) == [3, 3, 2]
+
+
+def test_max_nodes_bounds_walk_and_output(tmp_path: Path) -> None:
+    """A folder with thousands of sub-folders costs a bounded number of listings and lines."""
+    wide = tmp_path / "wide"
+    for i in range(2000):
+        (wide / f"d{i:04d}").mkdir(parents=True)
+        (wide / f"d{i:04d}" / "f.txt").write_text("x")
+    (tmp_path / "small").mkdir()
+    (tmp_path / "small" / "a.txt").write_text("x")
+
+    locus_map = LocusMap(tmp_path, max_depth=5, max_nodes=20)
+    listed: list[str] = []
+    real_list = locus_map._list
+    locus_map._list = lambda path: listed.append(path) or real_list(path)
+    nodes = list(locus_map.iter_nodes())
+
+    shown = [n for n in nodes if n.kind != "more"]
+    assert len(shown) <= 20
+    assert len(listed) <= 21
+    # The small folder is not starved by its wide sibling, which gets the rest of the budget.
+    assert any(n.name == "a.txt" for n in shown)
+    assert sum(1 for n in shown if n.depth == 1 and n.kind == "dir") == 17
+    assert next(n for n in nodes if n.kind == "more" and n.depth == 1).dirs == 2000 - 17
+
+
+def test_max_nodes_annotates_unwalked_folders(tmp_path: Path) -> None:
+    for d in "abc":
+        (tmp_path / d).mkdir()
+        for i in range(3):
+            (tmp_path / d / f"{i}.txt").write_text("x")
+    nodes = list(LocusMap(tmp_path, max_depth=3, max_nodes=4).iter_nodes())
+    lines = [(n.depth, n.kind, n.name, n.size) for n in nodes]
+    assert lines == [
+        (0, "dir", "a", None), (1, "file", "0.txt", 1), (1, "more", "", 2),
+        (0, "dir", "b", None), (1, "more", "", 3),
+        (0, "dir", "c", None), (1, "more", "", 3),
+    ]
+    assert nodes[-1].last and nodes[-2].last
+
+
+def test_full_cli_wiring_tree_max_nodes(tmp_path: Path) -> None:
+    from locus_cli.main import main
+    _make_project(tmp_path)
+    assert main(["tree", str(tmp_path), "--max-nodes", "3"]) == 0
+
+
+@pytest.mark.parametrize("argv, message", [
+    (["--depth", "-1"], "must be >= 0"),
+    (["--max-files", "-3"], "must be >= 0"),
+    (["--max-nodes", "0"], "must be >= 1"),
+    (["--max-nodes", "ten"], "invalid int value"),
+])
+def test_cli_tree_rejects_bad_counts(
+    tmp_path: Path, capsys: pytest.CaptureFixture[str], argv: list[str], message: str,
+) -> None:
+    """Bad counts are usage errors up front, not tracebacks or empty trees."""
+    from locus_cli.main import main
+    with pytest.raises(SystemExit) as exc:
+        main(["tree", str(tmp_path), *argv])
+    assert exc.value.code == 2
+    assert message in capsys.readouterr().err
+
+
+def _make_deep_tree(root: Path) -> None:
+    for a in range(4):
+        for b in range(3):
+            leaf = root / f"a{a}" / f"b{b}" / "c"
+            leaf.mkdir(parents=True)
+            for f in range(4):
+                (leaf / f"f{f}.txt").write_text("x" * (a + b + f))
+            (root / f"a{a}" / f"z{b}.md").write_text("y" * b)
+
+
+@pytest.mark.parametrize("max_nodes", [None, 15])
+def test_tree_jobs_match_serial(tmp_path: Path, max_nodes) -> None:
+    """Prefetching on a pool never changes the output."""
+    _make_deep_tree(tmp_path)
+    serial = list(LocusMap(tmp_path, max_depth=4, max_files=3, max_nodes=max_nodes).iter_nodes())
+    for jobs in (0, 4):
+        assert list(LocusMap(tmp_path, max_depth=4, max_files=3, max_nodes=max_nodes, jobs=jobs).iter_nodes()) == serial
+
+
+def test_tree_jobs_can_stop_early(tmp_path: Path) -> None:
+    _make_deep_tree(tmp_path)
+    nodes = LocusMap(tmp_path, max_depth=4, jobs=4).iter_nodes()
+    assert next(nodes).name == "a0"
+    nodes.close()  # shuts the pool down
+    with pytest.raises(ValueError):
+        LocusMap(tmp_path, max_depth=4, jobs=-1)
+
+
+def _make_mixed_project(root: Path) -> None:
+    (root / "app" / "models").mkdir(parents=True)
+    (root / "app" / "models" / "user.py").write_text("x" * 300)
+    (root / "app" / "models" / "schema.sql").write_text("x" * 10)
+    (root / "app" / "static").mkdir()
+    (root / "app" / "static" / "site.css").write_text("x")
+    (root / "deep" / "a" / "b" / "c").mkdir(parents=True)
+    (root / "deep" / "a" / "b" / "c" / "query_test.go").write_text("x")
+    (root / "docs").mkdir()
+    (root / "docs" / "index.md").write_text("x")
+    (root / "setup.py").write_text("x" * 50)
+
+
+def _shown(locus_map: LocusMap) -> list[tuple[int, str]]:
+    return [(n.depth, n.name) for n in locus_map.iter_nodes()]
+
+
+def test_filter_prunes_folders_without_matches(tmp_path: Path) -> None:
+    from locus_cli.core.filters import FileFilter
+    _make_mixed_project(tmp_path)
+    lang = LocusMap(tmp_path, max_depth=4, filter=FileFilter(languages=["python", "SQL"]))
+    assert _shown(lang) == [
+        (0, "app"), (1, "models"), (2, "schema.sql"), (2, "user.py"), (0, "setup.py"),
+    ]
+    # A match below the displayed depth keeps its folder, found without walking the rest.
+    glob = LocusMap(tmp_path, max_depth=2, filter=FileFilter(include=["*_test.go"]))
+    assert _shown(glob) == [(0, "deep"), (1, "a")]
+    size = LocusMap(tmp_path, max_depth=4, filter=FileFilter(min_size=50))
+    assert _shown(size) == [(0, "app"), (1, "models"), (2, "user.py"), (0, "setup.py")]
+
+
+def test_name_filters_run_before_stat(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import os
+    from locus_cli.core.filters import FileFilter
+    _make_mixed_project(tmp_path)
+    stated: list[str] = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda path, *a, **k: stated.append(str(path)) or real_stat(path, *a, **k))
+    list(LocusMap(tmp_path, max_depth=4, filter=FileFilter(languages=["python"], min_size=1)).iter_nodes())
+    monkeypatch.undo()
+    stated_files = [p for p in stated if os.path.isfile(p)]
+    assert stated_files and all(p.endswith(".py") for p in stated_files)
+
+
+def test_filter_rejects_unknown_language() -> None:
+    from locus_cli.core.filters import FileFilter
+    with pytest.raises(ValueError):
+        FileFilter(languages=["klingon"])
+    assert not FileFilter()
+
+
+def test_full_cli_wiring_tree_filters(tmp_path: Path) -> None:
+    from locus_cli.main import main
+    _make_mixed_project(tmp_path)
+    assert main(["tree", str(tmp_path), "--lang", "python", "--include", "*.py", "--min-size", "10"]) == 0
+    assert main(["tree", str(tmp_path), "--lang", "klingon"]) == 1
+
+
+def test_list_folder_one_level_at_a_time(tmp_path: Path) -> None:
+    """list_folder() gives what the tree shows for one folder: ignore rules, order, sizes."""
+    _make_project(tmp_path)
+    (tmp_path / "src" / "pkg" / "notes.log").write_text("ignored by the root .gitignore")
+    locus_map = LocusMap(tmp_path, max_depth=1, max_files=1)
+    root = locus_map.list_folder(str(tmp_path))
+    assert root is not None
+    assert root.dirs == ["src", "tests"]
+    assert [name for name, _, _ in root.files] == ["main.py"]
+    assert root.hidden_files == 0
+    src = locus_map.list_folder(str(tmp_path / "src"), "src", root.matcher)
+    assert src is not None and src.dirs == ["pkg"]
+    pkg = locus_map.list_folder(str(tmp_path / "src" / "pkg"), "src/pkg", src.matcher)
+    assert pkg is not None and pkg.files == [("core.py", 100, pytest.approx(pkg.files[0][2]))]
+
+
+def test_tree_fast_shows_names_without_stat(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    import io
+    import os
+    _make_project(tmp_path)
+    stated: list[str] = []
+    real_stat = os.stat
+    monkeypatch.setattr(os, "stat", lambda p, *a, **k: stated.append(os.fspath(p)) or real_stat(p, *a, **k))
+    out = io.StringIO()
+    LocusMap(tmp_path, max_depth=3, sizes=False).stream(lambda line: out.write(line + "\n"), markup=False)
+    monkeypatch.undo()
+    assert not [p for p in stated if p.endswith(".py")]
+    lines = out.getvalue().splitlines()
+    assert lines[1:] == ["├── src/", "│   └── pkg/", "│       └── core.py", "├── tests/", "│   └── test_core.py",
+                         "└── main.py"]
+
+
+def test_cli_tree_fast(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    from locus_cli.main import main
+    _make_project(tmp_path)
+    assert main(["tree", str(tmp_path), "--fast"]) == 0
+    assert "main.py\n" in capsys.readouterr().out
+    assert main(["tree", str(tmp_path), "--fast", "--stats"]) == 1
@@ -0,0 +1,168 @@
+import errno
+import os
+import shutil
+import pytest
+from pathlib import Path
+
+from locus_cli.core.scanner import scan
+from locus_cli.core.watch import LiveInfo, Watch, _Inotify
+from locus_cli.main import main
+
+
+def _make_project(root: Path) -> None:
+    (root / "pyproject.toml").write_text("[project]")
+    (root / "main.py").write_text("x = 1\n")
+    (root / "src" / "pkg").mkdir(parents=True)
+    for i in range(4):
+        (root / "src" / "pkg" / f"mod{i}.py").write_text("y" * (i + 10))
+    (root / "docs").mkdir()
+    (root / "docs" / "index.md").write_text("# docs" * 50)
+    (root / "docs" / "package.json").write_text("{}")
+
+
+def _assert_matches_scan(info: LiveInfo, root: Path) -> None:
+    """Everything `locus info` shows must be what a fresh scan finds."""
+    live, fresh = info.result(), scan(root)
+    assert (live.total_files, live.total_dirs, live.total_bytes) == (
+        fresh.total_files, fresh.total_dirs, fresh.total_bytes,
+    )
+    assert {(ls.extension, ls.file_count, ls.total_bytes) for ls in live.languages} == {
+        (ls.extension, ls.file_count, ls.total_bytes) for ls in fresh.languages
+    }
+    assert live.largest_files == fresh.largest_files
+    assert live.directories == fresh.directories
+    assert live.heuristics == fresh.heuristics
+    assert live.subprojects == fresh.subprojects
+
+
+def _edit(root: Path) -> None:
+    (root / "main.py").write_text("x = 1\n" * 100)                   # grows into the largest files
+    (root / "src" / "pkg" / "mod3.py").unlink()                      # was among them
+    (root / "src" / "new").mkdir()
+    (root / "src" / "new" / "a.js").write_text("let a")
+    (root / "src" / "new" / "deep").mkdir()
+    (root / "src" / "new" / "deep" / "b.js").write_text("let b = 2")
+    (root / "src" / "new" / "Cargo.toml").write_text("[package]")
+    shutil.rmtree(root / "docs")
+    (root / "src" / "pkg").rename(root / "lib")
+    (root / "package.json").write_text("{}")
+
+
+def test_live_info_starts_as_scan(tmp_path: Path) -> None:
+    _make_project(tmp_path)
+    _assert_matches_scan(LiveInfo(tmp_path), tmp_path)
+
+
+def test_live_info_touch_follows_edits(tmp_path: Path) -> None:
+    _make_project(tmp_path)
+    info = LiveInfo(tmp_path)
+    _edit(tmp_path)
+    root, src = str(tmp_path), str(tmp_path / "src")
+    info.touch(root, {"main.py", "docs", "lib", "package.json"})
+    info.touch(src, {"new", "pkg"})
+    _assert_matches_scan(info, tmp_path)
+
+
+def test_live_info_refresh_follows_edits(tmp_path: Path) -> None:
+    _make_project(tmp_path)
+    info = LiveInfo(tmp_path)
+    version = info.version
+    _edit(tmp_path)
+    for path in info.paths():
+        info.refresh(path)
+    assert info.version != version
+    _assert_matches_scan(info, tmp_path)
+
+
+def test_live_info_gitignore_edit_rewalks(tmp_path: Path) -> None:
+    _make_project(tmp_path)
+    info = LiveInfo(tmp_path)
+    (tmp_path / "src" / ".gitignore").write_text("pkg/\n")
+    info.touch(str(tmp_path / "src"), {".gitignore"})
+    _assert_matches_scan(info, tmp_path)
+    assert info.result().total_files == 4
+
+
+def test_live_info_follows_subprojects(tmp_path: Path) -> None:
+    """A marker or test folder coming or going in a nested folder updates its sub-project."""
+    _make_project(tmp_path)
+    info = LiveInfo(tmp_path)
+    pkg = tmp_path / "src" / "pkg"
+    (pkg / "pyproject.toml").write_text("[project]")
+    info.touch(str(pkg), {"pyproject.toml"})
+    (pkg / "tests").mkdir()
+    info.touch(str(pkg), {"tests"})
+    _assert_matches_scan(info, tmp_path)
+    assert [(sub.path, sub.heuristics.test_dirs) for sub in info.result().subprojects] == [
+        ("docs", []), (os.path.join("src", "pkg"), ["tests"]),
+    ]
+    (pkg / "pyproject.toml").unlink()
+    info.touch(str(pkg), {"pyproject.toml"})
+    _assert_matches_scan(info, tmp_path)
+    assert [sub.path for sub in info.result().subprojects] == ["docs"]
+
+
+def _settle(watch: Watch, root: Path) -> None:
+    for _ in range(40):
+        watch.step(0.05)
+        if watch.info.result().total_files == scan(root).total_files:
+            watch.step(0.05)
+            return
+
+
+def test_watch_with_inotify(tmp_path: Path) -> None:
+    try:
+        _Inotify().close()
+    except OSError:
+        pytest.skip("inotify not available")
+    _make_project(tmp_path)
+    watch = Watch(tmp_path)
+    try:
+        assert watch.watched == len(watch.info.paths()) and watch.polled == 0
+        _edit(tmp_path)
+        _settle(watch, tmp_path)
+        _assert_matches_scan(watch.info, tmp_path)
+        assert watch.watched == len(watch.info.paths())
+    finally:
+        watch.close()
+
+
+def test_watch_by_polling(tmp_path: Path) -> None:
+    _make_project(tmp_path)
+    watch = Watch(tmp_path, poll=True)
+    assert watch.watched == 0 and watch.polled == len(watch.info.paths())
+    _edit(tmp_path)
+    _settle(watch, tmp_path)
+    _assert_matches_scan(watch.info, tmp_path)
+
+
+def test_watch_polls_beyond_the_watch_limit(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Directories that get no inotify watch (ENOSPC) are polled, shallow ones keep theirs."""
+    try:
+        _Inotify().close()
+    except OSError:
+        pytest.skip("inotify not available")
+    _make_project(tmp_path)
+    add = _Inotify.add
+
+    def limited_add(self: _Inotify, path: str) -> None:
+        if len(self) >= 2:
+            raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+        add(self, path)
+
+    monkeypatch.setattr(_Inotify, "add", limited_add)
+    watch = Watch(tmp_path)
+    try:
+        assert (watch.watched, watch.polled) == (2, 2)  # root and one child watched; src/pkg polled
+        (tmp_path / "src" / "pkg" / "mod0.py").write_text("much longer now")
+        _settle(watch, tmp_path)
+        for _ in range(5):
+            watch.step(0.01)
+        _assert_matches_scan(watch.info, tmp_path)
+    finally:
+        watch.close()
+
+
+def test_cli_watch_refuses_other_modes(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    assert main(["info", str(tmp_path), "--watch", "--format", "json"]) == 1
+    assert "--watch" in capsys.readouterr().out